@@ -0,0 +1,175 @@
+import time
+import random
+from src.adaptive_scraper.field_classifier import FIELD_CLASSIFIER
+from src.utils.text_normalizer import normalize_text
+
+# Legacy classifier (dict of keyword lists rebuilt per call, first match wins)
+LEGACY_MAPPINGS = {
+    'name': ['name', 'نام', 'نام و نام خانوادگی', 'fullname', 'full name'],
+    'name_en': ['name en', 'نام انگلیسی', 'english name'],
+    'national_code': ['national code', 'کد ملی', 'کدملی', 'code melli', 'melli code'],
+    'birth_date': ['birth date', 'تاریخ تولد', 'تاریخ تولد شمسی', 'birthdate'],
+    'birth_date_en': ['birth date en', 'تاریخ تولد میلادی', 'birthdate gregorian'],
+    'birth_city': ['birth city', 'شهر تولد', 'محل تولد', 'birth place'],
+    'gender': ['gender', 'جنسیت', 'sex', 'male/female', 'مرد/زن'],
+    'phone': ['phone', 'mobile', 'تلفن', 'موبایل', 'شماره تماس', 'phone number'],
+    'email': ['email', 'ایمیل', 'email address', 'پست الکترونیکی'],
+    'address': ['address', 'آدرس', 'نشانی', 'complete address', 'آدرس کامل'],
+    'city': ['city', 'شهر', 'city of residence', 'شهر محل سکونت'],
+    'province': ['province', 'استان', 'ostan', 'state'],
+    'postal_code': ['postal code', 'کد پستی', 'post code', 'zip code'],
+    'father_name': ['father name', 'نام پدر', 'name of father'],
+    'job': ['job', 'occupation', 'شغل', 'کار', 'occupation', 'profession'],
+    'education': ['education', 'تحصیلات', 'education level', 'مدرک تحصیلی']
+}
+
+# Field labels as Iranian checkout and KYC forms word them, with the attributes
+# the projection reports for the input. Written by hand, not from FIELD_KEYWORDS,
+# and including fields no user_data entry should fill (expected None).
+LABELLED_FIELDS = [
+    ("نام و نام‌خانوادگی", {'name': 'fullName'}, 'name'),
+    ("نام", {'name': 'firstName', 'autocomplete': 'given-name'}, 'name'),
+    ("نام خانوادگی", {'name': 'lastName', 'autocomplete': 'family-name'}, 'name'),
+    ("First name", {'id': 'first-name'}, 'name'),
+    ("نام و نام خانوادگی به انگلیسی", {'name': 'latinName'}, 'name_en'),
+    ("Full name (as in passport)", {'name': 'nameEn', 'placeholder': 'Latin letters only'}, 'name_en'),
+    ("كد ملي", {'name': 'nationalCode', 'placeholder': '۱۰ رقم'}, 'national_code'),
+    ("کد ملی ۱۰ رقمی خود را وارد کنید", {}, 'national_code'),
+    ("", {'name': 'national_id', 'placeholder': 'xxx-xxxxxx-x'}, 'national_code'),
+    ("شماره ملی", {'id': 'nid'}, 'national_code'),
+    ("تاریخ تولد (روز/ماه/سال)", {'name': 'birthDate', 'placeholder': '۱۳۷۰/۰۱/۰۱'}, 'birth_date'),
+    ("تاریخ تولد", {'autocomplete': 'bday'}, 'birth_date'),
+    ("Date of birth", {'name': 'dob'}, 'birth_date'),
+    ("تاریخ تولد به میلادی", {'name': 'birthDateGregorian'}, 'birth_date_en'),
+    ("محل تولد", {'name': 'birthPlace'}, 'birth_city'),
+    ("شهر محل تولد", {}, 'birth_city'),
+    ("جنسیت", {'name': 'gender'}, 'gender'),
+    ("آقا / خانم", {'name': 'sex'}, 'gender'),
+    ("شماره موبایل", {'name': 'mobile', 'autocomplete': 'tel', 'placeholder': '09xxxxxxxxx'}, 'phone'),
+    ("تلفن همراه", {'type': 'tel'}, 'phone'),
+    ("Mobile number", {'name': 'cellphone'}, 'phone'),
+    ("", {'name': 'phoneNumber', 'placeholder': '۰۹۱۲۳۴۵۶۷۸۹'}, 'phone'),
+    ("شماره تماس اضطراری", {'name': 'emergencyPhone'}, 'alternative_phone'),
+    ("شماره تماس دوم (اختیاری)", {}, 'alternative_phone'),
+    ("تلفن ثابت با پیش‌شماره", {'name': 'landline'}, 'home_phone'),
+    ("تلفن منزل", {'name': 'homePhone'}, 'home_phone'),
+    ("پست الکترونیک (اختیاری)", {'name': 'email', 'autocomplete': 'email'}, 'email'),
+    ("ایمیل", {'type': 'email'}, 'email'),
+    ("E-mail", {}, 'email'),
+    ("نشانی دقیق پستی", {'name': 'address', 'autocomplete': 'street-address'}, 'address'),
+    ("آدرس محل سکونت", {}, 'address'),
+    ("Street address", {'name': 'addressLine1'}, 'address'),
+    ("شهر", {'name': 'city', 'autocomplete': 'address-level2'}, 'city'),
+    ("شهر محل سکونت", {}, 'city'),
+    ("استان", {'name': 'province', 'autocomplete': 'address-level1'}, 'province'),
+    ("استان محل سکونت را انتخاب کنید", {}, 'province'),
+    ("کد پستی ۱۰ رقمی", {'name': 'postalCode', 'autocomplete': 'postal-code'}, 'postal_code'),
+    ("ZIP / Postal code", {}, 'postal_code'),
+    ("نام پدر", {'name': 'fatherName'}, 'father_name'),
+    ("Father's name", {}, 'father_name'),
+    ("شغل", {'name': 'job'}, 'job'),
+    ("عنوان شغلی", {'name': 'occupation'}, 'job'),
+    ("میزان تحصیلات", {'name': 'education'}, 'education'),
+    ("آخرین مدرک تحصیلی", {}, 'education'),
+    ("کد تخفیف", {'name': 'coupon'}, None),
+    ("رمز عبور", {'type': 'password', 'name': 'password'}, None),
+    ("کد تایید ارسال شده به شماره موبایل", {'name': 'otp', 'autocomplete': 'one-time-code'}, None),
+    ("کد ارسال شده به موبایل ۰۹۱۲***۶۷۸۹", {'name': 'code', 'inputmode': 'numeric'}, None),
+    ("رمز یکبار مصرف پیامک شده به شماره همراه", {'name': 'mobileOtp'}, None),
+    ("Enter the verification code sent to your phone", {'name': 'smsCode'}, None),
+    ("توضیحات سفارش", {'name': 'note'}, None),
+    ("تعداد اقساط", {'name': 'installments'}, None),
+]
+
+TEMPLATES = ["{}", "{} *", "{}:", "لطفا {} را وارد کنید", "{} (اجباری)", "{} خود را وارد کنید"]
+DIGITS = str.maketrans('0123456789۰۱۲۳۴۵۶۷۸۹', '۰۱۲۳۴۵۶۷۸۹0123456789')
+
+
+def variants(description, rng):
+    """Spell a label the ways real forms do: Arabic letters, ZWNJ, other digits, a template"""
+    if rng.random() < 0.5:
+        description = description.replace('ی', 'ي').replace('ک', 'ك')
+    if rng.random() < 0.5:
+        description = description.replace('\u200c', ' ')
+    elif rng.random() < 0.3:
+        description = description.replace(' ', '\u200c', 1)
+    if rng.random() < 0.5:
+        description = description.translate(DIGITS)
+    if rng.random() < 0.3:
+        description = description.upper()
+    return rng.choice(TEMPLATES).format(description) if description else description
+
+
+def generated_fields(count=4000, seed=7):
+    """Labelled variants of the hand-written fields, with shuffled attribute order"""
+    rng = random.Random(seed)
+    fields = []
+    for _ in range(count):
+        description, attrs, field = rng.choice(LABELLED_FIELDS)
+        items = list(attrs.items())
+        rng.shuffle(items)
+        fields.append((variants(description, rng), dict(items), field))
+    return fields
+
+
+def legacy_classify(description):
+    description = description.lower()
+    field_mappings = {k: list(v) for k, v in LEGACY_MAPPINGS.items()}
+    for field_name, keywords in field_mappings.items():
+        if any(keyword in description for keyword in keywords):
+            return field_name
+    return None
+
+
+def run_benchmark(rounds=20, count=4000):
+    fields = generated_fields(count)
+    size = len(fields)
+    print(f"🧪 Field classifier benchmark over {size} variants of {len(LABELLED_FIELDS)} hand-labelled form fields")
+    print("=" * 60)
+
+    legacy_correct = sum(1 for desc, _, field in fields if legacy_classify(desc) == field)
+    new_correct = sum(1 for desc, attrs, field in fields if FIELD_CLASSIFIER.classify(desc, attrs) == field)
+    print(f"Legacy : accuracy {legacy_correct / size:.1%} (description only)")
+    print(f"Indexed: accuracy {new_correct / size:.1%} (description and attributes)")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for desc, _, _ in fields:
+            legacy_classify(desc)
+    legacy_time = time.perf_counter() - start
+
+    # Distinct labels with both caches cleared: what a form seen for the first time costs
+    distinct = list({(desc, tuple(sorted(attrs.items()))): (desc, attrs) for desc, attrs, _ in fields}.values())
+    cold_time = 0.0
+    for _ in range(rounds):
+        FIELD_CLASSIFIER.cache_clear()
+        normalize_text.cache_clear()
+        start = time.perf_counter()
+        for desc, attrs in distinct:
+            FIELD_CLASSIFIER.classify(desc, attrs)
+        cold_time += time.perf_counter() - start
+
+    # Checkout forms repeat the same labels on every purchase, so later calls hit the cache
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for desc, attrs, _ in fields:
+            FIELD_CLASSIFIER.classify(desc, attrs)
+    warm_time = time.perf_counter() - start
+
+    print(f"Legacy : {legacy_time * 1e6 / (size * rounds):.1f} µs/field")
+    print(f"Indexed: {cold_time * 1e6 / (len(distinct) * rounds):.1f} µs/field first seen ({len(distinct)} distinct), "
+          f"{warm_time * 1e6 / (size * rounds):.1f} µs/field repeated")
+
+    misses = {}
+    for desc, attrs, field in fields:
+        got = FIELD_CLASSIFIER.classify(desc, attrs)
+        if got != field:
+            misses[(desc, tuple(attrs.items()))] = (got, field)
+    if misses:
+        print(f"\n⚠️ {len(misses)} distinct misclassifications:")
+        for (desc, attrs), (got, field) in list(misses.items())[:20]:
+            print(f"  {desc!r} {dict(attrs)} -> {got} (expected {field})")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,63 @@
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from src.adaptive_scraper.selector_optimizer import SelectorOptimizer
+
+# Selectors as produced by the LLM and the built-in fallbacks
+SLOW_SELECTORS = [
+    "[class*='product'], [class*='item']",
+    "button[class*='add-to-cart']",
+    "//button[contains(text(), 'محصولات بیشتر')]",
+    "//div[contains(@class, 'product-card')]//h3",
+    "//button[contains(@class, 'add-to-cart') and contains(text(), 'افزودن')]",
+]
+
+
+def build_grid_page(cards=2000):
+    """Synthetic timetable-like page with a large product grid"""
+    items = []
+    for i in range(cards):
+        items.append(
+            f'<div class="product-card item-{i % 7}" data-id="{i}">'
+            f'<img alt="p{i}"><h3 class="product-title">Product {i}</h3>'
+            f'<span class="product-price">{i},000 تومان</span>'
+            f'<button class="add-to-cart btn">افزودن به سبد خرید</button></div>'
+        )
+    return (
+        '<html><body><header><nav><a href="/">Home</a></nav></header>'
+        f'<main id="deals"><section id="grid">{"".join(items)}</section>'
+        '<button class="load-more">محصولات بیشتر</button></main></body></html>'
+    )
+
+
+def run_benchmark(cards=2000, iterations=50):
+    print(f"🧪 Selector optimizer benchmark ({cards} product cards, headless Chrome)")
+    print("=" * 70)
+
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    driver = webdriver.Chrome(options=options)
+
+    try:
+        driver.get("data:text/html;charset=utf-8,<html></html>")
+        driver.execute_script("document.open(); document.write(arguments[0]); document.close();", build_grid_page(cards))
+        optimizer = SelectorOptimizer(driver)
+
+        for selector in SLOW_SELECTORS:
+            start = time.perf_counter()
+            optimized = optimizer.optimize(selector)
+            rewrite_ms = (time.perf_counter() - start) * 1000
+            before = optimizer.measure(selector, iterations)
+            after = optimizer.measure(optimized, iterations)
+            speedup = before / after if after else float('inf')
+            print(f"\n{selector}")
+            print(f"  -> {optimized}")
+            print(f"  before: {before:.3f} ms  after: {after:.3f} ms  speedup: x{speedup:.1f}  (rewrite {rewrite_ms:.0f} ms)")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,122 @@
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from src.browser.tab_scheduler import TabScheduler
+from src.browser.wait_engine import Wait, navigate, page_loaded
+
+CLICK_SCRIPT = "var b = document.querySelector('button.add-to-cart'); if (b) { b.click(); } return !!b;"
+CARTED_SCRIPT = "return document.body.dataset.carted === 'yes';"
+
+
+class SlowProductPage(BaseHTTPRequestHandler):
+    """Product page that takes ?delay= seconds to serve and a moment to confirm the cart click"""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        time.sleep(float(query.get('delay', ['1'])[0]))
+        body = (
+            '<html><body><h1>Product</h1>'
+            '<button class="add-to-cart" onclick="setTimeout(function () {'
+            'document.body.dataset.carted = \'yes\'; }, 800)">افزودن به سبد خرید</button>'
+            '</body></html>'
+        ).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def launch():
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    return webdriver.Chrome(options=options)
+
+
+def browser_memory_mb(driver):
+    try:
+        import psutil
+    except ImportError:
+        return None
+    root = psutil.Process(driver.service.process.pid)
+    return sum(p.memory_info().rss for p in [root] + root.children(recursive=True)) / 1024 / 1024
+
+
+def cart_in_tab(url):
+    def task(driver, tab):
+        navigate(driver, url)
+        yield Wait(page_loaded, timeout=30)
+        driver.execute_script(CLICK_SCRIPT)
+        return bool((yield Wait(lambda d: d.execute_script(CARTED_SCRIPT), timeout=10)))
+    return task
+
+
+def cart_in_browser(driver, url):
+    driver.get(url)
+    driver.execute_script(CLICK_SCRIPT)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if driver.execute_script(CARTED_SCRIPT):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def run_benchmark(products=6, delay=1.5):
+    print(f"🧪 Tab scheduler benchmark: {products} products, {delay}s page latency, headless Chrome")
+    print("=" * 70)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowProductPage)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/product/{i}?delay={delay}" for i in range(products)]
+
+    driver = launch()
+    try:
+        scheduler = TabScheduler(driver, max_tabs=products)
+        start = time.perf_counter()
+        futures = [scheduler.submit(cart_in_tab(url)) for url in urls]
+        carted = sum(future.result() for future in futures)
+        tabs_time = time.perf_counter() - start
+        tabs_memory = browser_memory_mb(driver)
+        report = scheduler.get_report()
+        scheduler.shutdown()
+    finally:
+        driver.quit()
+
+    drivers = [launch() for _ in range(products)]
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=products) as executor:
+            browsers_carted = sum(executor.map(cart_in_browser, drivers, urls))
+        browsers_time = time.perf_counter() - start
+        memories = [browser_memory_mb(d) for d in drivers]
+        browsers_memory = sum(memories) if None not in memories else None
+    finally:
+        for d in drivers:
+            d.quit()
+
+    serial = products * (delay + 0.8)
+    print(f"Serial estimate        : {serial:.1f}s")
+    print(f"Tabs on one browser    : {tabs_time:.1f}s, {carted}/{products} carted, "
+          f"{products / tabs_time * 60:.1f}/min, peak {report['peak_tabs']} tabs, "
+          f"busy {report['busy_time']:.1f}s")
+    print(f"One browser per product: {browsers_time:.1f}s, {browsers_carted}/{products} carted, "
+          f"{products / browsers_time * 60:.1f}/min")
+    if tabs_memory and browsers_memory:
+        print(f"Memory                 : tabs {tabs_memory:.0f} MB vs browsers {browsers_memory:.0f} MB "
+              f"(x{browsers_memory / tabs_memory:.1f})")
+    else:
+        print("Memory                 : install psutil to measure browser RSS")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,77 @@
+import random
+import re
+import time
+from src.utils.text_normalizer import normalize_text, parse_price
+
+BRANDS = ['سامسونگ', 'شیائومی', 'اپل', 'ایسوس', 'سونی', 'Samsung', 'Xiaomi', 'Apple', 'Asus', 'Sony']
+KINDS = ['گوشی موبایل', 'لپ‌تاپ', 'هدفون بی‌سیم', 'ساعت هوشمند', 'پاوربانک', 'Mobile', 'Laptop']
+PERSIAN_DIGITS = str.maketrans('0123456789', '۰۱۲۳۴۵۶۷۸۹')
+
+
+def legacy_normalize(text):
+    """Chain of replace() calls, the way callers used to do it ad hoc"""
+    text = text.lower()
+    for arabic, persian in (('ي', 'ی'), ('ك', 'ک'), ('‌', ''), ('ة', 'ه')):
+        text = text.replace(arabic, persian)
+    for i, digit in enumerate('۰۱۲۳۴۵۶۷۸۹'):
+        text = text.replace(digit, str(i))
+    return re.sub(r'[\s_\-/,.:]+', ' ', text).strip()
+
+
+def legacy_price(text):
+    digits = legacy_normalize(text).replace(' ', '')
+    match = re.search(r'\d+', digits)
+    return int(match.group()) if match else None
+
+
+def build_products(size, distinct, seed=7):
+    """Product names and prices as a grid would repeat them across polls"""
+    rng = random.Random(seed)
+    pool = []
+    for i in range(distinct):
+        name = f"{rng.choice(KINDS)} {rng.choice(BRANDS)} مدل X{i}"
+        if rng.random() < 0.3:
+            name = name.replace('ی', 'ي').replace('ک', 'ك')
+        price = f"{rng.randint(1, 90) * 500000:,}"
+        if rng.random() < 0.5:
+            price = price.translate(PERSIAN_DIGITS).replace(',', '٬')
+        pool.append((name, f"{price} تومان"))
+    return [rng.choice(pool) for _ in range(size)]
+
+
+def run_benchmark(size=200000, distinct=5000):
+    print(f"🧪 Text normalizer benchmark: {size} product rows, {distinct} distinct")
+    print("=" * 60)
+    products = build_products(size, distinct)
+
+    start = time.perf_counter()
+    for name, price in products:
+        legacy_normalize(name)
+        legacy_price(price)
+    legacy_time = time.perf_counter() - start
+
+    normalize_text.cache_clear()
+    parse_price.cache_clear()
+    start = time.perf_counter()
+    for name, price in products:
+        normalize_text(name)
+        parse_price(price)
+    kernel_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name, _ in products[:distinct]:
+        normalize_text.__wrapped__(name)
+    uncached_time = time.perf_counter() - start
+
+    print(f"Legacy replace chain : {size / legacy_time:,.0f} rows/s")
+    print(f"Kernel (memoized)    : {size / kernel_time:,.0f} rows/s  (x{legacy_time / kernel_time:.1f})")
+    print(f"Kernel normalize only, uncached: {distinct / uncached_time:,.0f} names/s")
+    print(f"Cache: {normalize_text.cache_info()}")
+
+    wrong = sum(1 for _, price in products[:1000] if legacy_price(price) != parse_price(price))
+    print(f"Legacy price parser disagrees on {wrong}/1000 rows (Arabic separators, unit suffix)")
+    print(f"Sample: {products[0][0]!r} -> {normalize_text(products[0][0])!r}, {products[0][1]!r} -> {parse_price(products[0][1])}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
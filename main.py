@@ -1,15 +1,31 @@
 import os
 import time
+import queue
 import threading
 import logging
+from contextlib import contextmanager
 from datetime import datetime
+from urllib.parse import urljoin
+from selenium.webdriver.support.ui import WebDriverWait
 from src.auth.snap_auth import SnapAuthenticator
 from src.monitor.product_monitor import ProductMonitor
 from src.browser.session_manager import SessionManager
+from src.browser.driver_executor import DriverExecutor, PURCHASE, MONITOR
+from src.browser.tab_scheduler import TabScheduler
+from src.browser.wait_engine import Wait, navigate, mark_leaving, page_loaded, page_type_in, dom_quiet, any_of
 from src.payment.payment_handler import PaymentHandler
 from src.ai_navigator.openrouter_client import OpenRouterClient
 from src.adaptive_scraper.element_finder import AdaptiveElementFinder
+from src.adaptive_scraper.snapshot_processor import SnapshotProcessor
+from src.adaptive_scraper.detection_index import DetectionIndex
+from src.monitor.change_detector import PageChangeDetector
+from src.monitor.sale_scheduler import ClockSync, SaleScheduler
+from src.monitor.poll_controller import PollController
+from src.monitor.product_store import ProductStore, BECAME_PURCHASABLE
+from src.monitor.network_detector import NetworkSaleDetector
+from src.ai_navigator.page_analyzer import LOGIN, SOLD_OUT, CART, CHECKOUT, PRODUCT
 from src.utils.config import Config
+from src.utils.priority_pool import PriorityWorkerPool
 
 def setup_logging():
     """Setup logging that handles Unicode characters properly"""
@@ -58,6 +74,13 @@ logger = logging.getLogger(__name__)
 
 setup_logging()
 
+# Products that match no configured target are bought last
+UNTARGETED_PRIORITY = 1000
+
+# Where a click may route without loading a new document
+PRODUCT_OPENED = page_type_in(PRODUCT, CART, CHECKOUT, SOLD_OUT, LOGIN)
+CART_OPENED = page_type_in(CART, CHECKOUT)
+
 class AdaptiveSnappBuyer:
     def __init__(self, openrouter_api_key: str):
         self.config = Config()
@@ -67,10 +90,44 @@ class AdaptiveSnappBuyer:
         # AI Components
         self.ai_client = OpenRouterClient(openrouter_api_key)
         self.element_finder = None
+        self.change_detector = None
+        self.sale_scheduler = None
+        self.network_detector = None
+        self.timetable = None
+        self.detection_index = None
+        # Products already seen, so each cycle only acts on what changed
+        self.product_store = ProductStore()
+        self.poll_controller = PollController(
+            base_interval=self.config.get('monitor.poll_interval', 0.5),
+            min_interval=self.config.get('monitor.min_interval', 0.2),
+            max_interval=self.config.get('monitor.max_interval', 60)
+        )
+        # Snapshot parsing and scoring run in worker processes, off the browser threads
+        self.snapshot_processor = SnapshotProcessor()
         
-        self.monitor = ProductMonitor()
+        self.monitor = ProductMonitor(self.product_store)
+        # Every purchase driver gets its own finder; purchases on the primary still take a lock
+        # so two products never navigate the same page
+        self.purchase_finders = {}
+        self.primary_lock = threading.Lock()
+        # purchase.mode 'tabs': every product in its own tab of one pooled browser
+        self.tab_scheduler = None
+        # The primary browser is driven by one executor thread; these are its two views
+        self.driver_executor = None
+        self.monitor_driver = None
+        self.purchase_driver = None
+        # Purchases run on a bounded pool, highest-priority product first, each product once
+        self.purchase_pool = PriorityWorkerPool(
+            self._process_single_product,
+            workers=self.config.get('purchase.workers', 2),
+            max_queued=self.config.get('purchase.max_queued', 16),
+            name='purchase'
+        )
         self.payment_handler = PaymentHandler()
         
+        # Store keys of failed purchases, handed back to the monitoring thread that owns the store
+        self.failed_keys = queue.Queue()
+        
         self.is_running = False
         self.user_data = self._load_user_data()
     
@@ -115,7 +172,6 @@ class AdaptiveSnappBuyer:
         # Ensure authenticator has a driver (use SessionManager Selenium Manager flow)
         if not self.authenticator.driver:
             try:
-                from selenium.webdriver.support.ui import WebDriverWait
                 driver = self.session_manager.create_driver(headless=self.config.get('browser.headless', False))
                 self.authenticator.driver = driver
                 self.authenticator.wait = WebDriverWait(driver, 20)
@@ -127,10 +183,27 @@ class AdaptiveSnappBuyer:
         if login_success:
             logger.info("✅ Login successful (manual)")
             if self.authenticator.driver:
+                # Monitoring reads and purchase actions share the primary browser through one
+                # command queue; queued purchase commands run before queued monitoring reads
+                self.driver_executor = DriverExecutor(self.authenticator.driver, name='primary')
+                self.monitor_driver = self.driver_executor.proxy(MONITOR)
+                self.purchase_driver = self.driver_executor.proxy(PURCHASE)
                 self.element_finder = AdaptiveElementFinder(
-                    self.authenticator.driver,
-                    self.ai_client
+                    self.monitor_driver,
+                    self.ai_client,
+                    self.snapshot_processor
                 )
+                self.change_detector = PageChangeDetector(self.monitor_driver)
+                self.monitor.config = self.config
+                self.monitor.set_driver(self.monitor_driver, WebDriverWait(self.monitor_driver, 20))
+                self.network_detector = NetworkSaleDetector(self.monitor_driver)
+                self.detection_index = DetectionIndex.from_file(self.monitor_driver)
+                # Extra browsers with the logged-in session so products can be carted in parallel
+                self.session_manager.driver = self.purchase_driver
+                if self.config.get('purchase.mode', 'browsers') == 'tabs':
+                    self._start_tab_scheduler()
+                else:
+                    self.session_manager.create_pool(self.config.get('purchase.browsers', 2))
             self.session_manager.save_session()
             return True
         else:
@@ -146,11 +219,10 @@ class AdaptiveSnappBuyer:
             return
         
         # Navigate to deals page
-        self.authenticator.driver.get(self.config.get('snapp.snapp_pay_url'))
-        time.sleep(5)
+        self.monitor.navigate_to_deals_page()
         
         # Analyze page for products
-        products = self.element_finder.find_products_on_landing_page()
+        products = self.element_finder.find_products_on_landing_page() or []
         
         logger.info(f"📊 AI Analysis Results:")
         logger.info(f"Found {len(products)} potential product elements")
@@ -206,112 +278,400 @@ class AdaptiveSnappBuyer:
         logger.info("👁️ Starting adaptive monitoring...")
         
         self.is_running = True
+        self.sale_scheduler = self._create_sale_scheduler()
+        self.timetable = self.monitor.load_timetable(self.sale_scheduler.offset)
+        if self.timetable.arm(self._arm_product):
+            logger.info(f"🗓️ Armed {len(self.timetable.timers)} product timers from the timetable")
         monitor_thread = threading.Thread(target=self._adaptive_monitoring_loop)
         monitor_thread.daemon = True
         monitor_thread.start()
         
         logger.info("✅ Adaptive monitoring started")
     
+    def _create_sale_scheduler(self):
+        """Sync with the server clock and schedule polling around the sale start"""
+        offset = 0.0
+        if self.monitor.poller:
+            offset = ClockSync(self.monitor.poller.session, self.monitor.poller.url).sync()
+        scheduler = SaleScheduler.from_config(self.config, offset)
+        logger.info(f"⏰ {scheduler.describe()}")
+        return scheduler
+    
+    def _poll_interval(self):
+        """Wait before the next poll: the timetable or sale schedule sets the pace, the controller adapts it"""
+        target = self.sale_scheduler.next_interval() if self.sale_scheduler else None
+        if self._timetable_governs():
+            # Per-product windows: flat out inside one, otherwise sleep until the next
+            target = self.timetable.next_interval(self.config.get('sale.max_interval', 0.2))
+        interval = self.poll_controller.next_interval(target)
+        logger.debug(f"⏱️ Next poll in {interval:.2f}s ({', '.join(self.poll_controller.reasons)})")
+        return interval
+    
+    def _arm_purchase_pipeline(self):
+        """Get everything the first purchase needs ready just before the sale opens"""
+        logger.info("🔫 Arming purchase pipeline")
+        if self.monitor.poller:
+            self.monitor.poller.sync_cookies(self.monitor_driver)
+        self.change_detector.install()
+        self.element_finder.get_page_type()
+    
+    def _arm_product(self, entry):
+        """Timer callback shortly before one product's window opens"""
+        logger.info(f"🔫 {entry['name']} opens in {entry['opens_at'] - self.timetable.now():.0f}s, polling it")
+        if self.monitor.poller:
+            self.monitor.poller.sync_cookies(self.monitor_driver)
+    
+    def _timetable_governs(self):
+        """True while the timetable lists every wanted target and some window is open or to come"""
+        if not (self.timetable and self.timetable.covers()):
+            return False
+        # A target without a parsed opening time could go on sale any moment
+        return all(self.timetable.lists(name) for name in self.monitor.wanted_targets())
+    
+    def _outside_timetable_windows(self):
+        """True when the timetable lists our targets and none of their windows is open"""
+        return self._timetable_governs() and not self.timetable.active()
+    
     def _adaptive_monitoring_loop(self):
         """Main adaptive monitoring loop"""
         while self.is_running:
             try:
-                # Check if sale has started by looking for active product links
-                products = self.element_finder.find_products_on_landing_page()
+                if self.sale_scheduler and self.sale_scheduler.should_arm():
+                    self._arm_purchase_pipeline()
+                
+                # A purchase is using the primary browser; refreshing or probing it now would
+                # reload the checkout page under the form fill
+                if self.primary_lock.locked():
+                    time.sleep(self._poll_interval())
+                    continue
+                
+                # Failed purchases become eligible again once a poll still sees them available
+                while not self.failed_keys.empty():
+                    self.product_store.mark_unavailable(self.failed_keys.get())
+                
+                # Nothing to watch until the next product window opens
+                if self._outside_timetable_windows():
+                    time.sleep(self._poll_interval())
+                    continue
+                
+                # API responses the page already received tell us about availability
+                # before the grid re-renders
+                if self.network_detector:
+                    events = self.monitor.apply_network_products(self.network_detector.poll())
+                    purchasable = [event['product'] for event in events if event['type'] == BECAME_PURCHASABLE]
+                    if purchasable:
+                        logger.info(f"🌐 Products became purchasable in API responses: {len(purchasable)}")
+                        self._handle_active_products(purchasable)
+                
+                # Cheap HTTP poll; the browser reloads only when the server content changed
+                poll = self.monitor.refresh_if_changed()
+                
+                # Skip AI analysis when nothing relevant changed on the page; the DOM walk is
+                # only needed when the server content changed or the poller cannot tell
+                change = self.change_detector.check(structure=poll['reason'] not in ('not_modified', 'unchanged'))
+                self.poll_controller.observe(
+                    changed=change['changed'] and change['reason'] != 'error',
+                    error=change['reason'] == 'error' or poll['reason'] == 'error',
+                    status=poll.get('status'),
+                    elapsed=poll.get('elapsed'),
+                    retry_after=poll.get('retry_after')
+                )
+                if not change['changed']:
+                    self.change_detector.record_skipped()
+                    # An idle cycle: optimize the selectors recent analyses planned
+                    self.element_finder.optimize_pending()
+                    time.sleep(self._poll_interval())
+                    continue
+                
+                # Curated selectors first: one in-page call covers every listed product
+                results = self.detection_index.detect() if self.detection_index else []
+                products = self.detection_index.clickable_products(results) if results else []
+                windowed = self.timetable and self.timetable.covers()
+                
+                # Page analysis only for targets the curated selectors missed, and only
+                # while their sale window is open
+                wanted = lambda name: not windowed or self._in_open_window({'name': name})
+                if not results or self.detection_index.needs_fallback(results, wanted):
+                    # Check if sale has started by looking for active product links,
+                    # re-analyzing only the changed subtrees when possible
+                    found = self.element_finder.find_products_on_landing_page(change['subtrees'] or None)
+                    if found is None:
+                        # The change stays pending, so the next cycle analyzes it again
+                        logger.warning("⚠️ Page analysis failed, retrying next cycle")
+                        time.sleep(self._poll_interval())
+                        continue
+                    products += self._uncurated(found, results)
+                self.change_detector.commit()
+                self.change_detector.record_analyzed()
                 
                 active_products = []
                 for product in products:
                     if product.get('confidence') in ['high', 'medium']:
+                        # A target outside its sale window is recorded as not yet available, so the
+                        # store still reports the transition once the window opens
+                        product['available'] = not windowed or self._in_open_window(product)
                         active_products.append(product)
                 
+                # Only products that just became purchasable are handed on
+                events = self.product_store.apply(active_products, complete=not change['subtrees'])
+                active_products = [event['product'] for event in events if event['type'] == BECAME_PURCHASABLE]
+                
                 if active_products:
                     logger.info(f"🎯 Active products detected: {len(active_products)}")
                     self._handle_active_products(active_products)
                 
-                time.sleep(self.config.get('monitor.refresh_interval', 2))
+                time.sleep(self._poll_interval())
                 
             except Exception as e:
                 logger.error(f"Monitoring error: {e}")
-                time.sleep(5)
+                self.poll_controller.observe(error=True)
+                time.sleep(self._poll_interval())
+    
+    def _start_tab_scheduler(self):
+        """One extra browser whose tabs run the purchases, interleaving their waits"""
+        if not self.session_manager.create_pool(1):
+            logger.warning("⚠️ No browser for the tab scheduler; purchases use the primary driver")
+            return
+        driver = self.session_manager.checkout(timeout=self.config.get('purchase.checkout_timeout', 30))
+        if driver is None:
+            # Same as an exhausted pool: _purchase_driver falls back to the primary under primary_lock
+            logger.warning("⚠️ Pooled browser could not be started; purchases run without the tab scheduler")
+            return
+        self.tab_scheduler = TabScheduler(
+            driver,
+            # Each tab keeps its own finder: plans, caches and element references are per page
+            state_factory=lambda driver: {'finder': AdaptiveElementFinder(driver, self.ai_client, self.snapshot_processor)},
+            max_tabs=self.config.get('purchase.max_tabs', 4),
+            idle_timeout=self.config.get('purchase.tab_idle_timeout', 120)
+        )
+        logger.info(f"🗂️ Tab scheduler ready: up to {self.tab_scheduler.max_tabs} tabs on one browser")
+    
+    def _uncurated(self, products, results):
+        """Drop analyzed products whose target the curated selectors already found"""
+        curated = {target['name'] for target in (self.monitor.match_target(result['name'])
+                                                  for result in results if result['present']) if target}
+        kept = []
+        for product in products:
+            target = self.monitor.match_target(product.get('name'))
+            if not target or target['name'] not in curated:
+                kept.append(product)
+        return kept
+    
+    def _in_open_window(self, product):
+        """False only for a target with a parsed timetable entry whose window is not open"""
+        target = self.monitor.match_target(product.get('name'))
+        if not target or not self.timetable.lists(target['name']):
+            return True
+        return self.timetable.is_active(target['name'])
     
     def _handle_active_products(self, active_products):
         """Handle detected active products"""
         for product in active_products:
-            if self._should_process_product(product):
-                logger.info(f"🚀 Processing product: {product['name']}")
-                
-                # Process in separate thread
-                thread = threading.Thread(
-                    target=self._process_single_product,
-                    args=(product,)
-                )
-                thread.start()
+            key, priority = self._product_identity(product)
+            if self._should_process_product(key):
+                if self.purchase_pool.submit(key, priority, product):
+                    logger.info(f"🚀 Queued product: {product['name']} (priority {priority})")
+    
+    def _product_identity(self, product):
+        """Stable id and priority: the matched target when there is one, so the same product
+        found by curated selectors, the page analysis and the network is processed once"""
+        target = self.monitor.match_target(product.get('name'))
+        if target:
+            return f"target:{target['name']}", target['priority']
+        return product.get('key') or product.get('selector') or product.get('name'), UNTARGETED_PRIORITY
     
-    def _should_process_product(self, product):
+    def _should_process_product(self, key):
         """Check if product should be processed"""
-        # Add your logic here - check priority, avoid duplicates, etc.
-        return True
+        return not self.purchase_pool.is_known(key)
+    
+    @contextmanager
+    def _purchase_driver(self):
+        """A pooled browser for one purchase, or the primary driver when the pool is empty"""
+        driver = None
+        if self.session_manager.pool_drivers:
+            driver = self.session_manager.checkout(timeout=self.config.get('purchase.checkout_timeout', 30))
+        if driver is None:
+            with self.primary_lock:
+                try:
+                    yield self.purchase_driver
+                finally:
+                    # Hand the primary back to the monitor on the timetable
+                    try:
+                        self.purchase_driver.get(self.config.get('snapp.snapp_pay_url'))
+                    except Exception as e:
+                        logger.warning(f"⚠️ Could not return primary browser to the timetable: {e}")
+            return
+        try:
+            yield driver
+        finally:
+            self.session_manager.release(driver)
+    
+    def _finder_for(self, driver):
+        if id(driver) not in self.purchase_finders:
+            self.purchase_finders[id(driver)] = AdaptiveElementFinder(driver, self.ai_client, self.snapshot_processor)
+        return self.purchase_finders[id(driver)]
+    
+    def _open_product_steps(self, product, driver, finder):
+        """Click the product card, or go straight to its link when it came from an API response"""
+        landing_url = self.config.get('snapp.snapp_pay_url')
+        if product.get('link'):
+            navigate(driver, urljoin(landing_url, product['link']))
+            yield Wait(page_loaded, timeout=30)
+            return True
+        if product.get('selector'):
+            if driver is not self.purchase_driver:
+                # Pooled browsers and tabs may be anywhere; the selector belongs to the deals page
+                navigate(driver, landing_url)
+                yield Wait(page_loaded, timeout=30)
+            # Marks the deals page so the wait that follows holds out for what the click opens
+            mark_leaving(driver)
+            if not (yield from finder.click_steps(product['selector'])):
+                return False
+            yield Wait(any_of(page_loaded, PRODUCT_OPENED), timeout=3)
+            return True
+        return False
     
     def _process_single_product(self, product):
-        """Process a single product through purchase flow"""
+        """Process a single product through purchase flow; True when there is nothing left to do"""
+        try:
+            success = self._run_purchase(product)
+        except Exception as e:
+            logger.error(f"❌ Error processing {product['name']}: {e}")
+            success = False
+        if not success:
+            # The pool accepts the key again; make the store report the product again too
+            self.failed_keys.put(ProductStore.key_for(product))
+        return success
+    
+    def _run_purchase(self, product):
+        if self.tab_scheduler:
+            # The worker only waits here; the scheduler thread drives the tab
+            task = lambda driver, tab: self._purchase_steps(product, driver, tab.state['finder'])
+            return self.tab_scheduler.submit(task).result()
+        with self._purchase_driver() as driver:
+            finder = self._finder_for(driver)
+            return finder.waits.run(self._purchase_steps(product, driver, finder))
+    
+    def _purchase_steps(self, product, driver, finder):
+        """The purchase as steps: run in place by WaitEngine.run or interleaved by the TabScheduler"""
         try:
             # Click on product
-            if self.element_finder.click_element(product['selector']):
-                time.sleep(3)
-                
+            if not (yield from self._open_product_steps(product, driver, finder)):
+                logger.error(f"❌ Cannot click product: {product['name']}")
+                return False
+            
+            # Route on page type instead of probing with AI tasks
+            page_type = finder.get_page_type()
+            if page_type in (LOGIN, SOLD_OUT):
+                logger.error(f"❌ Cannot process {product['name']}: landed on {page_type} page")
+                # Neither is final: the failure marks the product unavailable in the store, so a
+                # restock or a recovered session hands it on again
+                return False
+            
+            if page_type not in (CART, CHECKOUT):
                 # Add to cart
-                cart_button = self.element_finder.find_add_to_cart_button()
-                if cart_button and self.element_finder.click_element(cart_button):
-                    time.sleep(2)
-                    
-                    # Handle checkout forms
-                    if self._complete_checkout_forms():
-                        logger.info(f"✅ Successfully processed: {product['name']}")
-                    else:
-                        logger.error(f"❌ Checkout failed for: {product['name']}")
-                else:
+                cart_button = yield from finder.add_to_cart_steps()
+                mark_leaving(driver)
+                if not (cart_button and (yield from finder.click_steps(cart_button))):
                     logger.error(f"❌ Cannot add to cart: {product['name']}")
-            else:
-                logger.error(f"❌ Cannot click product: {product['name']}")
-                
+                    return False
+                yield Wait(any_of(page_loaded, CART_OPENED), timeout=2)
+            
+            # Handle checkout forms
+            if (yield from self._checkout_steps(finder)):
+                logger.info(f"✅ Successfully processed: {product['name']}")
+                return True
+            logger.error(f"❌ Checkout failed for: {product['name']}")
+        
         except Exception as e:
             logger.error(f"❌ Error processing {product['name']}: {e}")
+        finally:
+            # The purchase is decided, so optimizing the plans it queued no longer delays it
+            finder.optimize_pending()
+        return False
     
-    def _complete_checkout_forms(self):
+    def _complete_checkout_forms(self, finder=None):
         """Complete all checkout forms using AI"""
+        finder = finder or self.element_finder
+        return finder.waits.run(self._checkout_steps(finder))
+    
+    def _checkout_steps(self, finder):
         try:
-            form_elements = self.element_finder.find_payment_elements()
+            form_elements = yield from finder.payment_elements_steps()
             
             # Fill all detected form fields
             for field_type, selector in form_elements.items():
                 if field_type in self.user_data:
                     value = self.user_data[field_type]
-                    self.element_finder.fill_form_field(selector, value)
-                    time.sleep(0.5)
+                    yield from finder.fill_steps(selector, value)
+                    # Forms may re-render on input; go on once the DOM is still
+                    yield Wait(dom_quiet(100), timeout=0.5)
             
-            # Find and click final purchase button
-            purchase_buttons = [
-                "//button[contains(text(), 'Purchase')]",
-                "//button[contains(text(), 'Pay')]",
-                "//button[contains(text(), 'Complete')]",
-                "//input[@type='submit']"
-            ]
+            # Find and click final purchase button (local resolver first)
+            local_button = finder.find_button('purchase_button')
+            if local_button and (yield from finder.click_steps(local_button)):
+                logger.info("✅ Purchase button clicked")
+                return True
             
-            for button_selector in purchase_buttons:
-                if self.element_finder.click_element(button_selector):
-                    logger.info("✅ Purchase button clicked")
-                    return True
+            # Text lookups go through the in-page text index in one call
+            if finder.click_text(['Purchase', 'Pay', 'Complete', 'پرداخت', 'تکمیل خرید'], ('button',)):
+                logger.info("✅ Purchase button clicked")
+                return True
+            
+            if (yield from finder.click_steps("//input[@type='submit']")):
+                logger.info("✅ Purchase button clicked")
+                return True
             
             logger.warning("⚠️ No purchase button found")
             return False
-            
+        
         except Exception as e:
             logger.error(f"❌ Checkout form completion failed: {e}")
             return False
     
+    def get_polling_state(self):
+        """Current polling interval and the reasons behind it"""
+        return self.poll_controller.get_state()
+    
+    def get_monitoring_metrics(self):
+        """Get skipped vs analyzed monitoring cycle counts"""
+        if not self.change_detector:
+            return {}
+        return self.change_detector.get_metrics()
+    
     def stop(self):
         """Stop the application"""
         self.is_running = False
+        if self.timetable:
+            self.timetable.cancel()
+        metrics = self.get_monitoring_metrics()
+        if metrics:
+            logger.info(f"📊 Monitoring cycles - analyzed: {metrics['analyzed']}, skipped: {metrics['skipped']} (skip rate {metrics['skip_rate']})")
+        if self.element_finder:
+            for task, stats in self.element_finder.get_resolver_report().items():
+                logger.info(f"📊 Local resolver [{task}] - hit rate: {stats['hit_rate']}, lookups: {stats['lookups']}, time saved: {stats['time_saved']}s")
+        state = self.get_polling_state()
+        logger.info(f"📊 Polling - interval {state['interval']}s ({', '.join(state['reasons'])}), change rate {state['change_rate']}, error rate {state['error_rate']}")
+        poll_metrics = self.monitor.get_poll_metrics()
+        if poll_metrics:
+            logger.info(f"📊 HTTP polls - {poll_metrics['polls']} total, {poll_metrics['changed']} changed, {poll_metrics['not_modified']} not modified, {poll_metrics['errors']} errors, avg {poll_metrics['avg_ms']} ms")
+        self.purchase_pool.shutdown()
+        if self.tab_scheduler:
+            report = self.tab_scheduler.get_report()
+            logger.info(f"📊 Tabs - {report['completed']} done, {report['failed']} failed, peak {report['peak_tabs']} tabs, {report['throughput_per_min']}/min, memory {report['memory_mb']} MB")
+            self.tab_scheduler.shutdown()
+        self.session_manager.close_pool()
+        if self.driver_executor:
+            executor = self.driver_executor.stats
+            logger.info(f"📊 Primary driver commands - {executor['commands']} run, {executor['failed']} failed, by priority {executor['by_priority']}")
+            self.driver_executor.shutdown()
+            # The proxies stop working with the executor; closing the session uses the driver itself
+            self.session_manager.driver = self.authenticator.driver
+        pool = self.purchase_pool.stats
+        logger.info(f"📊 Purchases - succeeded: {pool['succeeded']}, failed: {pool['failed']}, duplicates skipped: {pool['duplicates']}, preempted: {pool['preempted']}")
+        stats = self.snapshot_processor.stats
+        logger.info(f"📊 Snapshot workers - completed: {stats['completed']}, stale: {stats['stale']}, rejected: {stats['rejected']}")
+        self.snapshot_processor.shutdown()
         logger.info("🛑 Application stopped")
 
 def main():
@@ -0,0 +1,93 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Evaluates every curated XPath of every product in one call. arguments[0]:
+# [[product id, [xpath, ...]], ...] in priority order. For each product the
+# first selector that matches is reported, with whether its element (or
+# the link/button around it) can be clicked right now.
+DETECT_SCRIPT = r"""
+function clickable(el) {
+    var target = el.closest('a, button, [role="button"], [onclick]') || el;
+    if (!target.getClientRects().length) { return false; }
+    if (target.disabled || target.getAttribute('aria-disabled') === 'true') { return false; }
+    var style = window.getComputedStyle(target);
+    return style.visibility !== 'hidden' && style.pointerEvents !== 'none';
+}
+var results = [];
+for (var p = 0; p < arguments[0].length; p++) {
+    var id = arguments[0][p][0], selectors = arguments[0][p][1], hit = null;
+    for (var s = 0; s < selectors.length && !hit; s++) {
+        try {
+            var node = document.evaluate(selectors[s], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            if (node && node.nodeType === 1) {
+                hit = {id: id, selector: selectors[s], present: true, clickable: clickable(node),
+                       element: node.closest('a, button, [role="button"], [onclick]') || node};
+            }
+        } catch (e) { /* invalid curated XPath: treat as a miss */ }
+    }
+    results.push(hit || {id: id, selector: null, present: false, clickable: false, element: null});
+}
+return results;
+"""
+
+
+class DetectionIndex:
+    """Curated per-product selectors from data/products.json, checked in one in-page call"""
+
+    def __init__(self, driver, products):
+        self.driver = driver
+        # Priority order: priority products as listed, then the others
+        self.products = [product for product in products if product.get('target_selectors')]
+        self.uncovered = [product['name'] for product in products if not product.get('target_selectors')]
+        self.by_id = {product['id']: product for product in self.products}
+        self.payload = [[product['id'], list(product['target_selectors'])] for product in self.products]
+        self.stats = {'polls': 0, 'hits': 0}
+
+    @classmethod
+    def from_file(cls, driver, path='data/products.json'):
+        products = []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                catalogue = json.load(f)
+            for group in ('priority_products', 'other_products'):
+                products.extend(catalogue.get(group, []))
+        except FileNotFoundError:
+            logger.warning(f"⚠️ Product catalogue not found: {path}")
+        except ValueError as e:
+            logger.warning(f"⚠️ Could not read product catalogue: {e}")
+        index = cls(driver, products)
+        logger.info(f"🗂️ Detection index: {len(index.products)} products with curated selectors")
+        return index
+
+    def detect(self):
+        """Return one result per curated product, in priority order"""
+        if not self.payload:
+            return []
+        try:
+            results = self.driver.execute_script(DETECT_SCRIPT, self.payload) or []
+        except Exception as e:
+            logger.warning(f"⚠️ Curated selector detection failed: {e}")
+            return []
+        self.stats['polls'] += 1
+        for result in results:
+            result['name'] = self.by_id[result['id']]['name']
+            self.stats['hits'] += result['present']
+        return results
+
+    def clickable_products(self, results):
+        """Detection results as products the purchase flow can act on"""
+        return [{'key': f"curated-{result['id']}", 'name': result['name'], 'selector': result['selector'],
+                 'confidence': 'high', 'source': 'curated'}
+                for result in results if result['clickable']]
+
+    def missing(self, results, wanted=None):
+        """Names of products without curated selectors or whose selectors all missed.
+        wanted(name) narrows this to the products that matter now, e.g. in an open sale window."""
+        names = self.uncovered + [result['name'] for result in results if not result['present']]
+        return [name for name in names if wanted is None or wanted(name)]
+
+    def needs_fallback(self, results, wanted=None):
+        """True when some wanted product has no curated selectors or none of them matched"""
+        return bool(self.missing(results, wanted))
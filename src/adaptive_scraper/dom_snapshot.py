@@ -0,0 +1,303 @@
+import re
+from html.parser import HTMLParser
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+             'param', 'source', 'track', 'wbr'}
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+CLICKABLE_TAGS = {'a', 'button', 'summary', 'select', 'option', 'label'}
+MAX_TEXT_LENGTH = 200
+FIELD_TAGS = {'input', 'select', 'textarea'}
+FIELD_ATTRIBUTES = ('name', 'placeholder', 'autocomplete', 'aria-label')
+
+_SAFE_IDENT = re.compile(r'^[A-Za-z][\w-]*$')
+
+# Runs inside the page and returns a compact list of visible nodes that are
+# interactive, carry text, or are named containers (id/class). Anonymous
+# wrappers are skipped and their children attached to the nearest kept
+# ancestor. Paths are absolute XPaths into the live DOM. arguments[0] may
+# list CSS selectors of container subtrees to project instead of <body>.
+PROJECTION_SCRIPT = r"""
+var SKIP = {SCRIPT: 1, STYLE: 1, NOSCRIPT: 1, TEMPLATE: 1, svg: 1, SVG: 1, IFRAME: 1, HEAD: 1};
+var INTERACTIVE = {A: 1, BUTTON: 1, INPUT: 1, SELECT: 1, TEXTAREA: 1, LABEL: 1, SUMMARY: 1, OPTION: 1};
+var KEEP = ['name', 'type', 'href', 'placeholder', 'aria-label', 'value', 'data-testid', 'autocomplete', 'alt'];
+var out = [];
+function xpathOf(el) {
+    var parts = [];
+    for (; el && el.nodeType === 1; el = el.parentElement) {
+        var i = 1, s = el;
+        while ((s = s.previousElementSibling)) { if (s.tagName === el.tagName) { i++; } }
+        parts.unshift(el.tagName.toLowerCase() + '[' + i + ']');
+    }
+    return '/' + parts.join('/');
+}
+function ownText(el) {
+    var t = '';
+    for (var c = el.firstChild; c; c = c.nextSibling) {
+        if (c.nodeType === 3) { t += c.data; }
+    }
+    return t.replace(/\s+/g, ' ').trim().slice(0, 120);
+}
+function walk(el, parent, path) {
+    if (SKIP[el.tagName] || (el.type === 'hidden' && el.tagName === 'INPUT')) { return; }
+    if (!el.getClientRects().length) { return; }
+    var text = ownText(el);
+    var cls = typeof el.className === 'string' ? el.className.trim() : '';
+    var role = el.getAttribute('role') || '';
+    var click = !!(INTERACTIVE[el.tagName] || el.onclick || el.hasAttribute('onclick') ||
+                   role === 'button' || role === 'link' || role === 'tab');
+    var me = parent;
+    if (click || text || el.id || cls || role) {
+        var attrs = {};
+        for (var k = 0; k < KEEP.length; k++) {
+            var v = el.getAttribute(KEEP[k]);
+            if (v) { attrs[KEEP[k]] = v.slice(0, 120); }
+        }
+        if (el.hasAttribute('onclick')) { attrs.onclick = '1'; }
+        me = out.length;
+        out.push({t: el.tagName.toLowerCase(), id: el.id || '', c: cls, r: role, a: attrs, x: text,
+                  p: parent, path: path, k: click, d: !!(el.disabled || el.getAttribute('aria-disabled') === 'true')});
+    }
+    var counts = {}, before = out.length;
+    for (var c = el.firstElementChild; c; c = c.nextElementSibling) {
+        counts[c.tagName] = (counts[c.tagName] || 0) + 1;
+        walk(c, me, path + '/' + c.tagName.toLowerCase() + '[' + counts[c.tagName] + ']');
+    }
+    // Drop class-only containers that ended up empty
+    if (me !== parent && out.length === before && !click && !text && !el.id && el.tagName !== 'IMG') {
+        out.pop();
+    }
+}
+var roots = [];
+if (arguments[0] && arguments[0].length) {
+    for (var i = 0; i < arguments[0].length; i++) {
+        var r = document.querySelector(arguments[0][i]);
+        if (r) { roots.push(r); }
+    }
+}
+if (!roots.length) { roots = [document.body]; }
+for (var j = 0; j < roots.length; j++) { walk(roots[j], -1, xpathOf(roots[j])); }
+return out;
+"""
+
+
+# Absolute XPath, in the projection's path format, of the first element each
+# selector in arguments[0] matches, or null. Selectors starting with '/' or
+# '(' are XPath, everything else CSS.
+ELEMENT_PATHS_SCRIPT = r"""
+function xpathOf(el) {
+    var parts = [];
+    for (; el && el.nodeType === 1; el = el.parentElement) {
+        var i = 1, s = el;
+        while ((s = s.previousElementSibling)) { if (s.tagName === el.tagName) { i++; } }
+        parts.unshift(el.tagName.toLowerCase() + '[' + i + ']');
+    }
+    return '/' + parts.join('/');
+}
+return arguments[0].map(function (selector) {
+    var el = null;
+    try {
+        el = /^[\/(]/.test(selector)
+            ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(selector);
+    } catch (e) {}
+    return el ? xpathOf(el) : null;
+});
+"""
+
+
+class _SnapshotParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.nodes = []
+        self.roots = []
+        self.stack = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_depth or tag in SKIPPED_TAGS:
+            if tag not in VOID_TAGS:
+                self.skip_depth += 1
+            return
+        attrs = {name: value or '' for name, value in attrs}
+        parent = self.stack[-1] if self.stack else None
+        node = {
+            'index': len(self.nodes),
+            'tag': tag,
+            'id': attrs.get('id', ''),
+            'classes': attrs.get('class', '').split(),
+            'role': attrs.get('role', ''),
+            'attrs': attrs,
+            'parent': parent['index'] if parent else None,
+            'children': [],
+            'own_text': [],
+            'text': '',
+            'disabled': 'disabled' in attrs or attrs.get('aria-disabled') == 'true',
+        }
+        node['clickable'] = (
+            tag in CLICKABLE_TAGS
+            or node['role'] in ('button', 'link', 'tab', 'menuitem')
+            or 'onclick' in attrs
+            or (tag == 'input' and attrs.get('type') in ('submit', 'button'))
+        )
+        siblings = parent['children'] if parent else self.roots
+        same_tag = sum(1 for i in siblings if self.nodes[i]['tag'] == tag)
+        node['path'] = f"{parent['path'] if parent else ''}/{tag}[{same_tag + 1}]"
+        siblings.append(node['index'])
+        self.nodes.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and not self.skip_depth and self.stack and self.stack[-1]['tag'] == tag:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            if tag not in VOID_TAGS:
+                self.skip_depth -= 1
+            return
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i]['tag'] == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        if not self.skip_depth and self.stack and data.strip():
+            self.stack[-1]['own_text'].append(data.strip())
+
+
+class DomSnapshot:
+    """Flat, parsed view of a page used by the local (non-LLM) resolvers"""
+
+    def __init__(self, nodes, is_fragment=False, live_paths=False):
+        self.nodes = nodes
+        self.is_fragment = is_fragment
+        # Projected snapshots hold only part of the DOM, so class chains that
+        # look unique here may not be; their paths are exact instead
+        self.live_paths = live_paths
+        self._ids = {}
+        self._class_chains = {}
+        for node in nodes:
+            if node['id']:
+                self._ids[node['id']] = self._ids.get(node['id'], 0) + 1
+            chain = self._class_chain(node)
+            self._class_chains[chain] = self._class_chains.get(chain, 0) + 1
+
+    @classmethod
+    def from_html(cls, html):
+        """Parse HTML once into a snapshot"""
+        parser = _SnapshotParser()
+        parser.feed(html or '')
+        parser.close()
+        nodes = _aggregate_text(parser.nodes)
+        return cls(nodes, is_fragment=not nodes or nodes[0]['tag'] != 'html')
+
+    @classmethod
+    def from_projection(cls, items):
+        """Build a snapshot from the compact list returned by PROJECTION_SCRIPT"""
+        nodes = []
+        for index, item in enumerate(items or []):
+            attrs = dict(item.get('a') or {})
+            parent = item.get('p', -1)
+            nodes.append({
+                'index': index,
+                'tag': item.get('t', ''),
+                'id': item.get('id', ''),
+                'classes': (item.get('c') or '').split(),
+                'role': item.get('r', ''),
+                'attrs': attrs,
+                'parent': parent if parent is not None and parent >= 0 else None,
+                'children': [],
+                'own_text': [item['x']] if item.get('x') else [],
+                'text': '',
+                'disabled': bool(item.get('d')),
+                'clickable': bool(item.get('k')),
+                'path': item.get('path', ''),
+            })
+            if nodes[-1]['parent'] is not None:
+                nodes[nodes[-1]['parent']]['children'].append(index)
+        return cls(_aggregate_text(nodes), live_paths=True)
+
+    def to_compact_html(self):
+        """Render a minimal nested markup of the snapshot for LLM prompts"""
+        parts = []
+
+        def render(node):
+            attrs = ''
+            if node['id']:
+                attrs += f' id="{node["id"]}"'
+            if node['classes']:
+                attrs += f' class="{" ".join(node["classes"])}"'
+            if node['role']:
+                attrs += f' role="{node["role"]}"'
+            for name, value in node['attrs'].items():
+                if name not in ('id', 'class', 'role', 'style', 'onclick') and not name.startswith('data-v-'):
+                    attrs += f' {name}="{value}"'
+            parts.append(f"<{node['tag']}{attrs}>")
+            if node['own_text']:
+                parts.append(node['own_text'])
+            for child in node['children']:
+                render(self.nodes[child])
+            if node['tag'] not in VOID_TAGS:
+                parts.append(f"</{node['tag']}>")
+
+        for node in self.nodes:
+            if node['parent'] is None:
+                render(node)
+        return ''.join(parts)
+
+    def form_fields(self):
+        """Attributes of every form field for the field classifier, keyed by path"""
+        fields = {}
+        for node in self.nodes:
+            if node['tag'] not in FIELD_TAGS:
+                continue
+            attributes = {name: node['attrs'][name] for name in FIELD_ATTRIBUTES if node['attrs'].get(name)}
+            if node['id']:
+                attributes['id'] = node['id']
+            label = next((ancestor for ancestor in self.ancestors(node) if ancestor['tag'] == 'label'), None)
+            if label and label['text']:
+                attributes['label'] = label['text']
+            fields[node['path']] = attributes
+        return fields
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def parent(self, node):
+        return self.nodes[node['parent']] if node['parent'] is not None else None
+
+    def ancestors(self, node):
+        parent = self.parent(node)
+        while parent:
+            yield parent
+            parent = self.parent(parent)
+
+    def _class_chain(self, node):
+        return node['tag'] + ''.join('.' + c for c in node['classes'] if _SAFE_IDENT.match(c))
+
+    def selector_for(self, node):
+        """Synthesize the cheapest selector that uniquely identifies the node"""
+        if node['id'] and _SAFE_IDENT.match(node['id']) and self._ids.get(node['id']) == 1:
+            return f"#{node['id']}"
+        if self.live_paths:
+            return node['path']
+        chain = self._class_chain(node)
+        if chain != node['tag'] and self._class_chains.get(chain) == 1:
+            return chain
+        for ancestor in self.ancestors(node):
+            if ancestor['id'] and _SAFE_IDENT.match(ancestor['id']) and self._ids.get(ancestor['id']) == 1:
+                suffix = node['path'][len(ancestor['path']):]
+                return f"//*[@id='{ancestor['id']}']{suffix}"
+        # Fragment paths are relative to an unknown container
+        return '/' + node['path'] if self.is_fragment else node['path']
+
+
+def _aggregate_text(nodes):
+    """Aggregate text bottom-up so every node knows its visible text"""
+    for node in reversed(nodes):
+        parts = node['own_text'] + [nodes[i]['text'] for i in node['children'] if nodes[i]['text']]
+        node['own_text'] = ' '.join(node['own_text'])
+        node['text'] = ' '.join(parts)[:MAX_TEXT_LENGTH]
+    return nodes
@@ -1,30 +1,166 @@
+import re
+import time
 import logging
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from src.ai_navigator.openrouter_client import OpenRouterClient
+from src.adaptive_scraper.field_classifier import FIELD_CLASSIFIER
+from src.utils.text_normalizer import contains
+from src.adaptive_scraper.dom_snapshot import PROJECTION_SCRIPT, ELEMENT_PATHS_SCRIPT
+from src.adaptive_scraper.snapshot_processor import analyze_snapshot, STALE
+from src.adaptive_scraper.heuristic_resolver import HeuristicResolver
+from src.adaptive_scraper.selector_healer import SelectorHealer
+from src.adaptive_scraper.selector_optimizer import SelectorOptimizer
+from src.ai_navigator.page_analyzer import PAGE_CLASSIFIER
+from src.browser.text_index import PageTextIndex
+from src.browser.wait_engine import WaitEngine, Wait
 
 logger = logging.getLogger(__name__)
 
+# Snapshots at least this large are parsed and scored in the process pool
+OFFLOAD_PROJECTION_NODES = 1500
+OFFLOAD_HTML_CHARS = 500000
+
+# Selectors tied to one page's layout: positional steps, or ids that look generated
+_POSITIONAL = re.compile(r'\[\d+\]|:nth-(?:of-type|child)')
+_ID_REFERENCE = re.compile(r"#([\w-]+)|@id=['\"]([^'\"]+)")
+_GENERATED_NAME = re.compile(r'\d{3,}|:')
+
+
+def _is_portable(selector):
+    """True when a selector can be reused on other pages of the same type"""
+    if _POSITIONAL.search(selector):
+        return False
+    for match in _ID_REFERENCE.finditer(selector):
+        name = match.group(1) or match.group(2)
+        if _GENERATED_NAME.search(name) or any(
+                len(part) >= 5 and re.search(r'\d', part) and re.search(r'[a-z]', part, re.I)
+                for part in re.split(r'[-_]+', name)):
+            return False
+    return True
+
 class AdaptiveElementFinder:
-    def __init__(self, driver, openrouter_client):
+    def __init__(self, driver, openrouter_client, snapshot_processor=None):
         self.driver = driver
         self.ai_client = openrouter_client
-        self.wait = WebDriverWait(driver, 10)
+        # Event-driven waits between purchase steps, resolved by whichever signal comes first
+        self.waits = WaitEngine(driver)
+        
+        # Local rule engine tried before any LLM call
+        self.resolver = HeuristicResolver()
+        self.snapshot_processor = snapshot_processor
+        self.llm_calls = 0
+        self.llm_time = 0.0
+        self._ai_cache = {}
+        
+        # Selectors that worked, per page type and task
+        self.plans = {}
+        self.healer = SelectorHealer(driver)
+        self.optimizer = SelectorOptimizer(driver)
+        self.text_index = PageTextIndex(driver)
     
     def get_page_html(self):
-        """Get current page HTML for AI analysis"""
-        return self.driver.page_source
+        """Get compact markup of the visible page for AI analysis"""
+        local = self._analyze_locally([])
+        return local['compact_html'] if local else ''
     
-    def find_products_on_landing_page(self):
-        """Find products on the landing page using AI"""
-        logger.info("🔍 AI analyzing landing page for products...")
+    def _capture_snapshot(self, containers=None):
+        """Project visible, interactive and text nodes inside the page instead of pulling page_source"""
+        try:
+            return self.driver.execute_script(PROJECTION_SCRIPT, containers or []), 'projection'
+        except Exception as e:
+            logger.warning(f"⚠️ DOM projection failed, falling back to page source: {e}")
+            return self.driver.page_source, 'html'
+    
+    def _analyze_locally(self, tasks, containers=None):
+        """Parse, fingerprint and score the snapshot; large ones go to the process pool.
+        None if a newer snapshot of this page superseded it"""
+        source, kind = self._capture_snapshot(containers)
+        threshold = OFFLOAD_PROJECTION_NODES if kind == 'projection' else OFFLOAD_HTML_CHARS
+        if self.snapshot_processor and len(source or '') >= threshold:
+            result = self.snapshot_processor.process(source, tasks, kind, stream=id(self))
+            if result is STALE:
+                # The newer snapshot's caller reports on the page as it is now
+                logger.debug("Snapshot superseded by a newer one, skipping")
+                return None
+            if result is not None:
+                for task, (hit, elapsed) in result['timings'].items():
+                    self.resolver.record(task, hit, elapsed)
+                return result
+        return analyze_snapshot(source or [], tasks, kind, self.resolver)
+    
+    def _analyze_with_ai(self, html, task, context, fingerprint=None):
+        """Call the LLM and track its latency; identical snapshots reuse the last answer"""
+        cache_key = (task, fingerprint)
+        if fingerprint and cache_key in self._ai_cache:
+            return self._ai_cache[cache_key]
+        start = time.perf_counter()
+        analysis = self.ai_client.analyze_page(html, task, context)
+        self.llm_calls += 1
+        self.llm_time += time.perf_counter() - start
+        if fingerprint and "error" not in analysis:
+            if len(self._ai_cache) >= 32:
+                self._ai_cache.pop(next(iter(self._ai_cache)))
+            self._ai_cache[cache_key] = analysis
+        return analysis
+    
+    def get_page_type(self):
+        """Classify the current page (timetable, product, cart, checkout, ...)"""
+        return PAGE_CLASSIFIER.classify_driver(self.driver)
+    
+    def _cached_plan(self, task, page_type=None):
+        """Get a cached selector for the task if it still matches the page"""
+        page_type = page_type or self.get_page_type()
+        selector = self.plans.get(page_type, {}).get(task)
+        if selector and isinstance(selector, str):
+            try:
+                if self.driver.find_elements(*self._locator(selector)):
+                    return selector
+            except Exception:
+                pass
+            return None
+        return selector
+    
+    def _remember_plan(self, task, result, page_type=None):
+        # The plan keeps the semantic selector, which carries over to other pages of this type;
+        # the optimized rewrite is cached for this URL only and applied by _resolve_selector.
+        # Optimizing costs a round trip, so it waits for optimize_pending() on an idle browser
+        if isinstance(result, str):
+            self.optimizer.queue(result)
+            if not _is_portable(result):
+                return result
+        if result:
+            self.plans.setdefault(page_type or self.get_page_type(), {})[task] = result
+        return result
+    
+    def optimize_pending(self, limit=4):
+        """Optimize selectors of recent plans while the browser has nothing else to do"""
+        return self.optimizer.run_queued(limit)
+    
+    def get_resolver_report(self):
+        """Local resolver hit rate and estimated LLM time saved per task"""
+        llm_latency = self.llm_time / self.llm_calls if self.llm_calls else 0.0
+        return self.resolver.get_report(llm_latency)
+    
+    def find_products_on_landing_page(self, containers=None):
+        """Find products on the landing page using AI (optionally within changed containers only);
+        None when the AI analysis failed"""
+        local = self._analyze_locally(['products'], containers)
+        if local is None:
+            return None
         
-        html = self.get_page_html()
+        products = local['products']
+        if products:
+            logger.info(f"⚡ Local resolver found {len(products)} products")
+            return products
+        
+        logger.info("🔍 AI analyzing landing page for products...")
         task = "Find all product elements on this landing page. Look for product cards, items, or any elements that might represent products for sale."
         context = "This is a Black Friday deals page. Products might be in cards, grids, or lists."
         
-        analysis = self.ai_client.analyze_page(html, task, context)
+        analysis = self._analyze_with_ai(local['compact_html'], task, context, local['fingerprint'])
+        if "error" in analysis:
+            return None
         
         if "elements_found" in analysis:
             products = []
@@ -42,18 +178,34 @@ class AdaptiveElementFinder:
     
     def find_add_to_cart_button(self):
         """Find add to cart button using AI"""
-        logger.info("🔍 AI analyzing product page for add to cart button...")
+        return self.waits.run(self.add_to_cart_steps())
+    
+    def add_to_cart_steps(self):
+        """find_add_to_cart_button as steps; the LLM call is yielded so it can run off the driver thread"""
+        page_type = self.get_page_type()
+        cached = self._cached_plan('add_to_cart', page_type)
+        if cached:
+            return cached
+        
+        local = self._analyze_locally(['add_to_cart'])
+        if local is None:
+            return None
         
-        html = self.get_page_html()
+        button = local['add_to_cart']
+        if button:
+            logger.info(f"⚡ Local resolver found add to cart button: {button['selector']} ({button['score']})")
+            return self._remember_plan('add_to_cart', button['selector'], page_type)
+        
+        logger.info("🔍 AI analyzing product page for add to cart button...")
         task = "Find the 'Add to Cart' button or any button that adds product to shopping cart. Also look for buy now, purchase, or similar buttons."
         context = "This is a product page. Need to find the button that adds item to cart."
         
-        analysis = self.ai_client.analyze_page(html, task, context)
+        analysis = yield lambda: self._analyze_with_ai(local['compact_html'], task, context, local['fingerprint'])
         
         if "elements_found" in analysis:
             for element in analysis["elements_found"]:
-                if element.get("action") == "click" and "cart" in element.get("description", "").lower():
-                    return element.get("selector")
+                if element.get("action") == "click" and contains(element.get("description", ""), "cart"):
+                    return self._remember_plan('add_to_cart', element.get("selector"), page_type)
         
         # Fallback: try common selectors
         common_selectors = [
@@ -69,11 +221,8 @@ class AdaptiveElementFinder:
         
         for selector in common_selectors:
             try:
-                if selector.startswith("//"):
-                    element = self.driver.find_element(By.XPATH, selector)
-                else:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                return selector
+                self.driver.find_element(*self._locator(selector))
+                return self._remember_plan('add_to_cart', selector, page_type)
             except:
                 continue
         
@@ -81,62 +230,93 @@ class AdaptiveElementFinder:
     
     def find_payment_elements(self):
         """Find payment form elements using AI"""
+        return self.waits.run(self.payment_elements_steps())
+    
+    def payment_elements_steps(self):
+        """find_payment_elements as steps; the LLM call is yielded"""
+        page_type = self.get_page_type()
+        cached = self.plans.get(page_type, {}).get('payment_elements')
+        if cached:
+            return dict(cached)
+        
         logger.info("🔍 AI analyzing checkout page for payment forms...")
         
-        html = self.get_page_html()
+        local = self._analyze_locally([])
+        if local is None:
+            return {}
         task = "Find all form elements needed for checkout: name, address, phone, email, payment method selection, and final purchase button."
         context = "This is a checkout/payment page. Need to find form fields and final purchase button."
         
-        analysis = self.ai_client.analyze_page(html, task, context)
+        analysis = yield lambda: self._analyze_with_ai(local['compact_html'], task, context, local['fingerprint'])
         
         form_elements = {}
-        if "elements_found" in analysis:
-            for element in analysis["elements_found"]:
-                if element.get("type") == "input" or element.get("action") == "fill":
-                    field_type = self._classify_form_field(element.get("description", ""))
-                    if field_type:
-                        form_elements[field_type] = element.get("selector")
+        inputs = [element for element in analysis.get("elements_found", [])
+                  if element.get("type") == "input" or element.get("action") == "fill"]
+        # Classify on the attributes the projection saw on each input, not on the selector text
+        paths = self._element_paths([element.get("selector", "") for element in inputs])
+        for element, path in zip(inputs, paths):
+            field_type = self._classify_form_field(element.get("description", ""), local['fields'].get(path))
+            if field_type:
+                form_elements[field_type] = element.get("selector")
         
+        self._remember_plan('payment_elements', dict(form_elements), page_type)
         return form_elements
     
-    def _classify_form_field(self, description: str) -> str:
-        """Classify form field by description for Iranian forms"""
-        description = description.lower()
-        
-        # Persian and English field mappings
-        field_mappings = {
-            'name': ['name', 'نام', 'نام و نام خانوادگی', 'fullname', 'full name'],
-            'name_en': ['name en', 'نام انگلیسی', 'english name'],
-            'national_code': ['national code', 'کد ملی', 'کدملی', 'code melli', 'melli code'],
-            'birth_date': ['birth date', 'تاریخ تولد', 'تاریخ تولد شمسی', 'birthdate'],
-            'birth_date_en': ['birth date en', 'تاریخ تولد میلادی', 'birthdate gregorian'],
-            'birth_city': ['birth city', 'شهر تولد', 'محل تولد', 'birth place'],
-            'gender': ['gender', 'جنسیت', 'sex', 'male/female', 'مرد/زن'],
-            'phone': ['phone', 'mobile', 'تلفن', 'موبایل', 'شماره تماس', 'phone number'],
-            'email': ['email', 'ایمیل', 'email address', 'پست الکترونیکی'],
-            'address': ['address', 'آدرس', 'نشانی', 'complete address', 'آدرس کامل'],
-            'city': ['city', 'شهر', 'city of residence', 'شهر محل سکونت'],
-            'province': ['province', 'استان', 'ostan', 'state'],
-            'postal_code': ['postal code', 'کد پستی', 'post code', 'zip code'],
-            'father_name': ['father name', 'نام پدر', 'name of father'],
-            'job': ['job', 'occupation', 'شغل', 'کار', 'occupation', 'profession'],
-            'education': ['education', 'تحصیلات', 'education level', 'مدرک تحصیلی']
-        }
-        
-        for field_name, keywords in field_mappings.items():
-            if any(keyword in description for keyword in keywords):
-                return field_name
-        
-        return None    
+    def _classify_form_field(self, description: str, attributes: dict = None) -> str:
+        """Classify form field by description and attributes for Iranian forms"""
+        return FIELD_CLASSIFIER.classify(description, attributes)
+    
+    def _element_paths(self, selectors):
+        """Projection path of the element each selector matches, in one round trip"""
+        try:
+            return self.driver.execute_script(ELEMENT_PATHS_SCRIPT, selectors) or [None] * len(selectors)
+        except Exception as e:
+            logger.debug(f"Could not resolve field selectors: {e}")
+            return [None] * len(selectors)
+    
+    def find_button(self, task: str):
+        """Find a well-known button (load_more, purchase_button, snapp_pay) locally"""
+        page_type = self.get_page_type()
+        cached = self._cached_plan(task, page_type)
+        if cached:
+            return cached
+        local = self._analyze_locally([task])
+        found = local and local[task]
+        return self._remember_plan(task, found['selector'], page_type) if found else None
         
+    def _locator(self, selector: str):
+        """Selectors starting with '/' or '(' are XPath, everything else CSS"""
+        if selector.startswith(("/", "(")):
+            return (By.XPATH, selector)
+        return (By.CSS_SELECTOR, selector)
+    
+    def _resolve_selector(self, selector: str):
+        """Return a selector that matches now, healing it locally if it went stale"""
+        selector = self.healer.aliases.get(selector, selector)
+        selector = self.optimizer.lookup(selector)
+        if selector not in self.healer.signatures:
+            # Nothing to heal from yet; the caller's wait finds the element and remembers it
+            return selector
+        try:
+            if self.driver.find_elements(*self._locator(selector)):
+                return selector
+        except Exception:
+            pass
+        return self.healer.heal(selector) or selector
+    
     def click_element(self, selector: str):
         """Click element using selector"""
+        return self.waits.run(self.click_steps(selector))
+    
+    def click_steps(self, selector: str):
+        """click_element as steps; the wait for the element to become clickable is yielded"""
         try:
-            if selector.startswith("//"):
-                element = self.wait.until(EC.element_to_be_clickable((By.XPATH, selector)))
-            else:
-                element = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+            selector = self._resolve_selector(selector)
+            element = yield Wait(EC.element_to_be_clickable(self._locator(selector)), timeout=10)
+            if not element:
+                raise TimeoutError("not clickable within 10s")
             
+            self.healer.remember(selector, element)
             element.click()
             logger.info(f"✅ Clicked element: {selector}")
             return True
@@ -144,14 +324,32 @@ class AdaptiveElementFinder:
             logger.error(f"❌ Failed to click element {selector}: {e}")
             return False
     
+    def click_text(self, texts, tags=('button', 'a')):
+        """Click the first element whose text contains one of the texts (in order)"""
+        element = self.text_index.find_first([(text, tags) for text in texts])
+        if not element:
+            return False
+        try:
+            element.click()
+            logger.info(f"✅ Clicked element by text: {element.text}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to click element by text {texts}: {e}")
+            return False
+    
     def fill_form_field(self, selector: str, value: str):
         """Fill form field with value"""
+        return self.waits.run(self.fill_steps(selector, value))
+    
+    def fill_steps(self, selector: str, value: str):
+        """fill_form_field as steps; the wait for the field is yielded"""
         try:
-            if selector.startswith("//"):
-                element = self.wait.until(EC.presence_of_element_located((By.XPATH, selector)))
-            else:
-                element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+            selector = self._resolve_selector(selector)
+            element = yield Wait(EC.presence_of_element_located(self._locator(selector)), timeout=10)
+            if not element:
+                raise TimeoutError("not present within 10s")
             
+            self.healer.remember(selector, element)
             element.clear()
             element.send_keys(value)
             logger.info(f"✅ Filled field {selector} with: {value}")
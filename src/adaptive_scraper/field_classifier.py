@@ -0,0 +1,144 @@
+import re
+from functools import lru_cache
+from itertools import product
+from typing import Dict, Optional
+from src.utils.keyword_index import KeywordAutomaton
+from src.utils.text_normalizer import normalize_text
+
+# Persian and English keywords per user_data field. Overlaps are fine:
+# the longest keyword wins ("father name" over "name").
+FIELD_KEYWORDS = {
+    'name': ['name', 'نام', 'نام و نام خانوادگی', 'نام خانوادگی', 'fullname', 'full name',
+             'first name', 'last name', 'family name', 'surname'],
+    'name_en': ['name en', 'نام انگلیسی', 'نام لاتین', 'english name', 'latin name', 'full name en'],
+    'national_code': ['national code', 'national id', 'nationalcode', 'کد ملی', 'کدملی', 'شماره ملی',
+                      'code melli', 'melli code', 'codemelli'],
+    'birth_date': ['birth date', 'تاریخ تولد', 'تاریخ تولد شمسی', 'birthdate', 'date of birth', 'dob'],
+    'birth_date_en': ['birth date en', 'تاریخ تولد میلادی', 'birthdate gregorian', 'gregorian birth date',
+                      'birth date gregorian', 'birthdate en'],
+    'birth_city': ['birth city', 'شهر تولد', 'محل تولد', 'birth place', 'place of birth', 'birthplace'],
+    'gender': ['gender', 'جنسیت', 'sex', 'male female', 'مرد زن'],
+    'phone': ['phone', 'mobile', 'تلفن', 'موبایل', 'شماره تماس', 'phone number', 'تلفن همراه',
+              'شماره موبایل', 'شماره همراه', 'cellphone', 'mobile number'],
+    'alternative_phone': ['alternative phone', 'alternate phone', 'second phone', 'شماره تماس دوم',
+                          'شماره تماس اضطراری', 'تلفن دوم'],
+    'home_phone': ['home phone', 'landline', 'تلفن ثابت', 'تلفن منزل', 'شماره ثابت'],
+    'email': ['email', 'e mail', 'ایمیل', 'email address', 'پست الکترونیکی', 'پست الکترونیک'],
+    'address': ['address', 'آدرس', 'نشانی', 'complete address', 'آدرس کامل', 'street address',
+                'نشانی پستی'],
+    'city': ['city', 'شهر', 'city of residence', 'شهر محل سکونت', 'town'],
+    'province': ['province', 'استان', 'ostan', 'state'],
+    'postal_code': ['postal code', 'کد پستی', 'post code', 'zip code', 'zipcode', 'postcode', 'zip'],
+    'father_name': ['father name', 'نام پدر', 'name of father', 'fathers name', 'father'],
+    'job': ['job', 'occupation', 'شغل', 'کار', 'profession', 'job title'],
+    'education': ['education', 'تحصیلات', 'education level', 'مدرک تحصیلی', 'degree'],
+}
+
+# HTML autocomplete tokens are standardized, so they map directly
+AUTOCOMPLETE_FIELDS = {
+    'name': 'name', 'given-name': 'name', 'family-name': 'name',
+    'email': 'email',
+    'tel': 'phone', 'tel-national': 'phone', 'mobile': 'phone',
+    'street-address': 'address', 'address-line1': 'address', 'address-line2': 'address',
+    'address-level2': 'city', 'address-level1': 'province',
+    'postal-code': 'postal_code',
+    'bday': 'birth_date', 'sex': 'gender',
+    'organization-title': 'job',
+}
+
+# Inputs that must never receive user data, however much their label mentions
+# it ("کد تایید ارسال شده به شماره موبایل" is not a phone field)
+EXCLUDED_KEYWORDS = ['کد تایید', 'کد تأیید', 'کد یکبار مصرف', 'رمز یکبار مصرف', 'رمز پویا', 'کد ارسال شده',
+                     'کد پیامک شده', 'otp', 'one time code', 'one time password', 'verification code',
+                     'verify code', 'sms code', 'captcha', 'کد امنیتی', 'کد تخفیف', 'discount code', 'coupon',
+                     'password', 'رمز عبور']
+EXCLUDED_AUTOCOMPLETE = {'one-time-code', 'current-password', 'new-password', 'cc-number', 'cc-csc'}
+
+# How much a keyword hit in each source counts towards a field
+SOURCE_WEIGHTS = {
+    'name': 2.0,
+    'id': 2.0,
+    'aria-label': 1.5,
+    'label': 1.5,
+    'placeholder': 1.2,
+    'description': 1.0,
+}
+
+_CAMEL_CASE = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+
+
+def _spellings(normalized):
+    """Every way of joining the words: ZWNJ is dropped by normalization, so "کد‌ملی" arrives as "کدملی" """
+    words = normalized.split()
+    if len(words) == 1 or normalized.isascii():
+        return [normalized]
+    spellings = []
+    for joins in product(('', ' '), repeat=len(words) - 1):
+        spellings.append(words[0] + ''.join(sep + word for sep, word in zip(joins, words[1:])))
+    return spellings
+
+
+class FormFieldClassifier:
+    def __init__(self, field_keywords=None):
+        self.automaton = KeywordAutomaton()
+        for field_name, keywords in (field_keywords or FIELD_KEYWORDS).items():
+            for keyword in keywords:
+                normalized = normalize_text(keyword)
+                # Specificity grows with the number of words in the keyword
+                specificity = len(normalized.split())
+                for spelling in _spellings(normalized):
+                    self.automaton.add(spelling, (field_name, specificity))
+        for keyword in EXCLUDED_KEYWORDS:
+            normalized = normalize_text(keyword)
+            for spelling in _spellings(normalized):
+                self.automaton.add(spelling, (None, len(normalized.split())))
+        self.automaton.build()
+
+    def score(self, description: str = '', attributes: Dict[str, str] = None) -> Dict[str, float]:
+        """Score every field against the description and element attributes; empty for excluded inputs"""
+        scores = {}
+        excluded = 0.0
+        sources = dict(attributes or {})
+        sources['description'] = description
+
+        autocomplete = (sources.pop('autocomplete', '') or '').strip().lower()
+        if EXCLUDED_AUTOCOMPLETE.intersection(autocomplete.split()):
+            return {}
+        for token in autocomplete.split():
+            field_name = AUTOCOMPLETE_FIELDS.get(token)
+            if field_name:
+                scores[field_name] = scores.get(field_name, 0.0) + 5.0
+
+        for source, value in sources.items():
+            if not value:
+                continue
+            weight = SOURCE_WEIGHTS.get(source, 1.0)
+            text = normalize_text(_CAMEL_CASE.sub(' ', value))
+            for _, _, _, (field_name, specificity) in self.automaton.longest_matches(text):
+                if field_name is None:
+                    excluded += weight * specificity
+                else:
+                    scores[field_name] = scores.get(field_name, 0.0) + weight * specificity
+
+        # A tie goes to the exclusion: skipping a field is safer than filling the wrong one
+        if excluded and excluded >= max(scores.values(), default=0.0):
+            return {}
+        return scores
+
+    def classify(self, description: str = '', attributes: Dict[str, str] = None) -> Optional[str]:
+        """Classify form field by description and attributes for Iranian forms"""
+        return self._classify(description or '', tuple(sorted((attributes or {}).items())))
+
+    @lru_cache(maxsize=4096)
+    def _classify(self, description, attributes):
+        # Checkout forms repeat the same labels on every purchase
+        scores = self.score(description, dict(attributes))
+        if not scores:
+            return None
+        return max(scores.items(), key=lambda item: item[1])[0]
+
+    def cache_clear(self):
+        self._classify.cache_clear()
+
+
+FIELD_CLASSIFIER = FormFieldClassifier()
@@ -0,0 +1,216 @@
+import re
+import time
+import logging
+from src.utils.keyword_index import KeywordAutomaton
+from src.utils.text_normalizer import normalize_text, PRICE_PATTERN
+
+logger = logging.getLogger(__name__)
+
+# Weighted rules per lookup task. Text keywords are matched against the
+# element's visible text, token keywords against its class/id/name tokens.
+TASK_RULES = {
+    'add_to_cart': {
+        'text': {'افزودن به سبد خرید': 3.0, 'افزودن به سبد': 2.5, 'اضافه به سبد': 2.5, 'خرید': 1.0,
+                 'add to cart': 3.0, 'add to basket': 3.0, 'buy now': 2.0, 'خرید آنی': 2.0},
+        'tokens': {'add to cart': 2.0, 'addtocart': 2.0, 'add cart': 1.5, 'cart': 1.0, 'basket': 1.0, 'buy': 0.5},
+        'roles': {'button': 0.5},
+        'max_text_length': 40,
+        'position': 'first',
+    },
+    'load_more': {
+        'text': {'محصولات بیشتر': 3.0, 'نمایش بیشتر': 2.5, 'مشاهده بیشتر': 2.0, 'بیشتر': 1.0,
+                 'load more': 3.0, 'show more': 2.5, 'more products': 3.0},
+        'tokens': {'load more': 2.0, 'loadmore': 2.0, 'show more': 1.5, 'more': 1.0, 'pagination': 0.5},
+        'roles': {'button': 0.5},
+        'max_text_length': 30,
+        'position': 'last',
+    },
+    'purchase_button': {
+        'text': {'تکمیل خرید': 3.0, 'ثبت سفارش': 3.0, 'پرداخت': 2.5, 'ادامه خرید': 2.0,
+                 'purchase': 2.5, 'complete purchase': 3.0, 'pay': 2.0, 'checkout': 2.0, 'complete': 1.5},
+        'tokens': {'checkout': 2.0, 'submit': 1.0, 'pay': 1.5, 'purchase': 1.5},
+        'roles': {'button': 0.5},
+        'max_text_length': 40,
+        'position': 'last',
+    },
+    'snapp_pay': {
+        'text': {'اسنپ پی': 3.0, 'اسنپ‌پی': 3.0, 'snapp pay': 3.0, 'snapppay': 3.0},
+        'tokens': {'snapp pay': 2.0, 'snapppay': 2.0, 'snapp': 1.0},
+        'roles': {'radio': 0.5, 'button': 0.5},
+        'max_text_length': 60,
+        'position': 'first',
+    },
+}
+
+PRODUCT_TOKENS = {'product', 'card', 'item', 'deal', 'offer'}
+# Card text that means the product cannot be bought yet (same words as the card extraction script)
+SOLD_OUT_WORDS = [normalize_text(word) for word in ('ناموجود', 'تمام شد', 'اتمام موجودی', 'sold out', 'out of stock')]
+UPCOMING_WORDS = [normalize_text(word) for word in ('به زودی', 'به‌زودی', 'بزودی', 'شروع فروش', 'coming soon')]
+_TOKEN_SPLIT = re.compile(r'[^0-9a-z؀-ۿ]+')
+
+
+class HeuristicResolver:
+    """Rule-based element resolver that answers obvious lookups without the LLM"""
+
+    def __init__(self, threshold=0.6):
+        self.threshold = threshold
+        self.rules = {}
+        for task, rules in TASK_RULES.items():
+            self.rules[task] = dict(rules)
+            self.rules[task]['text_index'] = self._compile(rules['text'])
+            self.rules[task]['token_index'] = self._compile(rules['tokens'])
+        self.stats = {}
+
+    def _compile(self, weighted_keywords):
+        automaton = KeywordAutomaton()
+        for keyword, weight in weighted_keywords.items():
+            automaton.add(normalize_text(keyword), weight)
+        return automaton.build()
+
+    def _best_weight(self, automaton, text):
+        return max((value for _, _, _, value in automaton.longest_matches(text)), default=0.0)
+
+    def _tokens_of(self, node):
+        parts = [node['id'], node['attrs'].get('name', ''), node['attrs'].get('data-testid', '')] + node['classes']
+        # "add-to-cart-btn" -> "add to cart btn"; also keep the joined form for "addToCart"
+        text = ' '.join(parts).lower()
+        return ' '.join(_TOKEN_SPLIT.split(text)).strip()
+
+    def score(self, task, node, snapshot):
+        """Score one candidate node for a task, normalized to 0..1"""
+        rules = self.rules[task]
+        text = normalize_text(node['text'])
+        if node['disabled'] or (text and len(text) > rules['max_text_length']):
+            return 0.0
+
+        text_score = self._best_weight(rules['text_index'], text)
+        value = normalize_text(node['attrs'].get('value', '') + ' ' + node['attrs'].get('aria-label', ''))
+        text_score = max(text_score, self._best_weight(rules['text_index'], value))
+        token_score = self._best_weight(rules['token_index'], self._tokens_of(node))
+        role_score = rules['roles'].get(node['role'] or node['tag'], 0.0)
+        click_score = 1.0 if node['clickable'] else 0.0
+
+        max_text = max(rules['text'].values())
+        max_token = max(rules['tokens'].values())
+        max_role = max(rules['roles'].values())
+        total = (text_score + token_score + role_score + click_score) / (max_text + max_token + max_role + 1.0)
+        # Text is the strongest signal; without it class names alone must be very explicit
+        if not text_score:
+            total *= 0.6
+        return total
+
+    def resolve(self, task, snapshot):
+        """Return the best candidate above the threshold, or None"""
+        start = time.perf_counter()
+        best = None
+        candidates = []
+        for node in snapshot.nodes:
+            score = self.score(task, node, snapshot)
+            if score >= self.threshold:
+                candidates.append((score, node))
+
+        if candidates:
+            position = self.rules[task]['position']
+            # Prefer the highest score; on ties use document position
+            order = 1 if position == 'first' else -1
+            score, node = max(candidates, key=lambda c: (round(c[0], 3), -order * c[1]['index']))
+            # A clickable ancestor (e.g. <button><span>text</span></button>) is the real target
+            if not node['clickable']:
+                for ancestor in snapshot.ancestors(node):
+                    if ancestor['clickable']:
+                        node = ancestor
+                        break
+            best = {'selector': snapshot.selector_for(node), 'score': round(score, 3), 'text': node['text']}
+
+        self.record(task, best is not None, time.perf_counter() - start)
+        return best
+
+    def resolve_products(self, snapshot):
+        """Find product cards: repeated containers holding a price and a link or image"""
+        start = time.perf_counter()
+        cards = []
+        for node in snapshot.nodes:
+            tokens = set(self._tokens_of(node).split())
+            if not tokens & PRODUCT_TOKENS or not PRICE_PATTERN.search(normalize_text(node['text'])):
+                continue
+            cards.append(node)
+
+        # Keep the innermost card-like containers only
+        card_indexes = {node['index'] for node in cards}
+        innermost = [node for node in cards
+                     if not any(child in card_indexes for child in self._descendants(snapshot, node))]
+
+        products = []
+        for node in innermost:
+            title = self._card_title(snapshot, node)
+            state = self._card_state(snapshot, node)
+            available = state == 'available'
+            products.append({
+                'name': title or node['text'][:60],
+                'selector': snapshot.selector_for(self._card_link(snapshot, node) or node),
+                'state': state,
+                'available': available,
+                # Cards that cannot be bought yet never pass the purchase confidence gate
+                'confidence': ('high' if title else 'medium') if available else 'low',
+            })
+
+        self.record('products', bool(products), time.perf_counter() - start)
+        return products
+
+    def _descendants(self, snapshot, node):
+        stack = list(node['children'])
+        while stack:
+            index = stack.pop()
+            yield index
+            stack.extend(snapshot.nodes[index]['children'])
+
+    def _card_title(self, snapshot, node):
+        for index in self._descendants(snapshot, node):
+            child = snapshot.nodes[index]
+            tokens = set(self._tokens_of(child).split())
+            if child['tag'] in ('h1', 'h2', 'h3', 'h4') or tokens & {'title', 'name'}:
+                if child['text']:
+                    return child['text']
+        return None
+
+    def _card_state(self, snapshot, node):
+        """sold_out / upcoming from the card text, disabled from its first button, else available"""
+        text = normalize_text(node['text'])
+        if any(word in text for word in SOLD_OUT_WORDS):
+            return 'sold_out'
+        if any(word in text for word in UPCOMING_WORDS):
+            return 'upcoming'
+        if node['disabled']:
+            return 'disabled'
+        buttons = [index for index in self._descendants(snapshot, node)
+                   if snapshot.nodes[index]['tag'] in ('button', 'input') or snapshot.nodes[index]['role'] == 'button']
+        if buttons and snapshot.nodes[min(buttons)]['disabled']:
+            return 'disabled'
+        return 'available'
+    
+    def _card_link(self, snapshot, node):
+        if node['tag'] == 'a':
+            return node
+        for index in self._descendants(snapshot, node):
+            child = snapshot.nodes[index]
+            if child['tag'] == 'a' and child['attrs'].get('href'):
+                return child
+        return None
+
+    def record(self, task, hit, elapsed):
+        stats = self.stats.setdefault(task, {'hits': 0, 'misses': 0, 'local_time': 0.0})
+        stats['hits' if hit else 'misses'] += 1
+        stats['local_time'] += elapsed
+
+    def get_report(self, llm_latency):
+        """Hit rate and estimated time saved per task, given the mean LLM latency"""
+        report = {}
+        for task, stats in self.stats.items():
+            lookups = stats['hits'] + stats['misses']
+            report[task] = {
+                'lookups': lookups,
+                'hit_rate': round(stats['hits'] / lookups, 3) if lookups else 0.0,
+                'local_time': round(stats['local_time'], 4),
+                'time_saved': round(max(0.0, stats['hits'] * llm_latency - stats['local_time']), 2),
+            }
+        return report
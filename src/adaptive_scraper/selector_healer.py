@@ -0,0 +1,181 @@
+import re
+import time
+import logging
+from difflib import SequenceMatcher
+from src.utils.text_normalizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Compact signature of one element: tag, text, attribute tokens, ancestor path
+SIGNATURE_JS = r"""
+function signature(el) {
+    var attrs = [];
+    if (el.id) { attrs.push('#' + el.id); }
+    for (var i = 0; i < el.classList.length; i++) { attrs.push('.' + el.classList[i]); }
+    ['name', 'type', 'role', 'aria-label', 'data-testid', 'href', 'value', 'placeholder'].forEach(function (a) {
+        var v = el.getAttribute(a);
+        if (v) { attrs.push(a + '=' + v.slice(0, 60)); }
+    });
+    var path = [], p = el.parentElement;
+    while (p && p !== document.body && path.length < 5) {
+        path.push(p.tagName.toLowerCase() + (p.id ? '#' + p.id : ''));
+        p = p.parentElement;
+    }
+    return {tag: el.tagName.toLowerCase(), text: (el.innerText || el.value || '').trim().slice(0, 80),
+            attrs: attrs, path: path};
+}
+"""
+
+REMEMBER_SCRIPT = SIGNATURE_JS + "return signature(arguments[0]);"
+
+# Synthesizes a selector for one element that avoids generated class hashes.
+# Several uniqueness queries per element, so only the winning candidate gets one.
+SELECTOR_JS = r"""
+var HASHY = /(^|[_-])[a-zA-Z0-9]*\d[a-zA-Z0-9]*$|^[a-zA-Z0-9_-]{5,}__[a-zA-Z0-9]{5,}$/;
+function unique(sel) {
+    try { return document.querySelectorAll(sel).length === 1; } catch (e) { return false; }
+}
+function selectorFor(el) {
+    var tag = el.tagName.toLowerCase();
+    if (el.id && !HASHY.test(el.id) && unique('#' + CSS.escape(el.id))) { return '#' + CSS.escape(el.id); }
+    var attrs = ['data-testid', 'name', 'aria-label', 'placeholder'];
+    for (var i = 0; i < attrs.length; i++) {
+        var v = el.getAttribute(attrs[i]);
+        if (v) {
+            var s = tag + '[' + attrs[i] + '="' + v.replace(/"/g, '\\"') + '"]';
+            if (unique(s)) { return s; }
+        }
+    }
+    var stable = [];
+    for (var j = 0; j < el.classList.length; j++) {
+        if (!HASHY.test(el.classList[j])) { stable.push('.' + CSS.escape(el.classList[j])); }
+    }
+    if (stable.length && unique(tag + stable.join(''))) { return tag + stable.join(''); }
+    var text = (el.innerText || '').trim();
+    if (text && text.length <= 40 && text.indexOf("'") < 0) {
+        var xp = '//' + tag + "[normalize-space(.)='" + text.replace(/\s+/g, ' ') + "']";
+        if (document.evaluate('count(' + xp + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue === 1) {
+            return xp;
+        }
+    }
+    var parts = [], node = el;
+    while (node && node.nodeType === 1 && node !== document.documentElement) {
+        if (node !== el && node.id && !HASHY.test(node.id)) {
+            return "//*[@id='" + node.id + "']/" + parts.join('/');
+        }
+        var i2 = 1, sib = node;
+        while ((sib = sib.previousElementSibling)) { if (sib.tagName === node.tagName) { i2++; } }
+        parts.unshift(node.tagName.toLowerCase() + '[' + i2 + ']');
+        node = node.parentElement;
+    }
+    return '/html/' + parts.join('/');
+}
+"""
+
+SELECTOR_SCRIPT = SELECTOR_JS + "return selectorFor(arguments[0]);"
+
+# Returns visible candidates of the same tag with their signature and element
+CANDIDATES_SCRIPT = SIGNATURE_JS + r"""
+var els = document.getElementsByTagName(arguments[0]), out = [];
+for (var k = 0; k < els.length && out.length < arguments[1]; k++) {
+    var r = els[k].getBoundingClientRect();
+    if (!r.width && !r.height) { continue; }
+    var sig = signature(els[k]);
+    sig.element = els[k];
+    out.push(sig);
+}
+return out;
+"""
+
+_HASH_TOKEN = re.compile(r'[a-z0-9]*\d[a-z0-9]*$')
+_TOKEN_SPLIT = re.compile(r'[\s_\-=#.:/?&]+')
+
+
+def _tokens(attrs):
+    """Split attribute values into stable tokens, dropping generated hashes"""
+    tokens = set()
+    for attr in attrs:
+        for token in _TOKEN_SPLIT.split(attr.lower()):
+            if len(token) > 1 and not (len(token) >= 5 and _HASH_TOKEN.match(token)):
+                tokens.add(token)
+    return tokens
+
+
+def _jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class SelectorHealer:
+    """Repair selectors that stopped matching by finding the most similar element"""
+
+    def __init__(self, driver, threshold=0.6, max_candidates=400):
+        self.driver = driver
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.signatures = {}
+        self.aliases = {}
+        self.stats = {'healed': 0, 'failed': 0}
+
+    def remember(self, selector, element):
+        """Store the signature of the element a selector matched"""
+        if selector in self.signatures:
+            return
+        try:
+            self.signatures[selector] = self.driver.execute_script(REMEMBER_SCRIPT, element)
+        except Exception as e:
+            logger.debug(f"Could not store signature for {selector}: {e}")
+
+    def similarity(self, old, new):
+        """Weighted similarity of two signatures in 0..1"""
+        if old['tag'] != new['tag']:
+            return 0.0
+        old_text, new_text = normalize_text(old['text']), normalize_text(new['text'])
+        if old_text or new_text:
+            text_score = SequenceMatcher(None, old_text, new_text).ratio()
+        else:
+            text_score = 1.0
+        attr_score = _jaccard(_tokens(old['attrs']), _tokens(new['attrs']))
+        path_score = SequenceMatcher(None, old['path'], new['path']).ratio()
+        return 0.45 * text_score + 0.35 * attr_score + 0.2 * path_score
+
+    def heal(self, selector):
+        """Return a new selector for the element the stale selector used to match"""
+        signature = self.signatures.get(selector)
+        if not signature:
+            return None
+
+        start = time.perf_counter()
+        try:
+            candidates = self.driver.execute_script(CANDIDATES_SCRIPT, signature['tag'], self.max_candidates)
+        except Exception as e:
+            logger.warning(f"⚠️ Selector healing failed for {selector}: {e}")
+            return None
+
+        best, best_score = None, 0.0
+        for candidate in candidates or []:
+            score = self.similarity(signature, candidate)
+            if score > best_score:
+                best, best_score = candidate, score
+
+        if not best or best_score < self.threshold:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stats['failed'] += 1
+            logger.info(f"🩹 No similar element for {selector} (best {best_score:.2f}, {elapsed:.0f}ms)")
+            return None
+
+        try:
+            healed = self.driver.execute_script(SELECTOR_SCRIPT, best.pop('element'))
+        except Exception as e:
+            logger.warning(f"⚠️ Selector healing failed for {selector}: {e}")
+            return None
+        elapsed = (time.perf_counter() - start) * 1000
+        if not healed:
+            return None
+
+        self.aliases[selector] = healed
+        self.signatures[healed] = best
+        self.stats['healed'] += 1
+        logger.info(f"🩹 Healed selector {selector} -> {healed} (similarity {best_score:.2f}, {elapsed:.0f}ms)")
+        return healed
@@ -0,0 +1,163 @@
+import logging
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Idle cycles a queued selector may match nothing on the loaded page before it is dropped
+QUEUED_ATTEMPTS = 3
+
+EVALUATE_JS = r"""
+function evaluate(sel) {
+    if (sel.charAt(0) === '/' || sel.charAt(0) === '(') {
+        var r = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), out = [];
+        for (var i = 0; i < r.snapshotLength; i++) { out.push(r.snapshotItem(i)); }
+        return out;
+    }
+    return Array.prototype.slice.call(document.querySelectorAll(sel));
+}
+"""
+
+# Rewrites a selector into the cheapest equivalent CSS selector: id, then a
+# unique class chain, then a path scoped to the nearest ancestor with an id.
+# Every candidate is verified to match exactly the original element set.
+# Generated ids and classes (numbers, hashes, React ":r1:" ids) are never
+# used, since they change between builds and pages.
+OPTIMIZE_SCRIPT = EVALUATE_JS + r"""
+var target = evaluate(arguments[0]);
+if (!target.length) { return {count: 0, optimized: null}; }
+var set = new Set(target);
+function same(s) {
+    try {
+        var m = document.querySelectorAll(s);
+        if (m.length !== target.length) { return false; }
+        for (var i = 0; i < m.length; i++) { if (!set.has(m[i])) { return false; } }
+        return true;
+    } catch (e) { return false; }
+}
+function esc(s) { return CSS.escape(s); }
+function stable(name) {
+    if (!name || /\d{3,}|:/.test(name)) { return false; }
+    return !name.split(/[-_]+/).some(function (part) {
+        return part.length >= 5 && /\d/.test(part) && /[a-z]/i.test(part);
+    });
+}
+var first = target[0], tag = first.tagName.toLowerCase();
+var sameTag = target.every(function (el) { return el.tagName === first.tagName; });
+var candidates = [];
+if (target.length === 1 && stable(first.id)) { candidates.push('#' + esc(first.id)); }
+var common = Array.prototype.slice.call(first.classList).filter(function (c) {
+    return stable(c) && target.every(function (el) { return el.classList.contains(c); });
+});
+common.forEach(function (c) {
+    if (sameTag) { candidates.push(tag + '.' + esc(c)); }
+    candidates.push('.' + esc(c));
+});
+for (var i = 0; i < common.length; i++) {
+    for (var j = i + 1; j < common.length; j++) {
+        candidates.push((sameTag ? tag : '') + '.' + esc(common[i]) + '.' + esc(common[j]));
+    }
+}
+function scopedPath(el) {
+    var parts = [];
+    for (var node = el; node && node !== document.documentElement; node = node.parentElement) {
+        if (node !== el && stable(node.id)) { return '#' + esc(node.id) + ' > ' + parts.join(' > '); }
+        var i = 1, s = node;
+        while ((s = s.previousElementSibling)) { if (s.tagName === node.tagName) { i++; } }
+        parts.unshift(node.tagName.toLowerCase() + ':nth-of-type(' + i + ')');
+    }
+    return 'html > ' + parts.join(' > ');
+}
+if (target.length === 1) {
+    candidates.push(scopedPath(first));
+} else {
+    for (var anc = first.parentElement; anc && anc !== document.documentElement; anc = anc.parentElement) {
+        if (stable(anc.id) && target.every(function (el) { return anc.contains(el); })) {
+            common.forEach(function (c) { candidates.push('#' + esc(anc.id) + ' ' + (sameTag ? tag : '') + '.' + esc(c)); });
+            if (sameTag) { candidates.push('#' + esc(anc.id) + ' ' + tag); }
+            break;
+        }
+    }
+}
+for (var k = 0; k < candidates.length; k++) {
+    if (same(candidates[k])) { return {count: target.length, optimized: candidates[k]}; }
+}
+return {count: target.length, optimized: null};
+"""
+
+# Average evaluation time of a selector in milliseconds
+MEASURE_SCRIPT = EVALUATE_JS + r"""
+var start = performance.now();
+for (var i = 0; i < arguments[1]; i++) { evaluate(arguments[0]); }
+return (performance.now() - start) / arguments[1];
+"""
+
+
+class SelectorOptimizer:
+    """Rewrite slow substring/XPath selectors into verified, cheaper equivalents"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.cache = {}
+        # Selectors with a rewrite on some page; lookup() skips the URL round trip for the rest
+        self.rewritten = set()
+        # Selector -> attempts left, optimized by run_queued() when the browser is idle
+        self.queued = {}
+
+    def _path(self):
+        try:
+            return urlparse(self.driver.current_url).path
+        except Exception:
+            return ''
+
+    def lookup(self, selector):
+        """Get the cached rewrite for a selector, or the selector itself"""
+        if selector not in self.rewritten:
+            return selector
+        return self.cache.get((self._path(), selector), selector)
+
+    def optimize(self, selector):
+        """Return the cheapest selector matching the same elements, caching the rewrite"""
+        key = (self._path(), selector)
+        if key not in self.cache:
+            self._rewrite(key, selector)
+        return self.cache.get(key, selector)
+
+    def _rewrite(self, key, selector):
+        """Run the optimizer in the page and cache its answer; False if nothing matches right now"""
+        try:
+            result = self.driver.execute_script(OPTIMIZE_SCRIPT, selector)
+        except Exception as e:
+            logger.debug(f"Could not optimize selector {selector}: {e}")
+            return False
+        if not result or not result.get('count'):
+            return False
+        optimized = result.get('optimized') or selector
+        self.cache[key] = optimized
+        if optimized != selector:
+            self.rewritten.add(selector)
+            logger.info(f"⚡ Optimized selector {selector} -> {optimized} ({result['count']} elements)")
+        return True
+
+    def queue(self, selector):
+        """Optimize the selector later, off the path of the click that needs it"""
+        if selector not in self.queued:
+            self.queued[selector] = QUEUED_ATTEMPTS
+
+    def run_queued(self, limit=4):
+        """Optimize up to limit queued selectors against the loaded page; returns how many were done"""
+        if not self.queued:
+            return 0
+        path = self._path()
+        done = 0
+        for selector in list(self.queued)[:limit]:
+            attempts = self.queued.pop(selector)
+            if (path, selector) in self.cache or self._rewrite((path, selector), selector):
+                done += 1
+            elif attempts > 1:
+                # Planned on another page; retry on a later idle cycle
+                self.queued[selector] = attempts - 1
+        return done
+
+    def measure(self, selector, iterations=100):
+        """Average in-page evaluation time of a selector in milliseconds"""
+        return self.driver.execute_script(MEASURE_SCRIPT, selector, iterations)
@@ -0,0 +1,137 @@
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, CancelledError, TimeoutError as FutureTimeout
+from src.adaptive_scraper.dom_snapshot import DomSnapshot
+from src.adaptive_scraper.heuristic_resolver import HeuristicResolver
+
+logger = logging.getLogger(__name__)
+
+# Compact markup sent to the LLM is capped; the prompt keeps even less
+MAX_COMPACT_HTML = 20000
+
+# Returned by SnapshotProcessor.process when a newer snapshot of the stream superseded this one
+STALE = 'stale'
+
+_worker_resolver = None
+
+
+def analyze_snapshot(source, tasks, kind='projection', resolver=None):
+    """Parse, fingerprint and score candidates for a snapshot; safe to run in a worker process"""
+    global _worker_resolver
+    if resolver is None:
+        if _worker_resolver is None:
+            _worker_resolver = HeuristicResolver()
+        resolver = _worker_resolver
+
+    snapshot = DomSnapshot.from_projection(source) if kind == 'projection' else DomSnapshot.from_html(source)
+
+    digest = hashlib.blake2b(digest_size=8)
+    for node in snapshot.nodes:
+        digest.update(f"{node['tag']}|{' '.join(node['classes'])}|{node['own_text']}|{node['disabled']}\n".encode('utf-8'))
+
+    result = {
+        'fingerprint': digest.hexdigest(),
+        'nodes': len(snapshot),
+        'compact_html': snapshot.to_compact_html()[:MAX_COMPACT_HTML],
+        'fields': snapshot.form_fields(),
+        'timings': {},
+    }
+    for task in tasks:
+        start = time.perf_counter()
+        if task == 'products':
+            result[task] = resolver.resolve_products(snapshot)
+        else:
+            result[task] = resolver.resolve(task, snapshot)
+        result['timings'][task] = (bool(result[task]), time.perf_counter() - start)
+    return result
+
+
+class SnapshotProcessor:
+    """Process pool for snapshot parsing and scoring, off the browser-driving threads"""
+
+    def __init__(self, max_workers=2, max_pending=4):
+        self.max_workers = max_workers
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.executor = None
+        # Snapshots of one stream (e.g. one browser page) supersede each other
+        self.versions = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.stats = {'submitted': 0, 'completed': 0, 'stale': 0, 'rejected': 0}
+
+    def _ensure_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    def _count(self, key):
+        # Finders on several browser threads share the processor
+        with self.lock:
+            self.stats[key] += 1
+
+    def submit(self, source, tasks, kind='projection', stream='default'):
+        """Queue a snapshot; older snapshots of the same stream still queued are cancelled as stale"""
+        if not self.slots.acquire(blocking=False):
+            self._count('rejected')
+            return None, None
+
+        with self.lock:
+            version = (stream, self.versions.get(stream, 0) + 1)
+            self.versions[stream] = version[1]
+            superseded = [future for old_version, future in self.pending.items() if old_version[0] == stream]
+            try:
+                future = self._ensure_executor().submit(analyze_snapshot, source, list(tasks), kind)
+            except Exception as e:
+                self.slots.release()
+                logger.warning(f"⚠️ Could not queue snapshot for processing: {e}")
+                return None, None
+            self.pending[version] = future
+            self.stats['submitted'] += 1
+
+        # Cancelling runs done callbacks synchronously, so do it outside the lock
+        for old_future in superseded:
+            if old_future.cancel():
+                self._count('stale')
+        future.add_done_callback(lambda f, v=version: self._done(v))
+        return version, future
+
+    def _done(self, version):
+        with self.lock:
+            self.pending.pop(version, None)
+        self.slots.release()
+
+    def is_stale(self, version):
+        stream, number = version
+        return number != self.versions.get(stream)
+
+    def process(self, source, tasks, kind='projection', stream='default', timeout=10):
+        """Process a snapshot and wait for it; STALE if a newer snapshot of the stream
+        superseded it, None if rejected, failed or timed out"""
+        version, future = self.submit(source, tasks, kind, stream)
+        if future is None:
+            return None
+        try:
+            result = future.result(timeout=timeout)
+        except CancelledError:
+            # Cancelled (and counted) by a newer submit of the same stream
+            return STALE
+        except FutureTimeout:
+            future.cancel()
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Snapshot processing failed: {e}")
+            return None
+        if self.is_stale(version):
+            # A newer snapshot superseded this one while it was running
+            self._count('stale')
+            return STALE
+        self._count('completed')
+        return result
+
+    def shutdown(self):
+        """Stop worker processes and drop queued work"""
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
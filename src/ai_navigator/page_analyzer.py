@@ -0,0 +1,148 @@
+import re
+import time
+import logging
+from urllib.parse import urlparse
+from src.utils.keyword_index import KeywordAutomaton
+from src.utils.text_normalizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+TIMETABLE = 'timetable'
+PRODUCT = 'product'
+CART = 'cart'
+CHECKOUT = 'checkout'
+PAYMENT_GATEWAY = 'payment_gateway'
+LOGIN = 'login'
+SOLD_OUT = 'sold_out'
+UNKNOWN = 'unknown'
+
+# (page type, weight, host pattern, path pattern)
+URL_RULES = [
+    (PAYMENT_GATEWAY, 4.0, re.compile(r'shaparak\.ir$|bank|ipg|gateway|sep\.ir$|pec\.ir$'), None),
+    (PAYMENT_GATEWAY, 3.0, None, re.compile(r'/(payment|gateway|ipg|bank)(/|$)')),
+    (LOGIN, 3.0, None, re.compile(r'/(login|signin|sign-in|auth|otp|verify)(/|$)')),
+    (TIMETABLE, 3.0, None, re.compile(r'/timetable(/|$)')),
+    (CART, 3.0, None, re.compile(r'/(cart|basket)(/|$)')),
+    (CHECKOUT, 3.0, None, re.compile(r'/(checkout|shipping|order)(/|$)')),
+    (PRODUCT, 3.0, None, re.compile(r'/(product|products|p|item|deal)/[^/]+')),
+]
+
+# Keywords found in the title or the first screen of visible text
+TEXT_RULES = {
+    TIMETABLE: {'زمان بندی': 2.0, 'جدول زمانی': 2.0, 'timetable': 2.0, 'شروع فروش': 1.5, 'تخفیف های امروز': 1.0},
+    PRODUCT: {'افزودن به سبد خرید': 2.5, 'add to cart': 2.5, 'مشخصات فنی': 1.0, 'توضیحات محصول': 1.0},
+    CART: {'سبد خرید شما': 2.5, 'your cart': 2.5, 'ادامه فرایند خرید': 2.0, 'جمع سبد خرید': 2.0},
+    CHECKOUT: {'ثبت سفارش': 2.0, 'اطلاعات ارسال': 2.0, 'آدرس تحویل': 2.0, 'انتخاب روش پرداخت': 2.5,
+               'shipping address': 2.0, 'payment method': 2.0},
+    PAYMENT_GATEWAY: {'درگاه پرداخت': 3.0, 'شاپرک': 3.0, 'شماره کارت': 2.0, 'cvv2': 2.5, 'رمز دوم': 2.5},
+    LOGIN: {'ورود به حساب': 2.5, 'ورود یا ثبت نام': 3.0, 'کد تایید': 2.0, 'شماره موبایل خود را وارد کنید': 2.5,
+            'login': 1.5, 'sign in': 1.5},
+    SOLD_OUT: {'ناموجود': 2.5, 'تمام شد': 2.5, 'به اتمام رسید': 2.5, 'موجودی تمام': 2.5, 'sold out': 2.5,
+               'out of stock': 2.5},
+}
+
+# Collects the structural markers in one round trip. buy_controls counts
+# visible, enabled add-to-cart or buy buttons.
+MARKERS_SCRIPT = r"""
+var q = function (s) { return document.querySelectorAll(s).length; };
+var body = document.body;
+// Not a bare 'خرید': the header's 'سبد خرید' button is on every page
+var BUY = ['افزودن به سبد', 'اضافه به سبد', 'خرید محصول', 'خرید اقساطی', 'add to cart', 'buy now'];
+var buy = Array.prototype.filter.call(
+    document.querySelectorAll("button, [role=button], input[type=submit]"),
+    function (el) {
+        if (el.disabled || el.getAttribute('aria-disabled') === 'true' || !el.getClientRects().length) { return false; }
+        var label = (el.innerText || el.value || '').trim().toLowerCase();
+        return label === 'خرید' || label === 'buy' || BUY.some(function (word) { return label.indexOf(word) >= 0; });
+    }
+).length;
+return {
+    title: document.title || '',
+    text: body ? (body.innerText || '').slice(0, 3000) : '',
+    password_inputs: q('input[type=password]'),
+    otp_inputs: q('input[autocomplete=one-time-code], input[maxlength="1"][inputmode=numeric]'),
+    tel_inputs: q('input[type=tel], input[name*=phone], input[name*=mobile]'),
+    card_inputs: q('input[name*=pan], input[name*=card], input[name*=cvv]'),
+    form_inputs: q('form input:not([type=hidden]), form select, form textarea'),
+    enabled_buttons: q('button:not([disabled])'),
+    buy_controls: buy,
+    product_cards: q('[class*=product], [class*=card]')
+};
+"""
+
+
+class PageTypeClassifier:
+    """Classify the current page from URL, title and a few structural markers"""
+
+    def __init__(self):
+        self.text_index = KeywordAutomaton()
+        for page_type, keywords in TEXT_RULES.items():
+            for keyword, weight in keywords.items():
+                self.text_index.add(normalize_text(keyword), (page_type, weight))
+        self.text_index.build()
+
+    def classify(self, url, title='', markers=None):
+        """Return (page_type, scores) for the given URL, title and markers"""
+        scores = {}
+
+        def add(page_type, weight):
+            scores[page_type] = scores.get(page_type, 0.0) + weight
+
+        parsed = urlparse(url or '')
+        host, path = parsed.netloc.lower(), parsed.path.lower()
+        for page_type, weight, host_pattern, path_pattern in URL_RULES:
+            if host_pattern and host_pattern.search(host) or path_pattern and path_pattern.search(path):
+                add(page_type, weight)
+
+        markers = markers or {}
+        text = normalize_text(f"{title or markers.get('title', '')} {markers.get('text', '')}")
+        seen = set()
+        for _, _, keyword, (page_type, weight) in self.text_index.longest_matches(text):
+            if keyword not in seen:
+                seen.add(keyword)
+                add(page_type, weight)
+
+        if markers.get('password_inputs') or markers.get('otp_inputs'):
+            add(LOGIN, 2.0)
+        if markers.get('tel_inputs') and markers.get('form_inputs', 0) <= 2:
+            add(LOGIN, 1.0)
+        if markers.get('card_inputs'):
+            add(PAYMENT_GATEWAY, 2.0)
+        if markers.get('form_inputs', 0) >= 4:
+            add(CHECKOUT, 1.5)
+        if markers.get('product_cards', 0) >= 6:
+            add(TIMETABLE, 1.0)
+
+        # Sold-out wording also shows up on a sold-out variant or a related product
+        # card, so a product page is sold out only when nothing can be bought on it;
+        # a grid with some sold-out items is still the timetable
+        sold_out_product = False
+        if SOLD_OUT in scores:
+            if markers.get('buy_controls'):
+                del scores[SOLD_OUT]
+            elif 'buy_controls' in markers and PRODUCT in scores and scores.get(TIMETABLE, 0) < scores[PRODUCT]:
+                sold_out_product = True
+
+        if not scores:
+            return UNKNOWN, scores
+        if sold_out_product:
+            return SOLD_OUT, scores
+        page_type = max(scores.items(), key=lambda item: item[1])[0]
+        if page_type == SOLD_OUT and scores.get(TIMETABLE, 0) >= scores[SOLD_OUT]:
+            page_type = TIMETABLE
+        return page_type, scores
+
+    def classify_driver(self, driver):
+        """Classify the page currently loaded in the driver"""
+        start = time.perf_counter()
+        try:
+            markers = driver.execute_script(MARKERS_SCRIPT) or {}
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read page markers: {e}")
+            markers = {}
+        page_type, _ = self.classify(driver.current_url, markers.get('title', ''), markers)
+        logger.debug(f"Page classified as {page_type} in {(time.perf_counter() - start) * 1000:.1f}ms")
+        return page_type
+
+
+PAGE_CLASSIFIER = PageTypeClassifier()
@@ -1,5 +1,4 @@
 import os
-import time
 import json
 import logging
 import webbrowser
@@ -7,6 +6,8 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from src.browser.text_index import PageTextIndex
+from src.browser.wait_engine import WaitEngine, element_present, dom_quiet, network_idle, all_of
 
 logger = logging.getLogger(__name__)
 
@@ -94,24 +95,21 @@ class SnapAuthenticator:
         try:
             # Try to access a page that requires login
             self.driver.get("https://app.snapp.taxi/")
-            time.sleep(3)
+            
+            # Stop waiting once a logged-in indicator shows up or the page settles
+            indicators = "a[href*='profile'], [class*='user']"
+            WaitEngine(self.driver).until(
+                3,
+                indicator=element_present(indicators),
+                quiet=all_of(dom_quiet(300), network_idle(300))
+            )
             
             # Check for elements that indicate logged-in state
-            indicators = [
-                "//*[contains(text(), 'پروفایل')]",
-                "//*[contains(text(), 'Profile')]",
-                "//*[contains(@href, 'profile')]",
-                "//*[contains(@class, 'user')]"
-            ]
+            text_matches = PageTextIndex(self.driver).find_all([('پروفایل', None), ('Profile', None)])
+            if any(text_matches):
+                return True
             
-            for indicator in indicators:
-                try:
-                    self.driver.find_element(By.XPATH, indicator)
-                    return True
-                except:
-                    continue
-                    
-            return False
+            return bool(self.driver.find_elements(By.CSS_SELECTOR, indicators))
             
         except Exception as e:
             print(f"⚠️ Could not verify login: {e}")
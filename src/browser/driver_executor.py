@@ -0,0 +1,145 @@
+import heapq
+import logging
+import itertools
+import threading
+from concurrent.futures import Future
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.remote.switch_to import SwitchTo
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first: a queued purchase click goes ahead of queued monitoring reads
+PURCHASE = 0
+MONITOR = 10
+
+
+class DriverExecutor:
+    """Owns one driver; every command runs on its thread, in priority order.
+
+    Selenium drivers are not thread-safe, so callers never touch the driver
+    directly: they submit commands and get futures back, or use a
+    DriverProxy that does that for them.
+    """
+
+    def __init__(self, driver, name='driver'):
+        self.driver = driver
+        self.heap = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.running = True
+        self.stats = {'commands': 0, 'failed': 0, 'by_priority': {}}
+        self.thread = threading.Thread(target=self._run, name=f"{name}-executor", daemon=True)
+        self.thread.start()
+
+    def submit(self, command, priority=MONITOR):
+        """Queue command(driver); returns a Future with its result"""
+        future = Future()
+        if threading.current_thread() is self.thread:
+            # Issued from inside a running command: run it now instead of deadlocking
+            self._execute(command, future)
+            return future
+        with self.condition:
+            if not self.running:
+                future.set_exception(RuntimeError('driver executor stopped'))
+                return future
+            heapq.heappush(self.heap, (priority, next(self.counter), command, future))
+            self.condition.notify()
+        return future
+
+    def call(self, command, priority=MONITOR):
+        """Run command(driver) on the executor thread and wait for its result"""
+        return self.submit(command, priority).result()
+
+    def proxy(self, priority):
+        """A driver look-alike whose calls all go through this executor at the given priority"""
+        return DriverProxy(self, self.driver, priority)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.heap:
+                    self.condition.wait()
+                if not self.heap:
+                    return
+                priority, _, command, future = heapq.heappop(self.heap)
+            if not future.set_running_or_notify_cancel():
+                continue
+            by_priority = self.stats['by_priority']
+            by_priority[priority] = by_priority.get(priority, 0) + 1
+            self._execute(command, future)
+
+    def _execute(self, command, future):
+        self.stats['commands'] += 1
+        try:
+            future.set_result(command(self.driver))
+        except BaseException as e:
+            self.stats['failed'] += 1
+            future.set_exception(e)
+
+    def shutdown(self):
+        """Finish the queued commands, then stop the thread"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join(timeout=10)
+
+
+class DriverProxy:
+    """Stands in for a WebDriver, WebElement or SwitchTo; attribute reads and calls run on the executor.
+
+    Returned elements and switch_to are wrapped too, so element.click() is
+    serialized like driver.find_element(); proxies passed back as arguments
+    (e.g. to execute_script) are unwrapped on the executor thread.
+    """
+
+    def __init__(self, executor, target, priority):
+        object.__setattr__(self, '_executor', executor)
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_priority', priority)
+
+    def __getattr__(self, name):
+        target = self._target
+        if isinstance(getattr(type(target), name, None), property):
+            # Properties such as page_source and current_url talk to the browser
+            return self._wrap(self._executor.call(lambda driver: getattr(target, name), self._priority))
+        attr = getattr(target, name)
+        if not callable(attr):
+            return attr
+
+        def command(*args, **kwargs):
+            args = [_unwrap(arg) for arg in args]
+            kwargs = {key: _unwrap(value) for key, value in kwargs.items()}
+            return self._wrap(self._executor.call(lambda driver: attr(*args, **kwargs), self._priority))
+        return command
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __eq__(self, other):
+        return self._target == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return f"<DriverProxy priority={self._priority} {self._target!r}>"
+
+    def _wrap(self, value):
+        # execute_script results may carry elements inside lists and dicts
+        if isinstance(value, (WebElement, SwitchTo)):
+            return DriverProxy(self._executor, value, self._priority)
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+
+def _unwrap(value):
+    if isinstance(value, DriverProxy):
+        return value._target
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
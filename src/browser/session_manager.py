@@ -1,6 +1,9 @@
 import json
+import queue
 import logging
 import os
+import threading
+from urllib.parse import urlparse
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -11,9 +14,21 @@ class SessionManager:
     def __init__(self):
         self.driver = None
         self.current_session_id = None
+        # Extra drivers carrying the primary's session, handed out for parallel purchases
+        self.pool = queue.Queue()
+        self.pool_drivers = []
+        self.pool_lock = threading.Lock()
+        self.headless = False
     
     def create_driver(self, headless=False):
         """Create and configure Chrome driver"""
+        self.headless = headless
+        # Only the primary's performance log is drained (by the network sale detector)
+        self.driver = self._launch_driver(headless, network_log=True)
+        return self.driver
+    
+    def _launch_driver(self, headless=False, network_log=False):
+        """Start one configured Chrome instance"""
         try:
             options = Options()
             
@@ -26,6 +41,12 @@ class SessionManager:
             options.add_experimental_option('excludeSwitches', ['enable-automation'])
             options.add_experimental_option('useAutomationExtension', False)
             
+            if network_log:
+                # Network events in the performance log feed the network sale detector; browsers
+                # nobody drains would buffer them for the whole session
+                options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+                options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+            
             # Set user agent
             options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36')
             
@@ -34,27 +55,110 @@ class SessionManager:
                 # First try: Use webdriver-manager if available
                 from webdriver_manager.chrome import ChromeDriverManager
                 service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=options)
+                driver = webdriver.Chrome(service=service, options=options)
             except ImportError:
                 # Fallback: Use system ChromeDriver
-                self.driver = webdriver.Chrome(options=options)
+                driver = webdriver.Chrome(options=options)
             
             # Execute script to remove webdriver property
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             logger.info("✅ Browser driver created successfully")
-            return self.driver
+            return driver
             
         except Exception as e:
             logger.error(f"❌ Failed to create browser driver: {e}")
             # Ultimate fallback - try without service
             try:
-                self.driver = webdriver.Chrome(options=options)
-                return self.driver
+                return webdriver.Chrome(options=options)
             except Exception as e2:
                 logger.error(f"❌ Ultimate fallback also failed: {e2}")
                 raise
     
+    def create_pool(self, size):
+        """Start size extra drivers that share the primary driver's logged-in session"""
+        created = 0
+        for _ in range(size):
+            driver = self._new_pool_driver()
+            if driver:
+                with self.pool_lock:
+                    self.pool_drivers.append(driver)
+                self.pool.put(driver)
+                created += 1
+        logger.info(f"✅ Driver pool ready: {created}/{size} browsers")
+        return created
+    
+    def _new_pool_driver(self):
+        try:
+            driver = self._launch_driver(self.headless)
+        except Exception as e:
+            logger.error(f"❌ Could not add browser to pool: {e}")
+            return None
+        if not self.clone_session(driver):
+            driver.quit()
+            return None
+        return driver
+    
+    def clone_session(self, driver):
+        """Copy cookies and localStorage from the primary driver into another driver"""
+        state = self.get_session_state()
+        if not state:
+            return False
+        try:
+            parsed = urlparse(state['current_url'])
+            # Cookies and storage can only be set on a page of the same origin
+            driver.get(f"{parsed.scheme}://{parsed.netloc}/")
+            for cookie in state['cookies']:
+                if cookie.get('sameSite') not in ('Strict', 'Lax', 'None'):
+                    cookie.pop('sameSite', None)
+                try:
+                    driver.add_cookie(cookie)
+                except Exception as e:
+                    logger.debug(f"Skipped cookie {cookie.get('name')}: {e}")
+            driver.execute_script(
+                "var items = JSON.parse(arguments[0] || '{}');"
+                "for (var key in items) { window.localStorage.setItem(key, items[key]); }",
+                state['local_storage']
+            )
+            driver.get(state['current_url'])
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to clone session: {e}")
+            return False
+    
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return document.readyState") is not None
+        except Exception:
+            return False
+    
+    def checkout(self, timeout=None):
+        """Take a healthy pooled driver, replacing dead ones; None if none is free in time"""
+        try:
+            driver = self.pool.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if self._is_healthy(driver):
+            return driver
+        logger.warning("⚠️ Pooled browser unresponsive, replacing it")
+        with self.pool_lock:
+            if driver in self.pool_drivers:
+                self.pool_drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        replacement = self._new_pool_driver()
+        if replacement:
+            with self.pool_lock:
+                self.pool_drivers.append(replacement)
+        return replacement
+    
+    def release(self, driver):
+        """Return a driver taken with checkout()"""
+        if driver is not None:
+            self.pool.put(driver)
+    
     def save_session(self, session_id=None):
         """Save current browser session"""
         if not self.driver:
@@ -134,8 +238,19 @@ class SessionManager:
             logger.error(f"❌ Failed to get session state: {e}")
             return {}
     
+    def close_pool(self):
+        """Quit the pooled drivers, leaving the primary browser open"""
+        with self.pool_lock:
+            pool_drivers, self.pool_drivers = self.pool_drivers, []
+        for driver in pool_drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    
     def close(self):
         """Close browser session"""
+        self.close_pool()
         if self.driver:
             self.driver.quit()
             self.driver = None
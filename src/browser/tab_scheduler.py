@@ -0,0 +1,201 @@
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from src.browser.wait_engine import Wait
+
+logger = logging.getLogger(__name__)
+
+
+class Offload:
+    """A yielded callable running on the scheduler's worker threads; it must not touch the driver"""
+
+    def __init__(self, future):
+        self.future = future
+
+
+class Tab:
+    def __init__(self, handle, state):
+        self.handle = handle
+        # Per-tab finder and anything else the task keeps between steps
+        self.state = state
+        self.task = None
+        self.waiting = None
+        self.future = None
+        self.last_used = time.monotonic()
+
+
+class TabScheduler:
+    """Run many product flows on one driver, one window handle each, interleaving their waits.
+
+    A task is a generator function task(driver, tab) that yields Wait objects
+    whenever it would block on the page, and plain callables for slow work
+    that needs no driver (LLM calls); while one tab waits, the others run.
+    All WebDriver commands happen on the scheduler thread, so the driver is
+    never used concurrently.
+    """
+
+    def __init__(self, driver, state_factory=None, max_tabs=4, idle_timeout=120.0, poll_interval=0.05):
+        self.driver = driver
+        self.state_factory = state_factory or (lambda driver: {})
+        self.max_tabs = max_tabs
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.home = driver.current_window_handle
+        self.tabs = []
+        self.pending = queue.Queue()
+        self.offload = ThreadPoolExecutor(max_workers=max_tabs, thread_name_prefix='tab-offload')
+        self.running = True
+        self.current = None
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'tabs_opened': 0, 'tabs_closed': 0,
+                      'peak_tabs': 0, 'busy_time': 0.0}
+        self.started = time.monotonic()
+        self.thread = threading.Thread(target=self._loop, name='tab-scheduler', daemon=True)
+        self.thread.start()
+
+    def submit(self, task):
+        """Queue a task; returns a Future with the generator's return value"""
+        future = Future()
+        self.pending.put((task, future))
+        self.stats['submitted'] += 1
+        return future
+
+    def _switch(self, tab):
+        if self.current != tab.handle:
+            self.driver.switch_to.window(tab.handle)
+            self.current = tab.handle
+
+    def _free_tab(self):
+        for tab in self.tabs:
+            if tab.task is None:
+                return tab
+        if len(self.tabs) >= self.max_tabs:
+            return None
+        self.driver.switch_to.new_window('tab')
+        self.current = self.driver.current_window_handle
+        tab = Tab(self.current, self.state_factory(self.driver))
+        self.tabs.append(tab)
+        self.stats['tabs_opened'] += 1
+        self.stats['peak_tabs'] = max(self.stats['peak_tabs'], len(self.tabs))
+        return tab
+
+    def _start_pending(self):
+        while not self.pending.empty():
+            tab = self._free_tab()
+            if tab is None:
+                return
+            task, future = self.pending.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            self._switch(tab)
+            tab.task = task(self.driver, tab)
+            tab.future = future
+            self._advance(tab, None)
+
+    def _advance(self, tab, value, error=None):
+        """Run the tab's task until it yields its next step or finishes"""
+        start = time.monotonic()
+        try:
+            self._switch(tab)
+            step = tab.task.throw(error) if error else tab.task.send(value)
+            tab.waiting = step if isinstance(step, Wait) else Offload(self.offload.submit(step))
+        except StopIteration as done:
+            self._finish(tab, result=done.value)
+        except Exception as e:
+            logger.error(f"❌ Tab task failed: {e}")
+            self._finish(tab, error=e)
+        finally:
+            tab.last_used = time.monotonic()
+            self.stats['busy_time'] += tab.last_used - start
+
+    def _finish(self, tab, result=None, error=None):
+        if error is None:
+            tab.future.set_result(result)
+            self.stats['completed'] += 1
+        else:
+            tab.future.set_exception(error)
+            self.stats['failed'] += 1
+        tab.task = tab.waiting = tab.future = None
+
+    def _close_idle(self):
+        now = time.monotonic()
+        for tab in list(self.tabs):
+            if tab.task is None and now - tab.last_used > self.idle_timeout:
+                try:
+                    self._switch(tab)
+                    self.driver.close()
+                except Exception as e:
+                    logger.debug(f"Could not close idle tab: {e}")
+                self.tabs.remove(tab)
+                self.current = None
+                self.stats['tabs_closed'] += 1
+        if self.current is None:
+            self.driver.switch_to.window(self.home)
+            self.current = self.home
+
+    def _loop(self):
+        while self.running:
+            try:
+                self._start_pending()
+                progressed = False
+                for tab in self.tabs:
+                    if tab.task is None or tab.waiting is None:
+                        continue
+                    if isinstance(tab.waiting, Offload):
+                        future = tab.waiting.future
+                        if future.done():
+                            error = future.exception()
+                            self._advance(tab, None if error else future.result(), error)
+                            progressed = True
+                        continue
+                    self._switch(tab)
+                    done, value = tab.waiting.poll(self.driver)
+                    if done:
+                        self._advance(tab, value)
+                        progressed = True
+                self._close_idle()
+                if not progressed:
+                    time.sleep(self.poll_interval)
+            except Exception as e:
+                logger.error(f"❌ Tab scheduler error: {e}")
+                time.sleep(self.poll_interval)
+
+    def memory_mb(self):
+        """Resident memory of this Chrome instance (all its processes), if psutil is installed"""
+        try:
+            import psutil
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return round(sum(p.memory_info().rss for p in processes) / 1024 / 1024, 1)
+        except ImportError:
+            return None
+        except Exception as e:
+            logger.debug(f"Could not measure browser memory: {e}")
+            return None
+
+    def get_report(self):
+        """Throughput and memory of the tab scheduler"""
+        elapsed = time.monotonic() - self.started
+        memory = self.memory_mb()
+        done = self.stats['completed'] + self.stats['failed']
+        return {
+            **self.stats,
+            'busy_time': round(self.stats['busy_time'], 2),
+            'open_tabs': len(self.tabs),
+            'throughput_per_min': round(done / elapsed * 60, 2) if elapsed else 0.0,
+            'memory_mb': memory,
+            'memory_per_tab_mb': round(memory / max(1, len(self.tabs) + 1), 1) if memory else None,
+        }
+
+    def shutdown(self, timeout=5.0):
+        """Stop the scheduler; queued and unfinished tasks are cancelled"""
+        self.running = False
+        self.thread.join(timeout)
+        self.offload.shutdown(wait=False)
+        while not self.pending.empty():
+            self.pending.get()[1].cancel()
+        for tab in self.tabs:
+            if tab.future:
+                tab.future.set_exception(RuntimeError('tab scheduler stopped'))
+                tab.task = tab.waiting = tab.future = None
@@ -0,0 +1,98 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Keeps a normalized own-text -> elements index in the page. The index is
+# rebuilt lazily on the first query after any DOM mutation, so all text
+# lookups for one DOM version share a single document scan. Normalization
+# mirrors src/utils/text_normalizer.py.
+TEXT_INDEX_SCRIPT = r"""
+var state = window.__snappTextIndex;
+if (!state) {
+    state = window.__snappTextIndex = {dirty: true, version: 0, texts: [], elements: []};
+    new MutationObserver(function () { state.dirty = true; }).observe(document.documentElement,
+        {subtree: true, childList: true, characterData: true});
+}
+var MAP = {'ي': 'ی', 'ى': 'ی', 'ئ': 'ی', 'ك': 'ک', 'ة': 'ه', 'ۀ': 'ه', 'أ': 'ا', 'إ': 'ا', 'ٱ': 'ا', 'ؤ': 'و'};
+function normalize(s) {
+    return s.replace(/[يىئكةۀأإٱؤ]/g, function (c) { return MAP[c]; })
+            .replace(/[\u06F0-\u06F9]/g, function (d) { return String(d.charCodeAt(0) - 0x06F0); })
+            .replace(/[\u0660-\u0669]/g, function (d) { return String(d.charCodeAt(0) - 0x0660); })
+            .replace(/[\u064B-\u0652\u0670\u0640\u200C\u200D]/g, '')
+            .toLowerCase()
+            .replace(/[\s_\-\/\\|:،,.;()\[\]{}"'*]+/g, ' ').trim();
+}
+if (state.dirty) {
+    var byText = {}, all = document.body ? document.body.getElementsByTagName('*') : [];
+    for (var i = 0; i < all.length; i++) {
+        var el = all[i], own = '';
+        if (el.tagName === 'SCRIPT' || el.tagName === 'STYLE') { continue; }
+        for (var c = el.firstChild; c; c = c.nextSibling) { if (c.nodeType === 3) { own += c.data; } }
+        if (!own.trim() && el.tagName === 'INPUT') { own = el.value || ''; }
+        own = normalize(own);
+        if (own) { (byText[own] = byText[own] || []).push(el); }
+    }
+    state.texts = Object.keys(byText);
+    state.elements = state.texts.map(function (t) { return byText[t]; });
+    state.version++;
+    state.dirty = false;
+}
+// arguments[0]: [[text, [tags...] or null, exact], ...]; returns matches per query
+var results = [];
+for (var q = 0; q < arguments[0].length; q++) {
+    var needle = normalize(arguments[0][q][0]), tags = arguments[0][q][1], exact = arguments[0][q][2];
+    var found = [];
+    for (var t = 0; t < state.texts.length; t++) {
+        var text = state.texts[t];
+        if (exact ? text !== needle : text.indexOf(needle) < 0) { continue; }
+        var els = state.elements[t];
+        for (var e = 0; e < els.length; e++) {
+            var el = els[e];
+            if (!el.isConnected || !el.getClientRects().length) { continue; }
+            if (tags && tags.indexOf(el.tagName.toLowerCase()) < 0) {
+                // Text usually sits in a <span> inside the real button or link
+                el = el.closest(tags.join(','));
+                if (!el) { continue; }
+            }
+            if (found.indexOf(el) < 0) { found.push(el); }
+        }
+    }
+    results.push(found);
+}
+return results;
+"""
+
+
+class PageTextIndex:
+    """Answer contains(text()) lookups from one in-page, Persian-normalized index"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def find_all(self, queries):
+        """Return a list of matching elements for each (text, tags[, exact]) query"""
+        payload = []
+        for query in queries:
+            text, tags = query[0], query[1] if len(query) > 1 else None
+            exact = query[2] if len(query) > 2 else False
+            payload.append([text, list(tags) if tags else None, exact])
+        try:
+            return self.driver.execute_script(TEXT_INDEX_SCRIPT, payload) or [[] for _ in payload]
+        except Exception as e:
+            logger.warning(f"⚠️ Text index lookup failed: {e}")
+            return [[] for _ in payload]
+
+    def find_first(self, queries):
+        """Return the first enabled element for the first query (in order) that matches"""
+        for matches in self.find_all(queries):
+            for element in matches:
+                try:
+                    if element.is_enabled():
+                        return element
+                except Exception:
+                    continue
+        return None
+
+    def find(self, text, tags=None):
+        """Return the first element whose text contains the given text"""
+        return self.find_first([(text, tags)])
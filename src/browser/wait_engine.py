@@ -0,0 +1,189 @@
+import time
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from src.ai_navigator.page_analyzer import PAGE_CLASSIFIER
+
+logger = logging.getLogger(__name__)
+
+# The marker lives on the current document, so it disappears once the next page has loaded
+MARK_LEAVING_SCRIPT = "window.__leaving = true;"
+NAVIGATE_SCRIPT = "window.__leaving = true; window.location.href = arguments[0];"
+PAGE_LOADED_SCRIPT = "return !window.__leaving && document.readyState === 'complete';"
+
+# True once nothing in the DOM changed for arguments[0] ms. The observer is
+# installed on first use, so the first call always waits at least that long.
+DOM_QUIET_SCRIPT = r"""
+var watch = window.__mutationWatch;
+if (!watch) {
+    watch = window.__mutationWatch = {last: performance.now()};
+    new MutationObserver(function () { watch.last = performance.now(); })
+        .observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return performance.now() - watch.last >= arguments[0];
+"""
+
+# True once no resource finished loading for arguments[0] ms. Resource timing
+# only lists finished requests, so one long request still in flight is not seen.
+NETWORK_IDLE_SCRIPT = r"""
+var watch = window.__networkWatch;
+if (!watch) {
+    performance.setResourceTimingBufferSize(10000);
+    watch = window.__networkWatch = {count: -1, since: 0};
+}
+var entries = performance.getEntriesByType('resource');
+if (entries.length !== watch.count) {
+    watch.count = entries.length;
+    watch.since = performance.now();
+}
+return document.readyState === 'complete' && performance.now() - watch.since >= arguments[0];
+"""
+
+
+def locator(selector):
+    """Selectors starting with '/' or '(' are XPath, everything else CSS"""
+    if selector.startswith(("/", "(")):
+        return (By.XPATH, selector)
+    return (By.CSS_SELECTOR, selector)
+
+
+def navigate(driver, url):
+    """Start loading url in the current tab without blocking on the load"""
+    driver.execute_script(NAVIGATE_SCRIPT, url)
+
+
+def mark_leaving(driver):
+    """Call before a click that may navigate, so page_loaded waits for the new page"""
+    driver.execute_script(MARK_LEAVING_SCRIPT)
+
+
+def page_loaded(driver):
+    return driver.execute_script(PAGE_LOADED_SCRIPT)
+
+
+def element_present(selector):
+    def condition(driver):
+        elements = driver.find_elements(*locator(selector))
+        return elements[0] if elements else None
+    return condition
+
+
+def element_clickable(selector):
+    return EC.element_to_be_clickable(locator(selector))
+
+
+def page_type_in(*page_types):
+    """The current page classifies as one of page_types: a same-document route has rendered"""
+    return lambda driver: PAGE_CLASSIFIER.classify_driver(driver) in page_types
+
+
+def dom_quiet(quiet_ms=300):
+    return lambda driver: driver.execute_script(DOM_QUIET_SCRIPT, quiet_ms)
+
+
+def network_idle(quiet_ms=500):
+    return lambda driver: driver.execute_script(NETWORK_IDLE_SCRIPT, quiet_ms)
+
+
+def all_of(*conditions):
+    """Holds when every condition holds; the value is the last condition's.
+    All are checked each round so their in-page watchers start together."""
+    def condition(driver):
+        values = [check(driver) for check in conditions]
+        return values[-1] if all(values) else None
+    return condition
+
+
+def any_of(*conditions):
+    """Holds when one of the conditions holds, for use where a single condition is expected"""
+    def condition(driver):
+        for check in conditions:
+            value = check(driver)
+            if value:
+                return value
+        return None
+    return condition
+
+
+class Wait:
+    """A step yielded by a step generator: resume once condition(driver) is truthy or the timeout passes"""
+
+    def __init__(self, condition, timeout=10.0):
+        self.condition = condition
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout
+
+    def poll(self, driver):
+        """(done, value); value is None on timeout"""
+        try:
+            value = self.condition(driver)
+        except Exception:
+            value = None
+        if value:
+            return True, value
+        return time.monotonic() >= self.deadline, None
+
+
+class WaitEngine:
+    """Resolves as soon as one of several named conditions holds, under one deadline.
+
+    Replaces fixed sleeps: each round checks every candidate once, so the
+    fastest signal (URL change, element, network or DOM quiet) wins.
+    """
+
+    def __init__(self, driver, poll_interval=0.05):
+        self.driver = driver
+        self.poll_interval = poll_interval
+        self.stats = {'waits': 0, 'timeouts': 0, 'waited': 0.0, 'winners': {}}
+
+    def until(self, timeout, **conditions):
+        """(name, value) of the first condition to hold, or (None, None) when the deadline passes"""
+        start = time.monotonic()
+        deadline = start + timeout
+        while True:
+            for name, condition in conditions.items():
+                try:
+                    value = condition(self.driver)
+                except Exception:
+                    value = None
+                if value:
+                    return self._record(name, value, start)
+            if time.monotonic() >= deadline:
+                self.stats['timeouts'] += 1
+                return self._record(None, None, start)
+            time.sleep(min(self.poll_interval, max(0.0, deadline - time.monotonic())))
+
+    def run(self, steps):
+        """Drive a step generator in place: Wait steps block here, callables are called.
+        The TabScheduler runs the same generators interleaved across tabs instead."""
+        value, error = None, None
+        while True:
+            try:
+                step = steps.throw(error) if error else steps.send(value)
+            except StopIteration as done:
+                return done.value
+            value, error = None, None
+            if isinstance(step, Wait):
+                _, value = self.until(step.timeout, ready=step.condition)
+            else:
+                try:
+                    value = step()
+                except Exception as e:
+                    error = e
+
+    def settle(self, timeout=3.0, destination=None):
+        """After mark_leaving() and an action: wait for the next document to load or, for a
+        same-document route, for destination(driver) to hold on the rendered page"""
+        conditions = {'loaded': page_loaded}
+        if destination:
+            conditions['rendered'] = destination
+        return self.until(timeout, **conditions)
+
+    def _record(self, name, value, start):
+        elapsed = time.monotonic() - start
+        self.stats['waits'] += 1
+        self.stats['waited'] += elapsed
+        winner = name or 'timeout'
+        self.stats['winners'][winner] = self.stats['winners'].get(winner, 0) + 1
+        logger.debug(f"⏱️ Wait resolved by {winner} after {elapsed:.2f}s")
+        return name, value
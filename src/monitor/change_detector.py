@@ -0,0 +1,172 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Installs a MutationObserver once per document. Mutations are folded into
+# their nearest "root" container so the monitor can re-analyze only those
+# subtrees. Countdown-style text updates (digits and separators only) are not
+# relevant for product availability and are ignored.
+OBSERVER_SCRIPT = r"""
+if (window.__snappChanges) { return true; }
+var state = {count: 0, roots: {}};
+function cssPath(el) {
+    var parts = [];
+    while (el && el.nodeType === 1 && el !== document.body) {
+        if (el.id) { parts.unshift('#' + CSS.escape(el.id)); return parts.join(' > '); }
+        var tag = el.tagName.toLowerCase(), i = 1, sib = el;
+        while ((sib = sib.previousElementSibling)) { if (sib.tagName === el.tagName) { i++; } }
+        parts.unshift(tag + ':nth-of-type(' + i + ')');
+        el = el.parentElement;
+    }
+    parts.unshift('body');
+    return parts.join(' > ');
+}
+function rootOf(node) {
+    var el = node.nodeType === 1 ? node : node.parentElement, depth = 0, chain = [];
+    while (el && el !== document.body) { chain.unshift(el); el = el.parentElement; }
+    for (var i = chain.length - 1; i >= 0; i--) { if (chain[i].id) { return chain[i]; } }
+    return chain.length ? chain[Math.min(2, chain.length - 1)] : document.body;
+}
+function irrelevant(m) {
+    var el = m.target.nodeType === 1 ? m.target : m.target.parentElement;
+    if (el && el.closest('script,style,noscript')) { return true; }
+    if (m.type === 'characterData') { return /^[\s\d۰-۹٠-٩:.,٫٬]*$/.test(m.target.data); }
+    return false;
+}
+new MutationObserver(function (mutations) {
+    for (var i = 0; i < mutations.length; i++) {
+        if (irrelevant(mutations[i])) { continue; }
+        state.count++;
+        var path = cssPath(rootOf(mutations[i].target));
+        state.roots[path] = (state.roots[path] || 0) + 1;
+    }
+}).observe(document.documentElement, {
+    subtree: true, childList: true, characterData: true,
+    attributes: true, attributeFilter: ['class', 'disabled', 'href', 'aria-disabled']
+});
+window.__snappChanges = state;
+return false;
+"""
+
+# Returns and resets the mutation summary. With arguments[0] it also walks
+# the DOM for a structural fingerprint (FNV-1a over tags, classes, link
+# targets and disabled states).
+COLLECT_SCRIPT = r"""
+var state = window.__snappChanges;
+var result = {installed: !!state, fingerprint: null, count: 0, roots: {}};
+if (arguments[0]) {
+    var h = 0x811c9dc5;
+    var mix = function (s) {
+        for (var i = 0; i < s.length; i++) { h ^= s.charCodeAt(i); h = Math.imul(h, 0x01000193) >>> 0; }
+    };
+    var all = document.body ? document.body.getElementsByTagName('*') : [];
+    for (var i = 0; i < all.length; i++) {
+        var el = all[i], tag = el.tagName;
+        if (tag === 'SCRIPT' || tag === 'STYLE' || tag === 'NOSCRIPT') { continue; }
+        mix(tag); mix(typeof el.className === 'string' ? el.className : '');
+        if (tag === 'A') { mix(el.getAttribute('href') || ''); }
+        if (tag === 'BUTTON' || tag === 'INPUT') { mix(el.disabled ? '1' : '0'); }
+    }
+    result.fingerprint = h.toString(16);
+}
+if (state) {
+    result.count = state.count; result.roots = state.roots;
+    state.count = 0; state.roots = {};
+}
+return result;
+"""
+
+
+class PageChangeDetector:
+    def __init__(self, driver, max_subtrees=5):
+        self.driver = driver
+        self.max_subtrees = max_subtrees
+        self.last_fingerprint = None
+        # What changed since the last analysis; kept until commit() so a failed analysis is retried
+        self.pending_fingerprint = None
+        self.pending_roots = {}
+        self.pending_mutations = 0
+        self.pending_document = False
+        self.metrics = {'analyzed': 0, 'skipped': 0, 'mutations': 0}
+
+    def install(self):
+        """Inject the mutation observer into the current document"""
+        try:
+            return self.driver.execute_script(OBSERVER_SCRIPT)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not install change observer: {e}")
+            return False
+
+    def check(self, structure=True):
+        """Report whether the page changed since the last committed analysis.
+
+        structure=False skips the DOM fingerprint walk, e.g. when the HTTP poll
+        saw no change; mutations are still reported.
+        """
+        try:
+            result = self.driver.execute_script(COLLECT_SCRIPT, structure)
+        except Exception as e:
+            logger.warning(f"⚠️ Change detection failed, forcing analysis: {e}")
+            return {'changed': True, 'reason': 'error', 'subtrees': [], 'mutations': 0}
+
+        mutations = result.get('count', 0)
+        self.metrics['mutations'] += mutations
+        self.pending_mutations += mutations
+        for path, count in (result.get('roots') or {}).items():
+            self.pending_roots[path] = self.pending_roots.get(path, 0) + count
+        if result.get('fingerprint') is not None:
+            self.pending_fingerprint = result['fingerprint']
+
+        if not result.get('installed'):
+            # First check or a fresh document (navigation/reload)
+            self.install()
+            self.pending_document = True
+
+        if self.pending_document:
+            reason = 'new_document'
+        elif self.pending_fingerprint != self.last_fingerprint:
+            reason = 'structure'
+        elif self.pending_mutations:
+            reason = 'mutations'
+        else:
+            reason = None
+
+        return {
+            'changed': reason is not None,
+            'reason': reason,
+            'subtrees': self._select_subtrees(self.pending_roots) if reason != 'new_document' else [],
+            'mutations': self.pending_mutations
+        }
+
+    def commit(self):
+        """Mark the pending change as analyzed; until then every check() reports it again"""
+        self.last_fingerprint = self.pending_fingerprint
+        self.pending_roots = {}
+        self.pending_mutations = 0
+        self.pending_document = False
+
+    def _select_subtrees(self, roots):
+        """Collapse nested roots; an empty list means analyze the full page"""
+        paths = sorted(roots, key=len)
+        selected = []
+        for path in paths:
+            if path == 'body':
+                return []
+            if not any(path.startswith(parent + ' > ') for parent in selected):
+                selected.append(path)
+        if len(selected) > self.max_subtrees:
+            return []
+        return selected
+
+    def record_analyzed(self):
+        self.metrics['analyzed'] += 1
+
+    def record_skipped(self):
+        self.metrics['skipped'] += 1
+
+    def get_metrics(self):
+        """Get skipped vs analyzed cycle counts"""
+        total = self.metrics['analyzed'] + self.metrics['skipped']
+        metrics = dict(self.metrics)
+        metrics['skip_rate'] = round(self.metrics['skipped'] / total, 3) if total else 0.0
+        return metrics
@@ -0,0 +1,115 @@
+import re
+import time
+import hashlib
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Per-request tokens that change on every response without the content changing
+VOLATILE_PATTERNS = [
+    re.compile(rb'nonce="[^"]*"'),
+    re.compile(rb'<meta[^>]+name="csrf[^"]*"[^>]*>'),
+    re.compile(rb'"(?:buildId|requestId|serverTime|timestamp)"\s*:\s*"?[\w.:-]*"?'),
+]
+
+# Statuses that mean the browser cookies copied into the session went stale
+AUTH_STATUSES = (401, 403)
+
+
+class AvailabilityPoller:
+    """Poll the timetable (or its JSON endpoint) over HTTP and report when its content changes"""
+
+    def __init__(self, url, timeout=5, pool_size=4, user_agent=None):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        # Keep-alive pool, no automatic retries: a failed poll is simply retried next cycle
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+        self.stats = {'polls': 0, 'not_modified': 0, 'unchanged': 0, 'changed': 0, 'errors': 0, 'time': 0.0}
+
+    def sync_cookies(self, driver):
+        """Copy the logged-in browser's cookies and user agent into the HTTP session"""
+        try:
+            for cookie in driver.get_cookies():
+                self.session.cookies.set(cookie['name'], cookie['value'],
+                                         domain=cookie.get('domain'), path=cookie.get('path', '/'))
+            self.session.headers['User-Agent'] = driver.execute_script("return navigator.userAgent;")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Could not copy browser cookies to HTTP poller: {e}")
+            return False
+
+    def _body_digest(self, body):
+        for pattern in VOLATILE_PATTERNS:
+            body = pattern.sub(b'', body)
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    def poll(self):
+        """Make one conditional request; the first successful poll only records a baseline"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        self.stats['polls'] += 1
+        start = time.perf_counter()
+        try:
+            response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            self.stats['errors'] += 1
+            return self._result(False, 'error', None, start, error=str(e))
+
+        if response.status_code == 304:
+            self.stats['not_modified'] += 1
+            return self._result(False, 'not_modified', 304, start)
+        if response.status_code != 200:
+            self.stats['errors'] += 1
+            result = self._result(False, 'status', response.status_code, start)
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                result['retry_after'] = int(retry_after)
+            return result
+
+        self.etag = response.headers.get('ETag', self.etag)
+        self.last_modified = response.headers.get('Last-Modified', self.last_modified)
+        digest = self._body_digest(response.content)
+        previous, self.digest = self.digest, digest
+        if previous is None:
+            return self._result(False, 'baseline', 200, start)
+        if digest == previous:
+            self.stats['unchanged'] += 1
+            return self._result(False, 'unchanged', 200, start)
+        self.stats['changed'] += 1
+        return self._result(True, 'content', 200, start)
+
+    def _result(self, changed, reason, status, start, error=None):
+        elapsed = time.perf_counter() - start
+        self.stats['time'] += elapsed
+        result = {'changed': changed, 'reason': reason, 'status': status, 'elapsed': elapsed}
+        if error:
+            result['error'] = error
+        return result
+
+    def needs_cookie_sync(self, result):
+        """True when the server rejected the session and cookies should be copied again"""
+        return result.get('status') in AUTH_STATUSES
+
+    def get_metrics(self):
+        """Poll counts and mean request latency in milliseconds"""
+        metrics = dict(self.stats)
+        metrics['avg_ms'] = round(self.stats['time'] / self.stats['polls'] * 1000, 1) if self.stats['polls'] else 0.0
+        del metrics['time']
+        return metrics
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,79 @@
+import re
+import json
+import logging
+from src.monitor.page_fetcher import extract_products
+
+logger = logging.getLogger(__name__)
+
+# API responses worth parsing: JSON from product/deal/timetable endpoints
+DEFAULT_URL_PATTERN = re.compile(r'product|deal|timetable|campaign|offer|catalog|search', re.IGNORECASE)
+
+
+class NetworkSaleDetector:
+    """Read product availability from the browser's XHR/fetch responses via the Chrome performance log"""
+
+    def __init__(self, driver, url_pattern=DEFAULT_URL_PATTERN, max_body_size=2000000):
+        self.driver = driver
+        self.url_pattern = url_pattern
+        self.max_body_size = max_body_size
+        # requestId -> url of JSON responses whose body has not finished loading yet
+        self.pending = {}
+        self.stats = {'entries': 0, 'responses': 0, 'products': 0, 'errors': 0}
+        self.available = self._enable()
+
+    def _enable(self):
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.get_log('performance')
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Network sale detection unavailable (performance log not enabled): {e}")
+            return False
+
+    def poll(self):
+        """Drain the performance log and return products parsed from finished API responses"""
+        if not self.available:
+            return []
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"Could not read performance log: {e}")
+            return []
+
+        products = []
+        for entry in entries:
+            self.stats['entries'] += 1
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method, params = message.get('method'), message.get('params', {})
+
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                if params.get('type') in ('XHR', 'Fetch') and 'json' in response.get('mimeType', '') \
+                        and self.url_pattern.search(response.get('url', '')):
+                    self.pending[params['requestId']] = response['url']
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self.pending:
+                url = self.pending.pop(params['requestId'])
+                if params.get('encodedDataLength', 0) <= self.max_body_size:
+                    products.extend(self._read_products(params['requestId'], url))
+            elif method == 'Network.loadingFailed':
+                self.pending.pop(params.get('requestId'), None)
+
+        self.stats['products'] += len(products)
+        return products
+
+    def _read_products(self, request_id, url):
+        try:
+            body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            data = json.loads(body.get('body') or 'null')
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.debug(f"Could not read response body of {url}: {e}")
+            return []
+        self.stats['responses'] += 1
+        products = extract_products(data)
+        if products:
+            logger.info(f"🌐 {len(products)} products in API response {url}")
+        return products
@@ -0,0 +1,133 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that number the pages of a listing endpoint
+PAGE_PARAMS = ('page', 'p', 'page_number', 'pageNumber')
+OFFSET_PARAMS = ('offset', 'skip', 'start', 'from')
+SIZE_PARAMS = ('limit', 'size', 'per_page', 'page_size', 'pageSize', 'count')
+
+NAME_KEYS = ('title', 'name', 'title_fa', 'name_fa', 'product_name')
+PRICE_KEYS = ('price', 'selling_price', 'final_price', 'sale_price')
+LINK_KEYS = ('url', 'link', 'href', 'slug')
+AVAILABLE_KEYS = ('available', 'is_available', 'in_stock', 'is_active', 'purchasable')
+
+
+def find_pagination_url(urls):
+    """Pick the most recent request that looks like a paginated listing endpoint"""
+    for url in reversed(urls):
+        query = dict(parse_qsl(urlparse(url).query))
+        if any(query.get(param, '').isdigit() for param in PAGE_PARAMS + OFFSET_PARAMS):
+            return url
+    return None
+
+
+def extract_products(data):
+    """Find the product list in a JSON payload and map it to product info records"""
+    items = _find_product_list(data)
+    products = []
+    for item in items or []:
+        name = _first(item, NAME_KEYS)
+        if not name:
+            continue
+        link = _first(item, LINK_KEYS)
+        available = _first(item, AVAILABLE_KEYS)
+        state = 'unknown' if available is None else ('available' if available else 'sold_out')
+        products.append({
+            'key': str(item.get('id') or link or name),
+            'name': str(name),
+            'price': str(_first(item, PRICE_KEYS) or ''),
+            'link': link,
+            'state': state,
+            'available': state == 'available',
+            'element': None,
+        })
+    return products
+
+
+def _first(item, keys):
+    for key in keys:
+        if item.get(key) not in (None, ''):
+            return item[key]
+    return None
+
+
+def _find_product_list(data, depth=0):
+    if depth > 4:
+        return None
+    if isinstance(data, list):
+        if data and all(isinstance(item, dict) for item in data) and any(_first(item, NAME_KEYS) for item in data):
+            return data
+        return None
+    if isinstance(data, dict):
+        for value in data.values():
+            found = _find_product_list(value, depth + 1)
+            if found:
+                return found
+    return None
+
+
+class PaginatedFetcher:
+    """Fetch the remaining pages of a listing endpoint in parallel over a pooled HTTP session"""
+
+    def __init__(self, session, workers=4, max_pages=50, timeout=5):
+        self.session = session
+        self.workers = workers
+        self.max_pages = max_pages
+        self.timeout = timeout
+
+    def _page_url(self, url, number):
+        parts = urlparse(url)
+        query = parse_qsl(parts.query)
+        params = dict(query)
+        size = next((int(params[p]) for p in SIZE_PARAMS if params.get(p, '').isdigit()), None)
+        updated = []
+        for key, value in query:
+            if key in PAGE_PARAMS and value.isdigit():
+                value = str(number)
+            elif key in OFFSET_PARAMS and value.isdigit() and size:
+                value = str(number * size)
+            updated.append((key, value))
+        return urlunparse(parts._replace(query=urlencode(updated)))
+
+    def _current_page(self, url):
+        params = dict(parse_qsl(urlparse(url).query))
+        for param in PAGE_PARAMS:
+            if params.get(param, '').isdigit():
+                return int(params[param])
+        size = next((int(params[p]) for p in SIZE_PARAMS if params.get(p, '').isdigit()), None)
+        for param in OFFSET_PARAMS:
+            if params.get(param, '').isdigit() and size:
+                return int(params[param]) // size
+        return None
+
+    def _fetch(self, url):
+        try:
+            response = self.session.get(url, timeout=self.timeout, headers={'Accept': 'application/json'})
+            if response.status_code != 200:
+                return []
+            return extract_products(response.json())
+        except Exception as e:
+            logger.debug(f"Page fetch failed for {url}: {e}")
+            return []
+
+    def fetch_remaining(self, url):
+        """Fetch pages after the one in url, a batch at a time, until a page comes back empty"""
+        current = self._current_page(url)
+        if current is None:
+            return []
+        products = []
+        page = current + 1
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while page <= current + self.max_pages:
+                batch = [self._page_url(url, number) for number in range(page, page + self.workers)]
+                results = list(executor.map(self._fetch, batch))
+                for result in results:
+                    products.extend(result)
+                page += self.workers
+                if not all(results):
+                    break
+        logger.info(f"🌐 Fetched {len(products)} products over HTTP (pages {current + 1}-{page - 1})")
+        return products
@@ -0,0 +1,90 @@
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Server responses that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+
+class PollController:
+    """Pick the next polling interval from observed change rate, errors and server latency"""
+
+    def __init__(self, base_interval=2.0, min_interval=0.2, max_interval=60.0, smoothing=0.2):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+        # Exponentially weighted averages of recent polls
+        self.change_rate = 0.0
+        self.error_rate = 0.0
+        self.response_time = None
+        self.failures = 0
+        self.throttled = False
+        self.retry_after = None
+        self.interval = base_interval
+        self.reasons = []
+
+    def _average(self, current, sample):
+        return sample if current is None else current + self.smoothing * (sample - current)
+
+    def observe(self, changed=False, error=False, status=None, elapsed=None, retry_after=None):
+        """Record the outcome of one poll"""
+        throttled = status in THROTTLE_STATUSES
+        failed = error or throttled
+        self.change_rate = self._average(self.change_rate, 1.0 if changed else 0.0)
+        self.error_rate = self._average(self.error_rate, 1.0 if failed else 0.0)
+        if elapsed is not None and not failed:
+            self.response_time = self._average(self.response_time, elapsed)
+        if failed:
+            self.failures += 1
+            self.throttled = throttled
+            self.retry_after = retry_after
+        else:
+            self.failures = 0
+            self.throttled = False
+            self.retry_after = None
+
+    def next_interval(self, target=None):
+        """Seconds until the next poll; target is a scheduled interval that replaces the base one"""
+        base = self.base_interval if target is None else target
+        reasons = []
+        if self.failures:
+            # Exponential backoff with equal jitter so restarts do not synchronize
+            ceiling = min(self.max_interval, max(base, self.min_interval) * 2 ** self.failures)
+            interval = random.uniform(ceiling / 2, ceiling)
+            reasons.append(f"{'throttled' if self.throttled else 'errors'}: backoff after {self.failures} failures")
+            if self.retry_after:
+                interval = max(interval, min(self.retry_after, self.max_interval))
+                reasons.append(f"server asked to retry after {self.retry_after}s")
+        else:
+            interval = base
+            if self.change_rate >= 0.05:
+                # Frequent changes: poll up to 4x faster
+                interval *= 1.0 - 0.75 * min(1.0, self.change_rate * 2)
+                reasons.append(f"page changing (rate {self.change_rate:.2f})")
+            elif target is None:
+                interval *= 1.5
+                reasons.append("page quiet")
+            if self.response_time and interval < 2 * self.response_time:
+                # Never poll faster than the server answers
+                interval = 2 * self.response_time
+                reasons.append(f"server slow ({self.response_time * 1000:.0f} ms)")
+            if target is not None:
+                reasons.append("sale schedule")
+
+        # A scheduled target may go below the minimum so the first poll lands on the sale start
+        floor = self.min_interval if target is None or self.failures else min(self.min_interval, target)
+        self.interval = max(floor, min(self.max_interval, interval))
+        self.reasons = reasons or ["base interval"]
+        return self.interval
+
+    def get_state(self):
+        """Current interval and why it was chosen"""
+        return {
+            'interval': round(self.interval, 3),
+            'reasons': list(self.reasons),
+            'change_rate': round(self.change_rate, 3),
+            'error_rate': round(self.error_rate, 3),
+            'response_ms': round(self.response_time * 1000, 1) if self.response_time else None,
+        }
@@ -0,0 +1,135 @@
+import json
+import logging
+import difflib
+from functools import lru_cache
+from src.utils.keyword_index import KeywordAutomaton
+from src.utils.text_normalizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Persian spellings of brands and product words used on the timetable,
+# rewritten to the English tokens used in config and data/products.json
+TRANSLITERATIONS = {
+    'سامسونگ': 'samsung', 'گلکسی': 'galaxy', 'اولترا': 'ultra', 'الترا': 'ultra',
+    'ایسوس': 'asus', 'ویووبوک': 'vivobook', 'ویوو بوک': 'vivobook',
+    'سونی': 'sony', 'پلی استیشن': 'playstation', 'پلیاستیشن': 'playstation', 'اسلیم': 'slim',
+    'انکر': 'anker', 'انکور': 'anker', 'ساندکور': 'soundcore', 'سوندکور': 'soundcore',
+    'اپل': 'apple', 'ایرپاد': 'airpods', 'ایرپادز': 'airpods', 'ایر پاد': 'airpods',
+    'شیائومی': 'xiaomi', 'شیاومی': 'xiaomi', 'پاوربانک': 'powerbank', 'پاور بانک': 'powerbank',
+    'کاسیو': 'casio', 'گادفادر': 'godfather',
+    'گوشی موبایل': 'mobile', 'گوشی': 'mobile', 'موبایل': 'mobile',
+    'لپ تاپ': 'laptop', 'لپتاپ': 'laptop', 'هدفون': 'headphones', 'هندزفری': 'headphones', 'ساعت': 'watch',
+}
+
+# Product-type words say little about which product it is
+GENERIC_TOKENS = {'mobile', 'laptop', 'headphones', 'watch', '4g', '5g', 'phone', 'smart'}
+
+MATCH_THRESHOLD = 0.75
+
+
+class ProductMatcher:
+    """Match product names against the target catalogue through one inverted token index"""
+
+    def __init__(self, targets, threshold=MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.translit = KeywordAutomaton()
+        for persian, latin in TRANSLITERATIONS.items():
+            self.translit.add(normalize_text(persian), latin)
+        self.translit.build()
+
+        # Each target: tokens with weights; earlier sources/entries win on duplicates
+        self.targets = []
+        seen = set()
+        for target in targets:
+            tokens = frozenset(self.tokenize(target['name']))
+            if not tokens or tokens in seen:
+                continue
+            seen.add(tokens)
+            self.targets.append({**target, 'tokens': tokens})
+
+        self.index = {}
+        for position, target in enumerate(self.targets):
+            for token in target['tokens']:
+                self.index.setdefault(token, []).append(position)
+        self.vocabulary = list(self.index)
+        for target in self.targets:
+            target['weights'] = {token: self._weight(token) for token in target['tokens']}
+            target['total'] = sum(target['weights'].values())
+        self._fuzzy = lru_cache(maxsize=4096)(self._closest_token)
+
+    @classmethod
+    def from_sources(cls, config, products_path='data/products.json'):
+        """Compile targets from config keywords, the default priority list and the catalogue file"""
+        targets = []
+        for name in config.get('products.priority_keywords', None) or []:
+            targets.append({'name': name, 'source': 'priority_keywords'})
+        for name in config.get('products.priority_list', None) or []:
+            targets.append({'name': name, 'source': 'priority_list'})
+        try:
+            with open(products_path, 'r', encoding='utf-8') as f:
+                catalogue = json.load(f)
+            for group in ('priority_products', 'other_products'):
+                for product in catalogue.get(group, []):
+                    targets.append({'name': product['name'], 'id': product.get('id'), 'source': group})
+        except FileNotFoundError:
+            logger.warning(f"⚠️ Product catalogue not found: {products_path}")
+        except (ValueError, KeyError) as e:
+            logger.warning(f"⚠️ Could not read product catalogue: {e}")
+
+        # Priority follows source order: keywords, default list, catalogue
+        for priority, target in enumerate(targets, start=1):
+            target['priority'] = priority
+        matcher = cls(targets)
+        logger.info(f"🎯 Product matcher compiled: {len(matcher.targets)} targets, {len(matcher.vocabulary)} tokens")
+        return matcher
+
+    def tokenize(self, text):
+        """Normalize, transliterate Persian brand names and split into tokens"""
+        text = normalize_text(text)
+        matches = self.translit.longest_matches(text)
+        if matches:
+            parts, last = [], 0
+            for start, end, _, latin in matches:
+                parts.append(text[last:start])
+                parts.append(f' {latin} ')
+                last = end
+            parts.append(text[last:])
+            text = ''.join(parts)
+        return text.split()
+
+    def _weight(self, token):
+        if token in GENERIC_TOKENS:
+            return 0.25
+        # Model codes (s25, x1504va, a16) identify the product best
+        weight = 1.5 if any(ch.isdigit() for ch in token) else 1.0
+        return weight / len(self.index.get(token, ())) ** 0.5
+
+    def _closest_token(self, token):
+        if len(token) < 4:
+            return None
+        close = difflib.get_close_matches(token, self.vocabulary, n=1, cutoff=0.85)
+        return close[0] if close else None
+
+    def match(self, name):
+        """Return the best matching target as {'name', 'priority', 'score', ...}, or None"""
+        tokens = set()
+        for token in self.tokenize(name):
+            if token in self.index:
+                tokens.add(token)
+            else:
+                close = self._fuzzy(token)
+                if close:
+                    tokens.add(close)
+        if not tokens:
+            return None
+
+        # Only targets sharing at least one token are scored
+        candidates = {position for token in tokens for position in self.index[token]}
+        best = None
+        for position in candidates:
+            target = self.targets[position]
+            score = sum(weight for token, weight in target['weights'].items() if token in tokens) / target['total']
+            if score >= self.threshold and (best is None or (score, -target['priority']) > (best['score'], -best['priority'])):
+                best = {'name': target['name'], 'priority': target['priority'], 'score': round(score, 3),
+                        'id': target.get('id'), 'source': target['source']}
+        return best
@@ -1,31 +1,124 @@
 import time
 import logging
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from datetime import datetime
+from src.browser.text_index import PageTextIndex
+from src.browser.wait_engine import WaitEngine, element_present, dom_quiet, network_idle, all_of
+from src.monitor.http_poller import AvailabilityPoller
+from src.monitor.product_matcher import ProductMatcher
+from src.monitor.page_fetcher import PaginatedFetcher, find_pagination_url
+from src.monitor.product_store import ProductStore
+from src.monitor.timetable import TimetableSchedule
+from src.monitor.sale_scheduler import sale_timezone
 
 logger = logging.getLogger(__name__)
 
+CARD_SELECTOR = "[class*='product'], [class*='item']"
+
+# Extracts every product card in one round trip. Only the innermost matching
+# containers that hold a name are kept, so wrappers like "product-list" or
+# nested "item" spans do not produce duplicates.
+PRODUCT_CARDS_SCRIPT = r"""
+var CARD = arguments[0];
+var SOLD_OUT = ['ناموجود', 'تمام شد', 'اتمام موجودی', 'sold out', 'out of stock'];
+var UPCOMING = ['به زودی', 'بزودی', 'شروع فروش', 'coming soon'];
+function text(el) { return el ? (el.innerText || el.textContent || '').trim() : ''; }
+function has(s, words) {
+    s = s.toLowerCase();
+    for (var i = 0; i < words.length; i++) { if (s.indexOf(words[i]) >= 0) { return true; } }
+    return false;
+}
+var cards = Array.prototype.filter.call(document.querySelectorAll(CARD), function (el) {
+    return el.querySelector("[class*='name'], [class*='title']") && el.getClientRects().length;
+});
+var set = new Set(cards);
+var out = [];
+cards.forEach(function (card) {
+    var inner = card.querySelectorAll(CARD);
+    for (var i = 0; i < inner.length; i++) { if (set.has(inner[i])) { return; } }
+    var name = text(card.querySelector("[class*='name'], [class*='title']"));
+    var price = text(card.querySelector("[class*='price']"));
+    var anchor = card.tagName === 'A' ? card : card.querySelector('a[href]');
+    var link = anchor ? anchor.href : null;
+    var all = text(card);
+    var button = card.querySelector("button, [role='button'], input[type='submit']");
+    var state;
+    if (has(all, SOLD_OUT)) { state = 'sold_out'; }
+    else if (has(all, UPCOMING)) { state = 'upcoming'; }
+    else if (button && (button.disabled || button.getAttribute('aria-disabled') === 'true')) { state = 'disabled'; }
+    else if (link || button) { state = 'available'; }
+    else { state = 'unknown'; }
+    var key = card.getAttribute('data-id') || card.getAttribute('data-product-id') || card.id || link || name;
+    out.push({key: key, name: name, price: price, link: link, state: state,
+              available: state === 'available', text: all.slice(0, 300), element: card});
+});
+return out;
+"""
+
+# Clicks "load more" and resolves as soon as new cards arrive, reporting the
+# XHR/fetch requests the click triggered (to spot a paginated endpoint).
+# arguments: button, card selector, timeout in ms, async callback
+LOAD_MORE_SCRIPT = r"""
+var button = arguments[0], selector = arguments[1], timeout = arguments[2], done = arguments[3];
+var before = document.querySelectorAll(selector).length, start = performance.now(), finished = false, settle = null;
+function finish(reason) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    var requests = performance.getEntriesByType('resource').filter(function (e) {
+        return e.startTime >= start && (e.initiatorType === 'xmlhttprequest' || e.initiatorType === 'fetch');
+    }).map(function (e) { return e.name; });
+    done({before: before, after: document.querySelectorAll(selector).length, reason: reason, requests: requests,
+          more: document.contains(button) && !button.disabled && button.getClientRects().length > 0});
+}
+var observer = new MutationObserver(function () {
+    // New cards usually arrive in one batch; settle briefly after the first ones
+    if (!settle && document.querySelectorAll(selector).length > before) {
+        settle = setTimeout(function () { finish('cards'); }, 100);
+    }
+});
+observer.observe(document.body, {childList: true, subtree: true});
+var timer = setTimeout(function () { finish('timeout'); }, timeout);
+button.click();
+"""
+
 class ProductMonitor:
-    def __init__(self):
+    def __init__(self, store=None):
         self.driver = None
         self.wait = None
         self.config = None
+        self.text_index = None
+        self.poller = None
+        self.matcher = None
+        self.remote_products = []
+        # Shared with the caller's store, so a product seen in the DOM and in API responses is reported once
+        self.store = store if store is not None else ProductStore()
         self.active_products = []
     
     def set_driver(self, driver, wait):
         """Set browser driver"""
         self.driver = driver
         self.wait = wait
+        self.text_index = PageTextIndex(driver)
+        self.waits = WaitEngine(driver)
+        if self.config:
+            # Poll the timetable (or its JSON endpoint) over HTTP with the browser's cookies
+            url = self.config.get('monitor.poll_url') or self.config.get('snapp.snapp_pay_url')
+            self.poller = AvailabilityPoller(url, timeout=self.config.get('monitor.poll_timeout', 5))
+            self.poller.sync_cookies(driver)
     
     def navigate_to_deals_page(self):
         """Navigate to deals page"""
         try:
             self.driver.get(self.config.get('snapp.snapp_pay_url'))
-            logger.info("📄 Deals page loaded")
             
-            # Wait for page load
-            time.sleep(5)
+            # Done as soon as product cards render or the page stops changing
+            signal, _ = self.waits.until(
+                5,
+                cards=element_present(CARD_SELECTOR),
+                quiet=all_of(dom_quiet(500), network_idle(500))
+            )
+            logger.info(f"📄 Deals page loaded ({signal or 'timeout'})")
             return True
             
         except Exception as e:
@@ -33,45 +126,86 @@ class ProductMonitor:
             return False
     
     def load_all_products(self):
-        """Click 'More products' to load all products"""
+        """Load more products until every target is visible or no new cards arrive"""
         try:
-            max_clicks = 5
-            clicks_done = 0
+            timeout = self.config.get('monitor.load_more_timeout', 10)
+            max_loads = self.config.get('monitor.max_load_more', 50)
+            wanted = self.wanted_targets()
+            loads = 0
             
-            while clicks_done < max_clicks:
-                try:
-                    # Locate 'More products' button
-                    more_products_btn = self.wait.until(
-                        EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'محصولات بیشتر')]"))
-                    )
-                    
-                    more_products_btn.click()
-                    clicks_done += 1
-                    logger.info(f"🔄 Clicked More products ({clicks_done}/{max_clicks})")
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    logger.info("❌ 'More products' button not found or not clickable")
+            while loads < max_loads:
+                seen = {product['target'] for product in self.check_active_products()}
+                if wanted and wanted <= seen:
+                    logger.info("✅ All target products are visible")
+                    break
+                
+                # Locate 'More products' button
+                more_products_btn = self.text_index.find('محصولات بیشتر', ['button'])
+                if not more_products_btn:
+                    logger.info("❌ 'More products' button not found")
+                    break
+                
+                result = self.driver.execute_async_script(LOAD_MORE_SCRIPT, more_products_btn, CARD_SELECTOR, timeout * 1000)
+                loads += 1
+                logger.info(f"🔄 Loaded more products: {result['before']} -> {result['after']} cards ({result['reason']})")
+                
+                page_url = find_pagination_url(result['requests'])
+                if page_url and self.poller:
+                    # The grid is backed by a paginated endpoint: fetch the rest directly
+                    fetcher = PaginatedFetcher(self.poller.session, workers=self.config.get('monitor.page_fetch_workers', 4))
+                    self.remote_products = fetcher.fetch_remaining(page_url)
+                    break
+                if result['after'] <= result['before'] or not result['more']:
                     break
             
-            logger.info(f"✅ Products load completed ({clicks_done} clicks)")
+            logger.info(f"✅ Products load completed ({loads} loads)")
             return True
             
         except Exception as e:
             logger.error(f"Error loading products: {e}")
             return False
     
+    def load_timetable(self, offset=0.0):
+        """Parse the timetable cards into per-product opening windows for our targets"""
+        try:
+            products = self.driver.execute_script(PRODUCT_CARDS_SCRIPT, CARD_SELECTOR) or []
+        except Exception as e:
+            logger.error(f"Error reading timetable: {e}")
+            products = []
+        if self.matcher is None:
+            self.matcher = ProductMatcher.from_sources(self.config)
+        now = datetime.fromtimestamp(time.time() + offset, sale_timezone(self.config.get('sale.timezone', 'Asia/Tehran')))
+        return TimetableSchedule.from_products(
+            products, self.matcher, now,
+            lead=self.config.get('sale.product_lead_seconds', 30),
+            open_seconds=self.config.get('sale.open_window_seconds', 180),
+            idle_interval=self.config.get('sale.idle_interval', 30),
+            offset=offset
+        )
+    
+    def wanted_targets(self):
+        """Names of the targets from the highest-priority configured source"""
+        if self.matcher is None:
+            self.matcher = ProductMatcher.from_sources(self.config)
+        if not self.matcher.targets:
+            return set()
+        source = self.matcher.targets[0]['source']
+        return {target['name'] for target in self.matcher.targets if target['source'] == source}
+    
     def check_active_products(self):
         """Check active products"""
         try:
-            # Find all products
-            products = self.driver.find_elements(By.CSS_SELECTOR, "[class*='product'], [class*='item']")
+            # One in-page pass over all cards instead of several lookups per card
+            products = self.driver.execute_script(PRODUCT_CARDS_SCRIPT, CARD_SELECTOR) or []
+            if self.remote_products:
+                # Products fetched over HTTP that the grid has not rendered
+                keys = {product['key'] for product in products}
+                products += [product for product in self.remote_products if product['key'] not in keys]
             
             active_products = []
             
-            for product in products:
-                product_info = self._extract_product_info(product)
-                if product_info and self._is_target_product(product_info):
+            for product_info in products:
+                if product_info['name'] and self._is_target_product(product_info):
                     active_products.append(product_info)
             
             return active_products
@@ -80,39 +214,51 @@ class ProductMonitor:
             logger.error(f"خطا در بررسی محصولات: {e}")
             return []
     
-    def _extract_product_info(self, product_element):
-        """Extract product info from element"""
-        try:
-            # This requires tuning based on real page structure
-            name = product_element.find_element(By.CSS_SELECTOR, "[class*='name'], [class*='title']").text
-            price = product_element.find_element(By.CSS_SELECTOR, "[class*='price']").text
-            link = product_element.find_element(By.TAG_NAME, "a").get_attribute("href")
-            
-            return {
-                'name': name,
-                'price': price,
-                'link': link,
-                'element': product_element
-            }
-        except:
-            return None
+    def apply_network_products(self, products):
+        """Diff target products parsed from API responses against the store"""
+        targets = [product for product in products if self._is_target_product(product)]
+        return self.store.apply(targets) if targets else []
+    
+    def match_target(self, name):
+        """Best matching target for a product name, or None"""
+        if self.matcher is None:
+            self.matcher = ProductMatcher.from_sources(self.config)
+        return self.matcher.match(name or '')
     
     def _is_target_product(self, product_info):
-        """Check if product is target"""
-        target_products = self.config.get('products.priority_list', [])
-        
-        for target in target_products:
-            if target.lower() in product_info['name'].lower():
-                return True
-        return False
+        """Check if product is target, recording the matched target priority"""
+        target = self.match_target(product_info['name'])
+        if not target:
+            return False
+        product_info['target'] = target['name']
+        product_info['priority'] = target['priority']
+        return True
     
     def refresh_page(self):
         """Refresh page"""
         try:
             self.driver.refresh()
-            time.sleep(3)
+            self.wait.until(lambda d: d.execute_script("return document.readyState") == 'complete')
             logger.info("🔄 Page refreshed")
             return True
         except Exception as e:
             logger.error(f"Error refreshing page: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def refresh_if_changed(self):
+        """Poll over HTTP and reload the browser only when the timetable content changed"""
+        if not self.poller:
+            return {'changed': False, 'reason': 'no_poller'}
+        
+        result = self.poller.poll()
+        if self.poller.needs_cookie_sync(result):
+            logger.info("🍪 HTTP poller session rejected, copying browser cookies again")
+            self.poller.sync_cookies(self.driver)
+        elif result['changed']:
+            logger.info(f"🌐 Timetable changed on the server ({result['elapsed'] * 1000:.0f} ms poll), reloading")
+            self.refresh_page()
+        return result
+    
+    def get_poll_metrics(self):
+        """HTTP poll counts and latency"""
+        return self.poller.get_metrics() if self.poller else {}
\ No newline at end of file
@@ -0,0 +1,119 @@
+import time
+import logging
+from collections import OrderedDict
+from src.utils.text_normalizer import parse_price
+
+logger = logging.getLogger(__name__)
+
+APPEARED = 'appeared'
+BECAME_PURCHASABLE = 'became_purchasable'
+PRICE_CHANGED = 'price_changed'
+SOLD_OUT = 'sold_out'
+REMOVED = 'removed'
+
+
+class ProductRecord:
+    """Compact per-product state; holds no WebElement references"""
+
+    __slots__ = ('key', 'name', 'price', 'state', 'available', 'link', 'first_seen', 'last_seen')
+
+    def __init__(self, key, name, price, state, available, link, now):
+        self.key = key
+        self.name = name
+        self.price = price
+        self.state = state
+        self.available = available
+        self.link = link
+        self.first_seen = now
+        self.last_seen = now
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class ProductStore:
+    """Products keyed by a stable id; each poll is diffed into delta events"""
+
+    def __init__(self, max_records=2000):
+        self.max_records = max_records
+        # Ordered by last update so the least recently seen record is evicted first
+        self.records = OrderedDict()
+        self.stats = {'polls': 0, 'events': 0, 'evicted': 0}
+
+    def get(self, key):
+        return self.records.get(key)
+    
+    @staticmethod
+    def key_for(product):
+        return product.get('key') or product.get('selector') or product.get('name')
+    
+    def mark_unavailable(self, key):
+        """Forget that key is purchasable, so the next poll that sees it available reports it again"""
+        record = self.records.get(key)
+        if record:
+            record.available = False
+
+    def apply(self, products, complete=False):
+        """Diff products against the store and return delta events.
+
+        complete: products is the whole listing, so keys not in it were removed.
+        """
+        now = time.time()
+        events = []
+        seen = set()
+        for product in products:
+            key = self.key_for(product)
+            if not key:
+                continue
+            seen.add(key)
+            events.extend(self._update(key, product, now))
+
+        gone = [key for key in self.records if key not in seen] if complete else []
+        for key in gone:
+            record = self.records.pop(key, None)
+            if record:
+                events.append(self._event(REMOVED, record, None))
+
+        while len(self.records) > self.max_records:
+            self.records.popitem(last=False)
+            self.stats['evicted'] += 1
+
+        self.stats['polls'] += 1
+        self.stats['events'] += len(events)
+        return events
+
+    def _update(self, key, product, now):
+        # Compare amounts, not strings: "۱۵٬۰۰۰٬۰۰۰ تومان" and "15,000,000 تومان" are equal
+        price = parse_price(str(product['price'])) if product.get('price') else None
+        state = product.get('state') or 'unknown'
+        available = bool(product.get('available', state == 'available'))
+        record = self.records.get(key)
+        if record is None:
+            record = ProductRecord(key, product.get('name'), price, state, available, product.get('link'), now)
+            self.records[key] = record
+            events = [self._event(APPEARED, record, product)]
+            if available:
+                events.append(self._event(BECAME_PURCHASABLE, record, product))
+            return events
+
+        events = []
+        record.last_seen = now
+        self.records.move_to_end(key)
+        if price is not None and price != record.price:
+            events.append(self._event(PRICE_CHANGED, record, product, old_price=record.price))
+            record.price = price
+        if available and not record.available:
+            events.append(self._event(BECAME_PURCHASABLE, record, product))
+        elif state == 'sold_out' and record.state != 'sold_out':
+            events.append(self._event(SOLD_OUT, record, product))
+        record.state = state
+        record.available = available
+        if product.get('link'):
+            record.link = product['link']
+        return events
+
+    def _event(self, kind, record, product, **extra):
+        # The live product (with its element or selector) rides along for consumers
+        event = {'type': kind, 'key': record.key, 'record': record.to_dict(), 'product': product}
+        event.update(extra)
+        return event
@@ -0,0 +1,150 @@
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+# Iran has no DST since 2022; used when the tz database is unavailable
+TEHRAN_OFFSET = timezone(timedelta(hours=3, minutes=30))
+
+IDLE, RAMP, OPEN, CLOSED = 'idle', 'ramp', 'open', 'closed'
+
+
+def sale_timezone(name='Asia/Tehran'):
+    """Timezone the sale times are published in"""
+    try:
+        return ZoneInfo(name) if ZoneInfo else TEHRAN_OFFSET
+    except Exception:
+        return TEHRAN_OFFSET
+
+
+class ClockSync:
+    """Estimate server clock offset from HTTP Date headers with RTT compensation"""
+
+    def __init__(self, session, url, samples=8):
+        self.session = session
+        self.url = url
+        self.samples = samples
+        self.offset = 0.0
+        self.error = None
+
+    def sync(self):
+        """Measure the offset; returns seconds to add to the local clock to get server time"""
+        # Date has 1 s resolution: a response stamped D, sent at t0 and received
+        # at t1, bounds the offset to [D - t1, D + 1 - t0]. Intersecting the
+        # bounds of several samples narrows the estimate well below RTT.
+        low, high = float('-inf'), float('inf')
+        for _ in range(self.samples):
+            try:
+                sent = time.time()
+                response = self.session.head(self.url, timeout=5, allow_redirects=False)
+                received = time.time()
+                server = parsedate_to_datetime(response.headers['Date']).timestamp()
+            except Exception as e:
+                logger.debug(f"Clock sample failed: {e}")
+                continue
+            sample_low, sample_high = server - received, server + 1 - sent
+            if sample_low > high or sample_high < low:
+                # Inconsistent with earlier samples (e.g. another server behind a balancer)
+                continue
+            low, high = max(low, sample_low), min(high, sample_high)
+            # Spread the next request across the second so boundaries are hit
+            time.sleep(1.0 / self.samples)
+
+        if high == float('inf'):
+            logger.warning("⚠️ Could not read server Date headers, using local clock")
+            return self.offset
+        self.offset = (low + high) / 2
+        self.error = (high - low) / 2
+        logger.info(f"🕐 Server clock offset {self.offset:+.3f}s (±{self.error:.3f}s)")
+        return self.offset
+
+
+class SaleScheduler:
+    """Polling intervals that stay idle far from sale start, ramp up to it and run flat out while open"""
+
+    def __init__(self, start_at, offset=0.0, idle_interval=30.0, max_interval=0.2,
+                 ramp_seconds=300, open_seconds=180, arm_lead=5.0):
+        self.start_at = start_at.timestamp()
+        self.offset = offset
+        self.idle_interval = idle_interval
+        self.max_interval = max_interval
+        self.ramp_seconds = ramp_seconds
+        self.open_seconds = open_seconds
+        self.arm_lead = arm_lead
+        self.armed = False
+
+    @classmethod
+    def from_config(cls, config, offset=0.0):
+        """Build from the sale section: start_time "HH:MM", optional date "YYYY-MM-DD" and timezone"""
+        tz = sale_timezone(config.get('sale.timezone', 'Asia/Tehran'))
+        hour, minute = (int(part) for part in config.get('sale.start_time', '23:55').split(':')[:2])
+        now = datetime.fromtimestamp(time.time() + offset, tz)
+        date = config.get('sale.date')
+        if date:
+            day = datetime.strptime(str(date), '%Y-%m-%d').date()
+        else:
+            day = now.date()
+        start_at = datetime(day.year, day.month, day.day, hour, minute, tzinfo=tz)
+        open_seconds = config.get('sale.open_window_seconds', 180)
+        if not date and (now - start_at).total_seconds() > open_seconds:
+            # Today's window has passed; aim at tomorrow's
+            start_at += timedelta(days=1)
+        return cls(start_at, offset,
+                   idle_interval=config.get('sale.idle_interval', 30.0),
+                   max_interval=config.get('sale.max_interval', 0.2),
+                   ramp_seconds=config.get('sale.ramp_seconds', 300),
+                   open_seconds=open_seconds,
+                   arm_lead=config.get('sale.arm_lead_seconds', 5.0))
+
+    def now(self):
+        """Current time on the server's clock"""
+        return time.time() + self.offset
+
+    def seconds_to_start(self):
+        return self.start_at - self.now()
+
+    def phase(self):
+        remaining = self.seconds_to_start()
+        if remaining > self.ramp_seconds:
+            return IDLE
+        if remaining > 0:
+            return RAMP
+        if -remaining <= self.open_seconds:
+            return OPEN
+        return CLOSED
+
+    def next_interval(self):
+        """Seconds to wait before the next poll; None once the opening window is over"""
+        remaining = self.seconds_to_start()
+        phase = self.phase()
+        if phase == CLOSED:
+            return None
+        if phase == OPEN:
+            return self.max_interval
+        if phase == IDLE:
+            interval = self.idle_interval
+            # Wake up exactly when the ramp begins
+            return min(interval, remaining - self.ramp_seconds)
+        # Geometric ramp from the idle interval down to the maximum rate
+        progress = 1 - remaining / self.ramp_seconds
+        interval = self.idle_interval * (self.max_interval / self.idle_interval) ** progress
+        # Never sleep past T0: the first poll after opening lands on it
+        return max(0.0, min(interval, remaining))
+
+    def should_arm(self):
+        """True once, arm_lead seconds before the sale starts"""
+        if self.armed or self.seconds_to_start() > self.arm_lead:
+            return False
+        self.armed = True
+        return True
+
+    def describe(self):
+        start = datetime.fromtimestamp(self.start_at).strftime('%Y-%m-%d %H:%M:%S')
+        return f"sale starts {start} (local), in {self.seconds_to_start():.0f}s, phase {self.phase()}"
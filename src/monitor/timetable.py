@@ -0,0 +1,163 @@
+import re
+import time
+import logging
+import threading
+from datetime import datetime, date, timedelta
+from src.utils.text_normalizer import NORMALIZE_TABLE
+
+logger = logging.getLogger(__name__)
+
+PERSIAN_MONTHS = ['فروردین', 'اردیبهشت', 'خرداد', 'تیر', 'مرداد', 'شهریور',
+                  'مهر', 'آبان', 'آذر', 'دی', 'بهمن', 'اسفند']
+
+# HH:MM, but not part of an HH:MM:SS countdown
+_TIME = re.compile(r'(?<![\d:])([01]?\d|2[0-3])\s*:\s*([0-5]\d)(?![\d:])')
+_JALALI_DATE = re.compile(r'(?<!\d)(1[34]\d\d)\s*[/\-.]\s*(\d{1,2})\s*[/\-.]\s*(\d{1,2})(?!\d)')
+_GREGORIAN_DATE = re.compile(r'(?<!\d)(20\d\d)\s*[/\-.]\s*(\d{1,2})\s*[/\-.]\s*(\d{1,2})(?!\d)')
+_MONTH_DATE = re.compile(r'(?<!\d)(\d{1,2})\s*(' + '|'.join(PERSIAN_MONTHS) + r')(?:\s*(1[34]\d\d))?')
+_RELATIVE_DAYS = [('پس فردا', 2), ('پسفردا', 2), ('فردا', 1), ('امروز', 0), ('tomorrow', 1), ('today', 0)]
+
+
+def jalali_to_gregorian(jy, jm, jd):
+    """Convert a Jalali (Solar Hijri) date to a Gregorian date"""
+    jy += 1595
+    days = -355668 + 365 * jy + (jy // 33) * 8 + ((jy % 33) + 3) // 4 + jd
+    days += (jm - 1) * 31 if jm < 7 else (jm - 7) * 30 + 186
+    gy = 400 * (days // 146097)
+    days %= 146097
+    if days > 36524:
+        days -= 1
+        gy += 100 * (days // 36524)
+        days %= 36524
+        if days >= 365:
+            days += 1
+    gy += 4 * (days // 1461)
+    days %= 1461
+    if days > 365:
+        gy += (days - 1) // 365
+        days = (days - 1) % 365
+    return date(gy, 1, 1) + timedelta(days=days)
+
+
+def _nearest_jalali(month, day, today):
+    """Resolve a Jalali month/day without a year to the occurrence closest to today"""
+    base = today.year - 621
+    candidates = []
+    for jy in (base - 1, base, base + 1):
+        try:
+            candidates.append(jalali_to_gregorian(jy, month, day))
+        except ValueError:
+            continue
+    return min(candidates, key=lambda d: abs((d - today).days))
+
+
+def parse_opening_time(text, now):
+    """Find an opening time in card text; now is a timezone-aware datetime. Returns a datetime or None"""
+    text = (text or '').translate(NORMALIZE_TABLE)
+    clock = _TIME.search(text)
+    if not clock:
+        return None
+
+    today = now.date()
+    day = None
+    match = _JALALI_DATE.search(text)
+    if match:
+        day = jalali_to_gregorian(*(int(part) for part in match.groups()))
+    if day is None:
+        match = _GREGORIAN_DATE.search(text)
+        if match:
+            day = date(*(int(part) for part in match.groups()))
+    if day is None:
+        match = _MONTH_DATE.search(text)
+        if match:
+            month = PERSIAN_MONTHS.index(match.group(2)) + 1
+            if match.group(3):
+                day = jalali_to_gregorian(int(match.group(3)), month, int(match.group(1)))
+            else:
+                day = _nearest_jalali(month, int(match.group(1)), today)
+    if day is None:
+        offset = next((days for word, days in _RELATIVE_DAYS if word in text.lower()), 0)
+        day = today + timedelta(days=offset)
+
+    return datetime(day.year, day.month, day.day, int(clock.group(1)), int(clock.group(2)), tzinfo=now.tzinfo)
+
+
+class TimetableSchedule:
+    """Per-product opening windows with arming timers; polling is only needed inside a window"""
+
+    def __init__(self, entries, lead=30.0, open_seconds=180, idle_interval=60.0, offset=0.0):
+        # entries: {'name', 'target', 'priority', 'opens_at' (epoch seconds), 'url'}
+        self.entries = sorted(entries, key=lambda entry: (entry['opens_at'], entry['priority']))
+        self.lead = lead
+        self.open_seconds = open_seconds
+        self.idle_interval = idle_interval
+        self.offset = offset
+        self.timers = []
+
+    @classmethod
+    def from_products(cls, products, matcher, now, **kwargs):
+        """Build the schedule from timetable cards (name, link, text), keeping target products only"""
+        entries = []
+        for product in products:
+            target = matcher.match(product.get('name') or '')
+            if not target:
+                continue
+            opens_at = parse_opening_time(product.get('text') or product.get('name'), now)
+            if opens_at is None:
+                logger.debug(f"No opening time found for {product.get('name')}")
+                continue
+            entries.append({'name': product['name'], 'target': target['name'], 'priority': target['priority'],
+                            'opens_at': opens_at.timestamp(), 'url': product.get('link')})
+        schedule = cls(entries, **kwargs)
+        for entry in schedule.entries:
+            logger.info(f"🗓️ {entry['name']} opens {datetime.fromtimestamp(entry['opens_at']).strftime('%Y-%m-%d %H:%M')} (priority {entry['priority']})")
+        return schedule
+
+    def now(self):
+        return time.time() + self.offset
+
+    def arm(self, callback):
+        """Start one timer per upcoming product, firing lead seconds before it opens"""
+        self.cancel()
+        for entry in self.entries:
+            delay = entry['opens_at'] - self.lead - self.now()
+            if delay < -self.open_seconds:
+                continue
+            timer = threading.Timer(max(0.0, delay), callback, args=(entry,))
+            timer.daemon = True
+            timer.start()
+            self.timers.append(timer)
+        return len(self.timers)
+
+    def cancel(self):
+        for timer in self.timers:
+            timer.cancel()
+        self.timers = []
+
+    def active(self):
+        """Entries whose window is open or opens within the lead time"""
+        now = self.now()
+        return [entry for entry in self.entries
+                if entry['opens_at'] - self.lead <= now <= entry['opens_at'] + self.open_seconds]
+
+    def covers(self):
+        """True while some window is open or still to come; afterwards the schedule no longer applies"""
+        now = self.now()
+        return any(now <= entry['opens_at'] + self.open_seconds for entry in self.entries)
+
+    def lists(self, target_name):
+        """True when the timetable has an opening time for the target"""
+        return any(entry['target'] == target_name for entry in self.entries)
+
+    def is_active(self, target_name):
+        return any(entry['target'] == target_name for entry in self.active())
+
+    def next_interval(self, active_interval):
+        """active_interval inside a window; otherwise sleep until the next window (capped), None when all passed"""
+        if self.active():
+            return active_interval
+        now = self.now()
+        upcoming = [entry['opens_at'] - self.lead - now for entry in self.entries if entry['opens_at'] - self.lead > now]
+        if not upcoming:
+            return None
+        return min(self.idle_interval, min(upcoming))
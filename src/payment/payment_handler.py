@@ -1,10 +1,10 @@
-import time
 import webbrowser
 import logging
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from src.utils.helpers import retry_on_failure, human_delay
+from src.utils.helpers import retry_on_failure
+from src.ai_navigator.page_analyzer import PAGE_CLASSIFIER, PAYMENT_GATEWAY, LOGIN, PRODUCT, CART, CHECKOUT, SOLD_OUT
+from src.browser.text_index import PageTextIndex
+from src.browser.wait_engine import WaitEngine, element_clickable, mark_leaving, page_type_in, dom_quiet, network_idle, all_of
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +12,8 @@ class PaymentHandler:
     def __init__(self):
         self.driver = None
         self.wait = None
+        self.text_index = None
+        self.waits = None
         self.purchased_products = set()
         self.processing_products = set()
     
@@ -19,6 +21,8 @@ class PaymentHandler:
         """Set browser driver"""
         self.driver = driver
         self.wait = wait
+        self.text_index = PageTextIndex(driver)
+        self.waits = WaitEngine(driver)
     
     def should_purchase(self, product):
         """Check if product should be purchased"""
@@ -43,8 +47,8 @@ class PaymentHandler:
             self.driver.get(product_url)
             logger.info(f"🌐 Navigated to product page: {product['name']}")
             
-            # Wait for page load
-            time.sleep(3)
+            # get() returns after the load event; wait for the client-side product view
+            self.waits.until(3, rendered=page_type_in(PRODUCT, CART, CHECKOUT, SOLD_OUT, LOGIN))
             return True
             
         except Exception as e:
@@ -55,26 +59,23 @@ class PaymentHandler:
     def add_to_cart(self):
         """Add product to cart"""
         try:
-            # Try different selectors for add to cart button
-            add_to_cart_selectors = [
-                "//button[contains(text(), 'Add to Cart')]",
-                "//button[contains(text(), 'Add to Basket')]",
-                "//button[contains(@class, 'add-to-cart')]",
-                "//button[contains(@id, 'add-to-cart')]",
-                "//a[contains(text(), 'Add to Cart')]"
-            ]
-            
-            for selector in add_to_cart_selectors:
-                try:
-                    add_button = self.wait.until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    add_button.click()
-                    logger.info("✅ Product added to cart")
-                    human_delay(1, 2)
-                    return True
-                except:
-                    continue
+            # Text lookup (one in-page call) and the known selectors race under one deadline
+            _, add_button = self.waits.until(
+                20,
+                text=lambda driver: self.text_index.find_first([
+                    ('افزودن به سبد', ['button', 'a']),
+                    ('Add to Cart', ['button', 'a']),
+                    ('Add to Basket', ['button'])
+                ]),
+                add_to_cart_class=element_clickable("//button[contains(@class, 'add-to-cart')]"),
+                add_to_cart_id=element_clickable("//button[contains(@id, 'add-to-cart')]")
+            )
+            if add_button:
+                mark_leaving(self.driver)
+                add_button.click()
+                logger.info("✅ Product added to cart")
+                self.waits.settle(2, destination=page_type_in(CART, CHECKOUT))
+                return True
             
             logger.error("❌ Add to cart button not found")
             return False
@@ -88,24 +89,19 @@ class PaymentHandler:
         """Select Snapp Pay payment method"""
         try:
             # Look for Snapp Pay payment option
-            snapp_pay_selectors = [
-                "//div[contains(text(), 'Snapp Pay')]",
-                "//label[contains(text(), 'Snapp Pay')]",
-                "//input[@value='snapp-pay']",
-                "//button[contains(text(), 'Snapp Pay')]"
-            ]
-            
-            for selector in snapp_pay_selectors:
-                try:
-                    snapp_pay_option = self.wait.until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    snapp_pay_option.click()
-                    logger.info("✅ Snapp Pay payment selected")
-                    human_delay(1, 2)
-                    return True
-                except:
-                    continue
+            _, snapp_pay_option = self.waits.until(
+                20,
+                text=lambda driver: self.text_index.find_first([
+                    ('Snapp Pay', ['label', 'button', 'div']),
+                    ('اسنپ پی', ['label', 'button', 'div'])
+                ]),
+                radio=element_clickable("//input[@value='snapp-pay']")
+            )
+            if snapp_pay_option:
+                snapp_pay_option.click()
+                logger.info("✅ Snapp Pay payment selected")
+                self.waits.until(2, quiet=all_of(dom_quiet(300), network_idle(300)))
+                return True
             
             logger.warning("⚠️ Snapp Pay option not found, trying to proceed")
             return True  # Continue even if not found
@@ -117,33 +113,37 @@ class PaymentHandler:
     def get_payment_url(self):
         """Get payment gateway URL"""
         try:
-            # Wait for redirect to payment gateway
-            time.sleep(3)
+            # Wait for redirect to payment gateway (or to login), or for the page to settle
+            self.waits.until(
+                3,
+                routed=lambda driver: PAGE_CLASSIFIER.classify_driver(driver) in (PAYMENT_GATEWAY, LOGIN),
+                quiet=all_of(dom_quiet(500), network_idle(500))
+            )
             
             current_url = self.driver.current_url
             
             # Check if we're on a payment gateway page
-            payment_indicators = ['bank', 'payment', 'gateway', 'shaparak']
-            if any(indicator in current_url.lower() for indicator in payment_indicators):
+            page_type = PAGE_CLASSIFIER.classify_driver(self.driver)
+            if page_type == PAYMENT_GATEWAY:
                 logger.info(f"💰 Payment gateway URL: {current_url}")
                 return current_url
+            elif page_type == LOGIN:
+                logger.error("❌ Redirected to login page instead of payment gateway")
+                return None
             else:
                 # Try to find payment button/link
-                payment_buttons = [
-                    "//button[contains(text(), 'Pay')]",
-                    "//a[contains(text(), 'Pay')]",
-                    "//button[contains(text(), 'Payment')]",
-                    "//a[contains(@href, 'payment')]"
-                ]
+                payment_btn = self.text_index.find_first([
+                    ('Pay', ['button', 'a']),
+                    ('پرداخت', ['button', 'a'])
+                ])
+                if not payment_btn:
+                    payment_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='payment']")
+                    payment_btn = payment_links[0] if payment_links else None
                 
-                for selector in payment_buttons:
-                    try:
-                        payment_btn = self.driver.find_element(By.XPATH, selector)
-                        payment_url = payment_btn.get_attribute('href') or self.driver.current_url
-                        logger.info(f"💰 Payment URL found: {payment_url}")
-                        return payment_url
-                    except:
-                        continue
+                if payment_btn:
+                    payment_url = payment_btn.get_attribute('href') or self.driver.current_url
+                    logger.info(f"💰 Payment URL found: {payment_url}")
+                    return payment_url
                 
                 logger.warning("⚠️ No specific payment URL found, using current page")
                 return current_url
@@ -29,9 +29,16 @@ class Config:
             },
             'monitor': {
                 'refresh_interval': 2,
+                'poll_interval': 0.5,
+                'poll_timeout': 5,
                 'max_retries': 10,
                 'timeout': 30
             },
+            'sale': {
+                'start_time': '23:55',
+                'timezone': 'Asia/Tehran',
+                'arm_lead_seconds': 5
+            },
             'products': {
                 'priority_list': [
                     "Samsung S25 Ultra Mobile",
@@ -0,0 +1,84 @@
+from collections import deque
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton that finds many keywords in a single pass"""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._built = False
+
+    def add(self, keyword, value):
+        """Add a keyword that reports the given value when matched"""
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(keyword), keyword, value))
+        self._built = False
+
+    def build(self):
+        """Compute failure links; must be called after the last add()"""
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def iter_matches(self, text):
+        """Yield (start, end, keyword, value) for every occurrence"""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, keyword, value in out[node]:
+                yield i + 1 - length, i + 1, keyword, value
+
+    def longest_matches(self, text, whole_words=True):
+        """Return non-overlapping matches, preferring the longest keyword"""
+        matches = []
+        for start, end, keyword, value in self.iter_matches(text):
+            if whole_words and not _on_word_boundary(text, start, end):
+                continue
+            matches.append((start, end, keyword, value))
+
+        matches.sort(key=lambda m: (m[0] - m[1], m[0]))
+        taken = []
+        selected = []
+        for match in matches:
+            start, end = match[0], match[1]
+            if any(start < t_end and t_start < end for t_start, t_end in taken):
+                continue
+            taken.append((start, end))
+            selected.append(match)
+        selected.sort()
+        return selected
+
+
+def _on_word_boundary(text, start, end):
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    if end < len(text) and text[end].isalnum():
+        return False
+    return True
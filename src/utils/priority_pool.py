@@ -0,0 +1,112 @@
+import heapq
+import logging
+import itertools
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PriorityWorkerPool:
+    """Fixed number of worker threads fed by a bounded priority queue, deduplicated by key.
+
+    Lower priority numbers run first. A key is never queued twice, never
+    queued while in flight and never queued again once its handler
+    succeeded; a failed key may be submitted again.
+    """
+
+    def __init__(self, handler, workers=1, max_queued=16, name='worker'):
+        self.handler = handler
+        self.max_queued = max_queued
+        self.heap = []
+        self.queued = {}
+        self.in_flight = set()
+        self.completed = set()
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.running = True
+        self.stats = {'submitted': 0, 'duplicates': 0, 'preempted': 0, 'rejected': 0, 'succeeded': 0, 'failed': 0}
+        self.threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, key, priority, item):
+        """Queue an item; returns False when it is a duplicate or the queue is full of higher-priority work"""
+        with self.condition:
+            if key in self.in_flight or key in self.completed:
+                self.stats['duplicates'] += 1
+                return False
+            if key in self.queued:
+                entry = self.queued[key]
+                if priority < entry[0]:
+                    # Same product seen with a higher priority: re-queue it at that priority
+                    entry[-1] = None
+                    self._push(key, priority, item)
+                else:
+                    self.stats['duplicates'] += 1
+                return False
+            if len(self.queued) >= self.max_queued:
+                victim = max(self.queued.values(), key=lambda entry: (entry[0], entry[1]))
+                if victim[0] <= priority:
+                    self.stats['rejected'] += 1
+                    return False
+                # Preempt the lowest-priority queued item
+                logger.info(f"⏭️ Preempting queued {victim[2]} (priority {victim[0]}) for {key} (priority {priority})")
+                del self.queued[victim[2]]
+                victim[-1] = None
+                self.stats['preempted'] += 1
+            self._push(key, priority, item)
+            self.stats['submitted'] += 1
+            self.condition.notify()
+            return True
+
+    def _push(self, key, priority, item):
+        entry = [priority, next(self.counter), key, item]
+        self.queued[key] = entry
+        heapq.heappush(self.heap, entry)
+
+    def _next(self):
+        with self.condition:
+            while self.running:
+                while self.heap:
+                    priority, _, key, item = heapq.heappop(self.heap)
+                    if item is None:
+                        # Entry was superseded or preempted
+                        continue
+                    del self.queued[key]
+                    self.in_flight.add(key)
+                    return key, item
+                self.condition.wait()
+            return None, None
+
+    def _work(self):
+        while True:
+            key, item = self._next()
+            if key is None:
+                return
+            try:
+                success = self.handler(item)
+            except Exception as e:
+                logger.error(f"❌ Worker failed on {key}: {e}")
+                success = False
+            with self.condition:
+                self.in_flight.discard(key)
+                if success:
+                    self.completed.add(key)
+                    self.stats['succeeded'] += 1
+                else:
+                    self.stats['failed'] += 1
+
+    def is_known(self, key):
+        """True when the key is queued, running or done"""
+        with self.condition:
+            return key in self.queued or key in self.in_flight or key in self.completed
+
+    def shutdown(self):
+        """Stop workers after their current item; queued items are dropped"""
+        with self.condition:
+            self.running = False
+            self.heap.clear()
+            self.queued.clear()
+            self.condition.notify_all()
@@ -0,0 +1,69 @@
+import re
+from functools import lru_cache
+
+# Arabic letter forms that Persian pages mix in, mapped to their Persian forms
+_LETTER_MAP = {
+    'ي': 'ی', 'ى': 'ی', 'ئ': 'ی',
+    'ك': 'ک',
+    'ة': 'ه', 'ۀ': 'ه',
+    'أ': 'ا', 'إ': 'ا', 'ٱ': 'ا',
+    'ؤ': 'و',
+}
+
+# Persian (U+06F0..) and Arabic-Indic (U+0660..) digits to ASCII, plus the
+# Arabic thousands (٬) and decimal (٫) separators
+_DIGIT_MAP = {'٬': ',', '٫': '.'}
+for _i in range(10):
+    _DIGIT_MAP[chr(0x06F0 + _i)] = str(_i)
+    _DIGIT_MAP[chr(0x0660 + _i)] = str(_i)
+
+# Diacritics (harakat, tanwin, superscript alef), tatweel and ZWNJ/ZWJ are dropped
+_REMOVED = [chr(c) for c in range(0x064B, 0x0653)] + ['ٰ', 'ـ', '‌', '‍']
+
+NORMALIZE_TABLE = str.maketrans({**_LETTER_MAP, **_DIGIT_MAP, **{ch: None for ch in _REMOVED}})
+
+_SEPARATORS = re.compile(r'[\s_\-/\\|:،,.;()\[\]{}"\'*]+')
+
+# "۱۵,۰۰۰,۰۰۰ تومان", "15000000 ریال", "1.5 میلیون تومان" (after NORMALIZE_TABLE)
+_PRICE = re.compile(r'(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?\s*(میلیون|هزار)?\s*(تومان|ریال|toman|rial)?', re.IGNORECASE)
+_MULTIPLIERS = {'میلیون': 1000000, 'هزار': 1000}
+PRICE_PATTERN = re.compile(r'\d[\d,٬.\s]*\s*(میلیون|هزار)?\s*(تومان|ریال|toman|rial)', re.IGNORECASE)
+
+
+@lru_cache(maxsize=65536)
+def normalize_text(text):
+    """Normalize mixed Persian/English text for matching"""
+    if not text:
+        return ''
+    text = text.translate(NORMALIZE_TABLE).lower()
+    return _SEPARATORS.sub(' ', text).strip()
+
+
+def normalize_chars(text):
+    """Unify letters and digits only, keeping case, spacing and punctuation"""
+    return text.translate(NORMALIZE_TABLE) if text else ''
+
+
+def contains(text, needle):
+    """Substring test on normalized text"""
+    return normalize_text(needle) in normalize_text(text)
+
+
+@lru_cache(maxsize=16384)
+def parse_price(text):
+    """Read a price in toman from text like "۱۵,۰۰۰,۰۰۰ تومان"; rial amounts are divided by 10. None if absent"""
+    if not text:
+        return None
+    best = None
+    for match in _PRICE.finditer(normalize_chars(text)):
+        whole, fraction, multiplier, unit = match.groups()
+        amount = float(whole.replace(',', '') + ('.' + fraction if fraction else ''))
+        amount *= _MULTIPLIERS.get(multiplier, 1)
+        if unit and unit.lower() in ('ریال', 'rial'):
+            amount /= 10
+        # Prefer an amount with a currency unit, e.g. over a "20%" discount badge
+        if unit or best is None:
+            best = int(amount)
+            if unit:
+                break
+    return best
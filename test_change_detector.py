@@ -0,0 +1,90 @@
+from src.monitor.change_detector import PageChangeDetector, COLLECT_SCRIPT, OBSERVER_SCRIPT
+
+
+class FakeDriver:
+    """Answers COLLECT_SCRIPT with queued summaries and records what was asked"""
+
+    def __init__(self, *summaries):
+        self.summaries = list(summaries)
+        self.collects = []
+        self.installs = 0
+
+    def execute_script(self, script, *args):
+        if script == OBSERVER_SCRIPT:
+            self.installs += 1
+            return False
+        assert script == COLLECT_SCRIPT
+        self.collects.append(args)
+        return self.summaries.pop(0)
+
+
+def _summary(fingerprint='a', count=0, roots=None, installed=True):
+    return {'installed': installed, 'fingerprint': fingerprint, 'count': count, 'roots': roots or {}}
+
+
+def test_first_check_installs_observer():
+    driver = FakeDriver(_summary(installed=False))
+    change = PageChangeDetector(driver).check()
+    assert change['reason'] == 'new_document'
+    assert driver.installs == 1
+
+
+def test_change_stays_pending_until_committed():
+    driver = FakeDriver(
+        _summary(installed=False),
+        _summary('a', count=2, roots={'#grid': 2}),
+        _summary('a'),
+        _summary('a'),
+    )
+    detector = PageChangeDetector(driver)
+    detector.check()
+    detector.commit()
+
+    change = detector.check()
+    assert change['reason'] == 'mutations' and change['subtrees'] == ['#grid']
+    # The analysis failed: nothing new in the page, but the change is reported again
+    change = detector.check()
+    assert change['reason'] == 'mutations' and change['subtrees'] == ['#grid'] and change['mutations'] == 2
+
+    detector.commit()
+    assert not detector.check()['changed']
+
+
+def test_uncommitted_structure_change_is_reported_again():
+    driver = FakeDriver(_summary(installed=False), _summary('b'), _summary('b'), _summary('b'))
+    detector = PageChangeDetector(driver)
+    detector.check()
+    detector.commit()
+    assert detector.check()['reason'] == 'structure'
+    assert detector.check()['reason'] == 'structure'
+    detector.commit()
+    assert not detector.check()['changed']
+
+
+def test_new_document_stays_pending_until_committed():
+    driver = FakeDriver(_summary(installed=False), _summary('a'), _summary('a'))
+    detector = PageChangeDetector(driver)
+    assert detector.check()['reason'] == 'new_document'
+    assert detector.check()['reason'] == 'new_document'
+    detector.commit()
+    assert not detector.check()['changed']
+
+
+def test_structure_walk_can_be_skipped():
+    driver = FakeDriver(_summary(installed=False), _summary(None), _summary(None, count=1, roots={'#grid': 1}))
+    detector = PageChangeDetector(driver)
+    detector.check()
+    detector.commit()
+    # Without the walk the last fingerprint stands and only mutations count
+    assert not detector.check(structure=False)['changed']
+    assert detector.check(structure=False)['reason'] == 'mutations'
+    assert driver.collects == [(True,), (False,), (False,)]
+
+
+def test_collect_failure_forces_analysis():
+    class BrokenDriver:
+        def execute_script(self, script, *args):
+            raise RuntimeError("tab crashed")
+
+    change = PageChangeDetector(BrokenDriver()).check()
+    assert change['changed'] and change['reason'] == 'error'
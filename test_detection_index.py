@@ -0,0 +1,69 @@
+from src.adaptive_scraper.detection_index import DetectionIndex, DETECT_SCRIPT
+
+CATALOGUE = [
+    {'id': 1, 'name': 'Galaxy S25 Ultra', 'target_selectors': ["//a[contains(., 'S25')]"]},
+    {'id': 2, 'name': 'Asus Vivobook 15', 'target_selectors': ["//a[contains(., 'Vivobook')]", "//div[@id='asus']"]},
+    {'id': 3, 'name': 'Anker Soundcore Q20i'},
+]
+
+
+class FakeDriver:
+    def __init__(self, hits):
+        # id -> (present, clickable)
+        self.hits = hits
+        self.payloads = []
+
+    def execute_script(self, script, payload):
+        assert script == DETECT_SCRIPT
+        self.payloads.append(payload)
+        results = []
+        for product_id, selectors in payload:
+            present, clickable = self.hits.get(product_id, (False, False))
+            results.append({'id': product_id, 'selector': selectors[0] if present else None,
+                            'present': present, 'clickable': clickable, 'element': None})
+        return results
+
+
+def test_payload_lists_curated_products_in_order():
+    driver = FakeDriver({})
+    index = DetectionIndex(driver, CATALOGUE)
+    index.detect()
+    assert [product_id for product_id, _ in driver.payloads[0]] == [1, 2]
+    assert index.uncovered == ['Anker Soundcore Q20i']
+
+
+def test_clickable_hits_become_products():
+    index = DetectionIndex(FakeDriver({1: (True, True), 2: (True, False)}), CATALOGUE)
+    products = index.clickable_products(index.detect())
+    assert [(p['key'], p['name'], p['confidence']) for p in products] == [('curated-1', 'Galaxy S25 Ultra', 'high')]
+
+
+def test_fallback_only_for_missed_products():
+    index = DetectionIndex(FakeDriver({1: (True, True)}), CATALOGUE)
+    results = index.detect()
+    assert index.missing(results) == ['Anker Soundcore Q20i', 'Asus Vivobook 15']
+    assert index.needs_fallback(results)
+
+
+def test_no_fallback_when_every_open_window_target_was_found():
+    index = DetectionIndex(FakeDriver({1: (True, False)}), CATALOGUE)
+    results = index.detect()
+    # Only the Galaxy's window is open, and its curated selector matched (not yet clickable)
+    in_window = lambda name: name == 'Galaxy S25 Ultra'
+    assert index.missing(results, in_window) == []
+    assert not index.needs_fallback(results, in_window)
+
+
+def test_fallback_when_an_open_window_target_is_missing():
+    index = DetectionIndex(FakeDriver({1: (True, True)}), CATALOGUE)
+    results = index.detect()
+    in_window = lambda name: name in ('Galaxy S25 Ultra', 'Asus Vivobook 15')
+    assert index.missing(results, in_window) == ['Asus Vivobook 15']
+
+
+def test_failed_detection_returns_no_results():
+    class BrokenDriver:
+        def execute_script(self, script, payload):
+            raise RuntimeError("no such window")
+
+    assert DetectionIndex(BrokenDriver(), CATALOGUE).detect() == []
@@ -0,0 +1,81 @@
+import threading
+import pytest
+
+pytest.importorskip('selenium')
+
+from src.browser.driver_executor import DriverExecutor, PURCHASE, MONITOR
+
+
+class FakeDriver:
+    """Records the thread each command ran on"""
+
+    def __init__(self):
+        self.threads = []
+        self.log = []
+
+    @property
+    def current_url(self):
+        self.threads.append(threading.current_thread().name)
+        return 'https://snapp.example/timetable'
+
+    def execute_script(self, script, *args):
+        self.threads.append(threading.current_thread().name)
+        self.log.append(script)
+        return args
+
+
+@pytest.fixture
+def executor():
+    executor = DriverExecutor(FakeDriver(), name='primary')
+    yield executor
+    executor.shutdown()
+
+
+def test_purchase_commands_jump_the_queue(executor):
+    gate = threading.Event()
+    executor.submit(lambda driver: gate.wait(5))
+    order = []
+    futures = [executor.submit(lambda driver: order.append('monitor read'), MONITOR),
+               executor.submit(lambda driver: order.append('purchase click'), PURCHASE),
+               executor.submit(lambda driver: order.append('monitor poll'), MONITOR)]
+    gate.set()
+    for future in futures:
+        future.result(5)
+    assert order == ['purchase click', 'monitor read', 'monitor poll']
+    assert executor.stats['by_priority'] == {MONITOR: 3, PURCHASE: 1}
+
+
+def test_proxy_runs_every_call_on_the_executor_thread(executor):
+    proxy = executor.proxy(MONITOR)
+    assert proxy.current_url == 'https://snapp.example/timetable'
+    assert proxy.execute_script("return 1;", [proxy]) == ([executor.driver],)
+    assert set(executor.driver.threads) == {'primary-executor'}
+
+
+def test_commands_issued_from_a_command_do_not_deadlock(executor):
+    def outer(driver):
+        return executor.call(lambda driver: 'inner', PURCHASE) + ' in outer'
+
+    assert executor.call(outer) == 'inner in outer'
+
+
+def test_errors_reach_the_caller(executor):
+    def broken(driver):
+        raise RuntimeError("no such window")
+
+    with pytest.raises(RuntimeError):
+        executor.call(broken)
+    assert executor.call(lambda driver: 'still running') == 'still running'
+    assert executor.stats['failed'] == 1
+
+
+def test_shutdown_finishes_queued_commands_then_rejects_new_ones():
+    executor = DriverExecutor(FakeDriver())
+    gate = threading.Event()
+    executor.submit(lambda driver: gate.wait(5))
+    queued = executor.submit(lambda driver: 'queued')
+    gate.set()
+    executor.shutdown()
+    assert queued.result(1) == 'queued'
+    with pytest.raises(RuntimeError):
+        executor.call(lambda driver: 'late')
@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip('requests')
+
+import requests
+from src.monitor.http_poller import AvailabilityPoller
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Returns queued responses and records the conditional headers sent"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.sent.append(dict(headers or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _poller(*responses):
+    poller = AvailabilityPoller('https://snapp.example/timetable')
+    poller.session = FakeSession(*responses)
+    return poller
+
+
+def test_first_poll_is_a_baseline_and_later_polls_are_conditional():
+    poller = _poller(
+        FakeResponse(200, b'<ul><li>S25</li></ul>', {'ETag': '"v1"', 'Last-Modified': 'Mon, 20 Oct 2025 08:00:00 GMT'}),
+        FakeResponse(304),
+    )
+    assert poller.poll()['reason'] == 'baseline'
+    result = poller.poll()
+    assert result == {**result, 'changed': False, 'reason': 'not_modified', 'status': 304}
+    assert poller.session.sent == [
+        {},
+        {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 20 Oct 2025 08:00:00 GMT'},
+    ]
+    assert poller.get_metrics()['not_modified'] == 1
+
+
+def test_304_keeps_the_validators_and_digest():
+    poller = _poller(FakeResponse(200, b'a', {'ETag': '"v1"'}), FakeResponse(304), FakeResponse(200, b'a'))
+    poller.poll()
+    poller.poll()
+    assert poller.etag == '"v1"'
+    # Same body after the 304: still unchanged against the first baseline
+    assert poller.poll()['reason'] == 'unchanged'
+
+
+def test_volatile_tokens_do_not_count_as_changes():
+    poller = _poller(
+        FakeResponse(200, b'<script nonce="abc">{"buildId":"1"}</script><li>S25</li>'),
+        FakeResponse(200, b'<script nonce="xyz">{"buildId":"2"}</script><li>S25</li>'),
+        FakeResponse(200, b'<script nonce="xyz">{"buildId":"2"}</script><li>S25 available</li>'),
+    )
+    poller.poll()
+    assert poller.poll()['reason'] == 'unchanged'
+    assert poller.poll()['changed']
+
+
+def test_rate_limit_and_auth_failures():
+    poller = _poller(FakeResponse(429, headers={'Retry-After': '30'}), FakeResponse(403),
+                     requests.ConnectionError("reset"))
+    result = poller.poll()
+    assert result['reason'] == 'status' and result['retry_after'] == 30
+    assert poller.needs_cookie_sync(poller.poll())
+    assert poller.poll()['reason'] == 'error'
+    assert poller.get_metrics()['errors'] == 3
@@ -0,0 +1,78 @@
+import json
+from src.monitor.network_detector import NetworkSaleDetector
+
+DEALS = {'data': {'items': [
+    {'id': 7, 'title': 'Galaxy S25 Ultra', 'price': 65000000, 'url': '/p/7', 'is_available': True},
+    {'id': 8, 'title': 'Asus Vivobook 15', 'price': 31000000, 'url': '/p/8', 'is_available': False},
+]}}
+
+
+def _entry(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+def _response(request_id, url, kind='XHR', mime='application/json'):
+    return _entry('Network.responseReceived', requestId=request_id, type=kind,
+                  response={'url': url, 'mimeType': mime})
+
+
+class FakeDriver:
+    """Serves queued performance log batches and response bodies by request id"""
+
+    def __init__(self, batches, bodies=None, enabled=True):
+        self.batches = list(batches)
+        self.bodies = bodies or {}
+        self.enabled = enabled
+        self.bodies_read = []
+
+    def execute_cdp_cmd(self, command, params):
+        if command == 'Network.enable':
+            if not self.enabled:
+                raise RuntimeError("performance logging is off")
+            return {}
+        assert command == 'Network.getResponseBody'
+        self.bodies_read.append(params['requestId'])
+        return {'body': json.dumps(self.bodies[params['requestId']])}
+
+    def get_log(self, kind):
+        assert kind == 'performance'
+        return self.batches.pop(0) if self.batches else []
+
+
+def test_products_come_from_finished_api_responses():
+    driver = FakeDriver([[], [
+        _response('1', 'https://api.snapp.example/v1/deals?page=1'),
+        _entry('Network.loadingFinished', requestId='1', encodedDataLength=900),
+    ]], {'1': DEALS})
+    detector = NetworkSaleDetector(driver)
+    products = detector.poll()
+    assert [(p['name'], p['available']) for p in products] == [('Galaxy S25 Ultra', True), ('Asus Vivobook 15', False)]
+    assert products[0]['key'] == '7' and products[0]['link'] == '/p/7'
+
+
+def test_body_is_read_only_once_loading_finished():
+    driver = FakeDriver([[], [_response('1', 'https://api.snapp.example/deals')],
+                         [_entry('Network.loadingFinished', requestId='1', encodedDataLength=900)]], {'1': DEALS})
+    detector = NetworkSaleDetector(driver)
+    assert detector.poll() == [] and driver.bodies_read == []
+    assert len(detector.poll()) == 2
+
+
+def test_unrelated_failed_and_oversized_responses_are_ignored():
+    driver = FakeDriver([[], [
+        _response('1', 'https://api.snapp.example/user/profile'),
+        _response('2', 'https://cdn.snapp.example/deals.js', kind='Script', mime='text/javascript'),
+        _response('3', 'https://api.snapp.example/deals'),
+        _entry('Network.loadingFailed', requestId='3'),
+        _response('4', 'https://api.snapp.example/catalog'),
+        _entry('Network.loadingFinished', requestId='4', encodedDataLength=5000000),
+    ] + [_entry('Network.loadingFinished', requestId=i, encodedDataLength=10) for i in '123']])
+    detector = NetworkSaleDetector(driver)
+    assert detector.poll() == []
+    assert driver.bodies_read == [] and not detector.pending
+
+
+def test_unavailable_without_performance_log():
+    detector = NetworkSaleDetector(FakeDriver([], enabled=False))
+    assert not detector.available
+    assert detector.poll() == []
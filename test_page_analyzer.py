@@ -0,0 +1,42 @@
+from src.ai_navigator.page_analyzer import (
+    PAGE_CLASSIFIER, PRODUCT, SOLD_OUT, TIMETABLE, CART, CHECKOUT, LOGIN, PAYMENT_GATEWAY, UNKNOWN
+)
+
+PRODUCT_URL = 'https://snapp.example/product/galaxy-s25-ultra'
+
+
+def _classify(url, text='', **markers):
+    page_type, _ = PAGE_CLASSIFIER.classify(url, '', {'text': text, **markers})
+    return page_type
+
+
+def test_product_page_with_enabled_buy_button():
+    assert _classify(PRODUCT_URL, "گلکسی S25 افزودن به سبد خرید مشخصات فنی", buy_controls=1) == PRODUCT
+
+
+def test_sold_out_related_card_does_not_hide_a_buyable_product():
+    text = "گلکسی S25 افزودن به سبد خرید محصولات مرتبط گلکسی S24 ناموجود"
+    assert _classify(PRODUCT_URL, text, buy_controls=1) == PRODUCT
+
+
+def test_product_page_without_buy_control_is_sold_out():
+    assert _classify(PRODUCT_URL, "گلکسی S25 ناموجود افزودن به سبد خرید", buy_controls=0) == SOLD_OUT
+    assert _classify(PRODUCT_URL, "گلکسی S25 موجودی تمام شد", buy_controls=0) == SOLD_OUT
+
+
+def test_sold_out_wording_without_markers_does_not_override_product():
+    # Without the marker script we cannot tell whether a buy control exists
+    assert _classify(PRODUCT_URL, "گلکسی S25 ناموجود") == PRODUCT
+
+
+def test_timetable_with_sold_out_items_stays_timetable():
+    url = 'https://snapp.example/timetable'
+    assert _classify(url, "زمان بندی فروش ناموجود تمام شد", buy_controls=0, product_cards=12) == TIMETABLE
+
+
+def test_url_and_markers():
+    assert _classify('https://snapp.example/cart', "سبد خرید شما") == CART
+    assert _classify('https://snapp.example/checkout', "انتخاب روش پرداخت", form_inputs=5) == CHECKOUT
+    assert _classify('https://snapp.example/login', "ورود یا ثبت نام", otp_inputs=1) == LOGIN
+    assert _classify('https://sep.shaparak.ir/pay', "شماره کارت", card_inputs=2) == PAYMENT_GATEWAY
+    assert _classify('https://snapp.example/') == UNKNOWN
@@ -0,0 +1,55 @@
+from src.monitor.poll_controller import PollController
+
+
+def test_quiet_page_backs_off_from_base():
+    controller = PollController(base_interval=2.0, min_interval=0.2, max_interval=60)
+    for _ in range(5):
+        controller.observe(changed=False)
+    assert controller.next_interval() == 3.0
+    assert controller.get_state()['reasons'] == ["page quiet"]
+
+
+def test_changing_page_polls_faster():
+    controller = PollController(base_interval=2.0, min_interval=0.2, max_interval=60)
+    for _ in range(10):
+        controller.observe(changed=True)
+    assert 0.5 <= controller.next_interval() < 2.0
+
+
+def test_errors_back_off_exponentially_within_bounds():
+    controller = PollController(base_interval=1.0, min_interval=0.2, max_interval=60)
+    for failures in range(1, 5):
+        controller.observe(error=True)
+        ceiling = min(60, 2 ** failures)
+        assert ceiling / 2 <= controller.next_interval() <= ceiling
+    for _ in range(10):
+        controller.observe(error=True)
+    assert controller.next_interval() <= 60
+
+
+def test_retry_after_is_honoured():
+    controller = PollController(base_interval=1.0, min_interval=0.2, max_interval=60)
+    controller.observe(status=429, retry_after=30)
+    assert controller.next_interval() >= 30
+    assert controller.throttled
+
+
+def test_success_resets_backoff():
+    controller = PollController(base_interval=1.0, min_interval=0.2, max_interval=60)
+    for _ in range(3):
+        controller.observe(error=True)
+    controller.observe(changed=False)
+    assert controller.failures == 0
+    assert controller.next_interval() <= 1.5
+
+
+def test_never_faster_than_twice_the_response_time():
+    controller = PollController(base_interval=0.5, min_interval=0.2, max_interval=60)
+    controller.observe(changed=True, elapsed=1.0)
+    assert controller.next_interval() == 2.0
+
+
+def test_scheduled_target_may_go_below_minimum():
+    controller = PollController(base_interval=2.0, min_interval=0.2, max_interval=60)
+    assert controller.next_interval(target=0.05) == 0.05
+    assert "sale schedule" in controller.get_state()['reasons']
@@ -0,0 +1,105 @@
+import time
+import threading
+from src.utils.priority_pool import PriorityWorkerPool
+
+
+def _wait_idle(pool, timeout=5):
+    """Block until nothing is queued or running"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with pool.condition:
+            if not pool.queued and not pool.in_flight:
+                return
+        time.sleep(0.01)
+    raise AssertionError("pool did not drain")
+
+
+def test_duplicate_keys_are_rejected():
+    gate = threading.Event()
+    pool = PriorityWorkerPool(lambda item: gate.wait(5), workers=1)
+    try:
+        assert pool.submit('a', 1, 'first')
+        assert not pool.submit('a', 1, 'again')
+        assert pool.is_known('a')
+        gate.set()
+        _wait_idle(pool)
+        # A success is final
+        assert not pool.submit('a', 1, 'after success')
+        assert pool.stats['duplicates'] == 2
+    finally:
+        pool.shutdown()
+
+
+def test_lower_priority_number_runs_first():
+    gate = threading.Event()
+    order = []
+
+    def handler(item):
+        if item == 'blocker':
+            gate.wait(5)
+        order.append(item)
+        return True
+
+    pool = PriorityWorkerPool(handler, workers=1)
+    try:
+        pool.submit('blocker', 0, 'blocker')
+        # Wait until the worker holds the blocker, so the rest queue up behind it
+        while not pool.in_flight:
+            time.sleep(0.01)
+        pool.submit('low', 5, 'low')
+        pool.submit('high', 1, 'high')
+        pool.submit('mid', 3, 'mid')
+        gate.set()
+        _wait_idle(pool)
+        assert order == ['blocker', 'high', 'mid', 'low']
+    finally:
+        pool.shutdown()
+
+
+def test_full_queue_preempts_lowest_priority():
+    gate = threading.Event()
+    pool = PriorityWorkerPool(lambda item: gate.wait(5), workers=1, max_queued=2)
+    try:
+        pool.submit('running', 0, 'running')
+        while not pool.in_flight:
+            time.sleep(0.01)
+        assert pool.submit('a', 2, 'a')
+        assert pool.submit('b', 4, 'b')
+        # Not more urgent than anything queued: rejected
+        assert not pool.submit('c', 4, 'c')
+        # More urgent than 'b': takes its place
+        assert pool.submit('d', 1, 'd')
+        assert not pool.is_known('b')
+        assert pool.stats['preempted'] == 1 and pool.stats['rejected'] == 1
+    finally:
+        gate.set()
+        pool.shutdown()
+
+
+def test_failed_key_can_be_submitted_again():
+    results = iter([False, True])
+    pool = PriorityWorkerPool(lambda item: next(results), workers=1)
+    try:
+        assert pool.submit('a', 1, 'try')
+        _wait_idle(pool)
+        assert not pool.is_known('a')
+        assert pool.submit('a', 1, 'retry')
+        _wait_idle(pool)
+        assert pool.stats['failed'] == 1 and pool.stats['succeeded'] == 1
+        assert not pool.submit('a', 1, 'done')
+    finally:
+        pool.shutdown()
+
+
+def test_handler_exception_counts_as_failure():
+    def handler(item):
+        raise RuntimeError("browser crashed")
+
+    pool = PriorityWorkerPool(handler, workers=1)
+    try:
+        pool.submit('a', 1, 'x')
+        _wait_idle(pool)
+        assert pool.stats['failed'] == 1
+        assert pool.submit('a', 1, 'x')
+    finally:
+        pool.shutdown()
@@ -0,0 +1,47 @@
+from src.monitor.product_matcher import ProductMatcher
+
+TARGETS = [
+    {'name': 'Galaxy S25 Ultra', 'source': 'priority_keywords', 'priority': 1},
+    {'name': 'Asus Vivobook 15', 'source': 'priority_list', 'priority': 2},
+    {'name': 'Samsung Galaxy S25 Ultra', 'source': 'priority_products', 'priority': 3},
+    {'name': 'Anker Soundcore Q20i', 'source': 'other_products', 'priority': 4},
+]
+
+
+def _matched(name):
+    target = ProductMatcher(TARGETS).match(name)
+    return target['name'] if target else None
+
+
+def test_persian_names_are_transliterated():
+    assert _matched("گوشی موبایل سامسونگ گلکسی S25 الترا") == 'Galaxy S25 Ultra'
+    assert _matched("لپ تاپ ایسوس ویووبوک ۱۵") == 'Asus Vivobook 15'
+    assert _matched("هدفون انکر ساندکور Q20i") == 'Anker Soundcore Q20i'
+
+
+def test_arabic_letter_forms_and_extra_words():
+    assert _matched("لپ تاپ ايسوس ویووبوك 15 اینچ") == 'Asus Vivobook 15'
+    assert _matched("Samsung Galaxy S25 Ultra 256GB") == 'Galaxy S25 Ultra'
+
+
+def test_higher_priority_target_wins_a_tie():
+    assert ProductMatcher(TARGETS).match("Samsung Galaxy S25 Ultra")['priority'] == 1
+
+
+def test_model_code_must_match():
+    assert _matched("Galaxy S24 Ultra") is None
+    assert _matched("Asus Vivobook 16") is None
+
+
+def test_unrelated_names_do_not_match():
+    assert _matched("ایرپاد اپل") is None
+    assert _matched("") is None
+
+
+def test_misspelled_token_matches_closely():
+    assert _matched("Samsung Galaxyy S25 Ultra") == 'Galaxy S25 Ultra'
+
+
+def test_duplicate_targets_keep_the_first():
+    matcher = ProductMatcher(TARGETS + [{'name': 'galaxy s25 ultra', 'source': 'other_products', 'priority': 9}])
+    assert len(matcher.targets) == len(TARGETS)
@@ -0,0 +1,75 @@
+from src.monitor.product_store import (
+    ProductStore, APPEARED, BECAME_PURCHASABLE, PRICE_CHANGED, SOLD_OUT, REMOVED
+)
+
+
+def _product(key, state='available', price='15,000,000 تومان', **extra):
+    return {'key': key, 'name': key, 'price': price, 'state': state, 'available': state == 'available', **extra}
+
+
+def _types(events):
+    return [(event['key'], event['type']) for event in events]
+
+
+def test_new_products_appear_and_available_ones_become_purchasable():
+    store = ProductStore()
+    events = store.apply([_product('a'), _product('b', state='upcoming')])
+    assert _types(events) == [('a', APPEARED), ('a', BECAME_PURCHASABLE), ('b', APPEARED)]
+
+
+def test_unchanged_poll_emits_nothing():
+    store = ProductStore()
+    store.apply([_product('a')])
+    # Same amount written with Persian digits and separators
+    assert store.apply([_product('a', price='۱۵٬۰۰۰٬۰۰۰ تومان')]) == []
+
+
+def test_transitions():
+    store = ProductStore()
+    store.apply([_product('a', state='upcoming')])
+    assert _types(store.apply([_product('a')])) == [('a', BECAME_PURCHASABLE)]
+
+    events = store.apply([_product('a', price='14,000,000 تومان')])
+    assert _types(events) == [('a', PRICE_CHANGED)]
+    assert events[0]['old_price'] == 15000000
+
+    assert _types(store.apply([_product('a', state='sold_out', price='14,000,000 تومان')])) == [('a', SOLD_OUT)]
+
+
+def test_out_of_window_product_is_reported_when_window_opens():
+    # Main records a target outside its sale window as not yet available
+    store = ProductStore()
+    assert _types(store.apply([dict(_product('a'), available=False)])) == [('a', APPEARED)]
+    assert _types(store.apply([_product('a')])) == [('a', BECAME_PURCHASABLE)]
+
+
+def test_complete_listing_removes_missing_keys():
+    store = ProductStore()
+    store.apply([_product('a'), _product('b')])
+    assert _types(store.apply([_product('a')])) == []
+    assert _types(store.apply([_product('a')], complete=True)) == [('b', REMOVED)]
+    assert store.get('b') is None
+
+
+def test_mark_unavailable_reports_the_product_again():
+    store = ProductStore()
+    store.apply([_product('a')])
+    assert store.apply([_product('a')]) == []
+    # A failed purchase: the next poll that still sees it available hands it on again
+    store.mark_unavailable(ProductStore.key_for(_product('a')))
+    assert _types(store.apply([_product('a')])) == [('a', BECAME_PURCHASABLE)]
+
+
+def test_key_falls_back_to_selector_then_name():
+    assert ProductStore.key_for({'selector': '#p1', 'name': 'x'}) == '#p1'
+    assert ProductStore.key_for({'name': 'x'}) == 'x'
+
+
+def test_least_recently_seen_records_are_evicted():
+    store = ProductStore(max_records=2)
+    store.apply([_product('a'), _product('b')])
+    store.apply([_product('a')])
+    store.apply([_product('c')])
+    assert store.get('b') is None
+    assert store.get('a') and store.get('c')
+    assert store.stats['evicted'] == 1
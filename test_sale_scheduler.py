@@ -0,0 +1,87 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate
+from src.monitor import sale_scheduler
+from src.monitor.sale_scheduler import ClockSync, SaleScheduler, IDLE, RAMP, OPEN, CLOSED
+
+TEHRAN = timezone(timedelta(hours=3, minutes=30))
+
+
+class FakeConfig:
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+def _scheduler(starts_in, **kwargs):
+    start_at = datetime.fromtimestamp(time.time() + starts_in, TEHRAN)
+    return SaleScheduler(start_at, **kwargs)
+
+
+def test_phases_around_the_start():
+    assert _scheduler(600, ramp_seconds=300).phase() == IDLE
+    assert _scheduler(100, ramp_seconds=300).phase() == RAMP
+    assert _scheduler(-10, open_seconds=180).phase() == OPEN
+    assert _scheduler(-200, open_seconds=180).phase() == CLOSED
+
+
+def test_intervals_ramp_down_to_the_start():
+    # Idle: wakes up when the ramp begins, not a full idle interval later
+    assert 9 < _scheduler(310, idle_interval=30, ramp_seconds=300).next_interval() <= 10
+    early = _scheduler(290, idle_interval=30, max_interval=0.2, ramp_seconds=300).next_interval()
+    late = _scheduler(10, idle_interval=30, max_interval=0.2, ramp_seconds=300).next_interval()
+    assert 0.2 < late < early < 30
+    # Never sleeps past the start
+    assert _scheduler(0.05, idle_interval=30, max_interval=0.2).next_interval() <= 0.05
+    assert _scheduler(-1, max_interval=0.2).next_interval() == 0.2
+    assert _scheduler(-1000).next_interval() is None
+
+
+def test_server_offset_shifts_the_schedule():
+    # The server clock runs 60 s ahead, so a start 30 s away locally has already passed there
+    assert _scheduler(30, offset=60).phase() == OPEN
+
+
+def test_arms_once_just_before_the_start():
+    scheduler = _scheduler(3, arm_lead=5)
+    assert scheduler.should_arm()
+    assert not scheduler.should_arm()
+    assert not _scheduler(60, arm_lead=5).should_arm()
+
+
+def test_from_config_aims_at_tomorrow_once_todays_window_passed():
+    now = datetime.now(TEHRAN)
+    past = now - timedelta(hours=1)
+    config = FakeConfig({'sale.timezone': 'Asia/Tehran', 'sale.start_time': past.strftime('%H:%M'),
+                         'sale.open_window_seconds': 180})
+    scheduler = SaleScheduler.from_config(config)
+    assert 0 < scheduler.seconds_to_start() <= 24 * 3600
+    dated = FakeConfig({'sale.start_time': '12:00', 'sale.date': '2025-11-28'})
+    assert SaleScheduler.from_config(dated).start_at == datetime(2025, 11, 28, 12, 0, tzinfo=TEHRAN).timestamp()
+
+
+def test_clock_sync_reads_server_date(monkeypatch):
+    class FakeResponse:
+        def __init__(self):
+            self.headers = {'Date': formatdate(time.time() + 100, usegmt=True)}
+
+    class FakeSession:
+        def head(self, url, timeout=None, allow_redirects=True):
+            return FakeResponse()
+
+    monkeypatch.setattr(sale_scheduler.time, 'sleep', lambda seconds: None)
+    sync = ClockSync(FakeSession(), 'https://snapp.example/', samples=4)
+    offset = sync.sync()
+    assert 99 <= offset <= 101
+    assert sync.error <= 0.6
+
+
+def test_clock_sync_without_date_keeps_local_clock():
+    class BrokenSession:
+        def head(self, url, timeout=None, allow_redirects=True):
+            raise OSError("unreachable")
+
+    sync = ClockSync(BrokenSession(), 'https://snapp.example/', samples=2)
+    assert sync.sync() == 0.0 and sync.error is None
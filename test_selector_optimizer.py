@@ -0,0 +1,76 @@
+from src.adaptive_scraper.selector_optimizer import SelectorOptimizer, OPTIMIZE_SCRIPT, QUEUED_ATTEMPTS
+
+SLOW = "//button[contains(., 'افزودن به سبد')]"
+
+
+class FakeDriver:
+    """A page whose selectors rewrite per the given table; counts round trips"""
+
+    def __init__(self, path, rewrites):
+        self.path = path
+        self.rewrites = rewrites
+        self.scripts = 0
+        self.url_reads = 0
+
+    @property
+    def current_url(self):
+        self.url_reads += 1
+        return f"https://snapp.example{self.path}"
+
+    def execute_script(self, script, selector):
+        assert script == OPTIMIZE_SCRIPT
+        self.scripts += 1
+        rewrite = self.rewrites.get((self.path, selector))
+        return {'count': 1, 'optimized': rewrite} if rewrite else {'count': 0, 'optimized': None}
+
+
+def test_queued_selector_is_optimized_when_idle():
+    driver = FakeDriver('/cart', {('/cart', SLOW): 'button.add-to-cart'})
+    optimizer = SelectorOptimizer(driver)
+    optimizer.queue(SLOW)
+    optimizer.queue(SLOW)
+    # Queueing costs no round trip
+    assert driver.scripts == 0 and driver.url_reads == 0
+    assert optimizer.run_queued() == 1
+    assert driver.scripts == 1
+    assert optimizer.lookup(SLOW) == 'button.add-to-cart'
+    assert not optimizer.queued
+
+
+def test_lookup_skips_url_for_selectors_without_rewrite():
+    driver = FakeDriver('/cart', {})
+    optimizer = SelectorOptimizer(driver)
+    assert optimizer.lookup(SLOW) == SLOW
+    assert driver.url_reads == 0
+
+
+def test_rewrite_applies_only_on_its_page():
+    driver = FakeDriver('/cart', {('/cart', SLOW): 'button.add-to-cart'})
+    optimizer = SelectorOptimizer(driver)
+    assert optimizer.optimize(SLOW) == 'button.add-to-cart'
+    driver.path = '/checkout'
+    assert optimizer.lookup(SLOW) == SLOW
+
+
+def test_selector_missing_from_the_page_is_retried_then_dropped():
+    driver = FakeDriver('/', {('/cart', SLOW): 'button.add-to-cart'})
+    optimizer = SelectorOptimizer(driver)
+    optimizer.queue(SLOW)
+    assert optimizer.run_queued() == 0
+    assert optimizer.queued[SLOW] == QUEUED_ATTEMPTS - 1
+    driver.path = '/cart'
+    assert optimizer.run_queued() == 1
+
+    optimizer.queue('#gone')
+    for _ in range(QUEUED_ATTEMPTS):
+        optimizer.run_queued()
+    assert not optimizer.queued
+
+
+def test_run_queued_is_bounded():
+    driver = FakeDriver('/', {})
+    optimizer = SelectorOptimizer(driver)
+    for i in range(10):
+        optimizer.queue(f"#item-{i}")
+    optimizer.run_queued(limit=4)
+    assert driver.scripts == 4
@@ -0,0 +1,92 @@
+import threading
+from concurrent.futures import Future
+from src.adaptive_scraper.snapshot_processor import SnapshotProcessor, analyze_snapshot, STALE
+
+PAGE = ('<html><body><div class="product-card"><a href="/p/1">Galaxy S25</a>'
+        '<span>15,000,000 تومان</span><button>افزودن به سبد خرید</button></div></body></html>')
+
+
+class FakeExecutor:
+    """Hands out futures the test completes by hand"""
+
+    def __init__(self):
+        self.futures = []
+        self.submitted = threading.Event()
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append((future, fn, args))
+        self.submitted.set()
+        return future
+
+    def finish(self, index):
+        future, fn, args = self.futures[index]
+        if future.set_running_or_notify_cancel():
+            future.set_result(fn(*args))
+
+
+def _processor(max_pending=4):
+    processor = SnapshotProcessor(max_pending=max_pending)
+    processor.executor = FakeExecutor()
+    return processor
+
+
+def test_analyze_snapshot_scores_tasks():
+    result = analyze_snapshot(PAGE, ['add_to_cart'], 'html')
+    assert result['add_to_cart']['text'] == 'افزودن به سبد خرید'
+    assert result['timings']['add_to_cart'][0]
+    assert result['fingerprint'] == analyze_snapshot(PAGE, [], 'html')['fingerprint']
+
+
+def test_completed_snapshot_is_returned():
+    processor = _processor()
+    results = []
+    worker = threading.Thread(target=lambda: results.append(processor.process(PAGE, ['add_to_cart'], 'html')))
+    worker.start()
+    assert processor.executor.submitted.wait(5)
+    processor.executor.finish(0)
+    worker.join(5)
+    assert results[0]['add_to_cart']['selector']
+    assert processor.stats['completed'] == 1
+
+
+def test_superseded_snapshot_is_reported_stale():
+    processor = _processor()
+    results = []
+    worker = threading.Thread(target=lambda: results.append(processor.process(PAGE, [], 'html', stream='tab')))
+    worker.start()
+    assert processor.executor.submitted.wait(5)
+    # A newer snapshot of the same page cancels the queued one
+    processor.submit(PAGE, [], 'html', stream='tab')
+    worker.join(5)
+    assert results == [STALE]
+    assert processor.stats['stale'] == 1
+
+
+def test_snapshot_finished_after_a_newer_one_was_queued_is_stale():
+    processor = _processor()
+    results = []
+    worker = threading.Thread(target=lambda: results.append(processor.process(PAGE, [], 'html', stream='tab')))
+    worker.start()
+    assert processor.executor.submitted.wait(5)
+    processor.executor.futures[0][0].set_running_or_notify_cancel()
+    processor.submit(PAGE, [], 'html', stream='tab')
+    processor.executor.futures[0][0].set_result({'fingerprint': 'old'})
+    worker.join(5)
+    assert results == [STALE]
+    assert processor.stats == {'submitted': 2, 'completed': 0, 'stale': 1, 'rejected': 0}
+
+
+def test_other_streams_are_not_superseded():
+    processor = _processor()
+    first_version, first = processor.submit(PAGE, [], 'html', stream='tab-1')
+    processor.submit(PAGE, [], 'html', stream='tab-2')
+    assert not first.cancelled()
+    assert not processor.is_stale(first_version)
+
+
+def test_full_queue_rejects_without_waiting():
+    processor = _processor(max_pending=1)
+    processor.submit(PAGE, [], 'html', stream='tab-1')
+    assert processor.process(PAGE, [], 'html', stream='tab-2') is None
+    assert processor.stats['rejected'] == 1
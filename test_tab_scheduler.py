@@ -0,0 +1,114 @@
+import threading
+import pytest
+
+pytest.importorskip('selenium')
+
+from src.browser.wait_engine import Wait
+from src.browser.tab_scheduler import TabScheduler
+
+
+class FakeDriver:
+    """Window handles only; records which thread sent each command"""
+
+    def __init__(self):
+        self.handles = ['home']
+        self.current_window_handle = 'home'
+        self.threads = set()
+        self.switch_to = self
+
+    def window(self, handle):
+        self.threads.add(threading.current_thread().name)
+        self.current_window_handle = handle
+
+    def new_window(self, kind):
+        self.threads.add(threading.current_thread().name)
+        handle = f"tab-{len(self.handles)}"
+        self.handles.append(handle)
+        self.current_window_handle = handle
+
+    def close(self):
+        self.handles.remove(self.current_window_handle)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = TabScheduler(FakeDriver(), state_factory=lambda driver: {'visits': 0},
+                             max_tabs=2, poll_interval=0.001)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def test_waits_interleave_across_tabs(scheduler):
+    gate = threading.Event()
+    order = []
+
+    def blocked(driver, tab):
+        order.append('blocked waits')
+        yield Wait(lambda driver: gate.is_set(), timeout=5)
+        order.append('blocked resumed')
+        return tab.handle
+
+    def quick(driver, tab):
+        order.append('quick ran')
+        gate.set()
+        yield Wait(lambda driver: True)
+        return tab.handle
+
+    first = scheduler.submit(blocked)
+    second = scheduler.submit(quick)
+    assert {first.result(5), second.result(5)} == {'tab-1', 'tab-2'}
+    assert order.index('quick ran') < order.index('blocked resumed')
+    assert scheduler.driver.threads == {'tab-scheduler'}
+
+
+def test_tabs_are_reused_up_to_the_limit(scheduler):
+    def task(driver, tab):
+        tab.state['visits'] += 1
+        yield Wait(lambda driver: True)
+        return tab.state['visits']
+
+    futures = [scheduler.submit(task) for _ in range(5)]
+    assert sorted(f.result(5) for f in futures)[-1] >= 2
+    assert scheduler.stats['tabs_opened'] == 2 and scheduler.stats['completed'] == 5
+
+
+def test_offloaded_calls_run_off_the_scheduler_thread(scheduler):
+    def task(driver, tab):
+        thread = yield lambda: threading.current_thread().name
+        return thread
+
+    assert scheduler.submit(task).result(5).startswith('tab-offload')
+
+
+def test_errors_reach_the_caller_and_the_task(scheduler):
+    def handled(driver, tab):
+        try:
+            yield lambda: 1 / 0
+        except ZeroDivisionError:
+            return 'handled'
+
+    def failing(driver, tab):
+        yield Wait(lambda driver: True)
+        raise ValueError("no add to cart button")
+
+    assert scheduler.submit(handled).result(5) == 'handled'
+    with pytest.raises(ValueError):
+        scheduler.submit(failing).result(5)
+    assert scheduler.stats['failed'] == 1
+
+
+def test_idle_tabs_are_closed():
+    scheduler = TabScheduler(FakeDriver(), max_tabs=2, idle_timeout=0, poll_interval=0.001)
+    try:
+        def task(driver, tab):
+            yield Wait(lambda driver: True)
+
+        scheduler.submit(task).result(5)
+        for _ in range(1000):
+            if scheduler.stats['tabs_closed']:
+                break
+            threading.Event().wait(0.001)
+        assert scheduler.stats['tabs_closed'] == 1
+        assert scheduler.driver.handles == ['home']
+    finally:
+        scheduler.shutdown()
@@ -0,0 +1,64 @@
+from src.adaptive_scraper.field_classifier import FIELD_CLASSIFIER
+from src.utils.keyword_index import KeywordAutomaton
+from src.utils.text_normalizer import normalize_text, normalize_chars, contains, parse_price
+
+
+def test_normalize_text():
+    assert normalize_text("كد ملي") == "کد ملی"
+    assert normalize_text("کد‌ملی") == "کدملی"
+    assert normalize_text("  Full_Name / نام  ") == "full name نام"
+    assert normalize_text("۱۲۳٤٥") == "12345"
+    assert normalize_text("") == ""
+
+
+def test_normalize_chars_keeps_case_and_punctuation():
+    assert normalize_chars("Price: ۱۵٬۰۰۰") == "Price: 15,000"
+
+
+def test_contains():
+    assert contains("گوشي سامسونگ", "گوشی")
+    assert not contains("گوشی", "لپ تاپ")
+
+
+def test_parse_price():
+    assert parse_price("۱۵٬۰۰۰٬۰۰۰ تومان") == 15000000
+    assert parse_price("150,000,000 ریال") == 15000000
+    assert parse_price("1.5 میلیون تومان") == 1500000
+    # A currency amount is preferred over a bare number like a discount badge
+    assert parse_price("20% تخفیف 12,000 تومان") == 12000
+    assert parse_price("ناموجود") is None
+
+
+def test_automaton_finds_all_occurrences():
+    automaton = KeywordAutomaton()
+    for keyword in ('he', 'she', 'hers'):
+        automaton.add(keyword, keyword)
+    automaton.build()
+    assert sorted(keyword for _, _, keyword, _ in automaton.iter_matches("ushers")) == ['he', 'hers', 'she']
+
+
+def test_automaton_longest_whole_word_matches():
+    automaton = KeywordAutomaton()
+    for keyword in ('name', 'father name', 'نام', 'نام پدر'):
+        automaton.add(keyword, keyword)
+    automaton.build()
+    assert [m[2] for m in automaton.longest_matches("father name")] == ['father name']
+    assert [m[2] for m in automaton.longest_matches("نام پدر و نام")] == ['نام پدر', 'نام']
+    assert automaton.longest_matches("username") == []
+
+
+def test_field_classifier():
+    assert FIELD_CLASSIFIER.classify("نام پدر") == 'father_name'
+    assert FIELD_CLASSIFIER.classify("كد ملي") == 'national_code'
+    assert FIELD_CLASSIFIER.classify("", {'name': 'postalCode'}) == 'postal_code'
+    assert FIELD_CLASSIFIER.classify("Your info", {'autocomplete': 'email'}) == 'email'
+    assert FIELD_CLASSIFIER.classify("کد تخفیف") is None
+
+
+def test_one_time_codes_are_never_filled():
+    assert FIELD_CLASSIFIER.classify("کد تایید ارسال شده به شماره موبایل") is None
+    assert FIELD_CLASSIFIER.classify("کد‌ارسال شده به موبايل ۰۹۱۲***۶۷۸۹", {'name': 'code'}) is None
+    assert FIELD_CLASSIFIER.classify("شماره موبایل", {'autocomplete': 'one-time-code'}) is None
+    assert FIELD_CLASSIFIER.classify("", {'name': 'mobileOtp'}) is None
+    assert FIELD_CLASSIFIER.classify("شماره موبایل", {'name': 'mobile'}) == 'phone'
+    assert FIELD_CLASSIFIER.classify("شماره‌تماس دوم") == 'alternative_phone'
@@ -0,0 +1,71 @@
+import time
+from datetime import date, datetime, timedelta, timezone
+from src.monitor.product_matcher import ProductMatcher
+from src.monitor.timetable import TimetableSchedule, jalali_to_gregorian, parse_opening_time
+
+TEHRAN = timezone(timedelta(hours=3, minutes=30))
+NOW = datetime(2025, 3, 25, 9, 0, tzinfo=TEHRAN)
+
+
+def test_jalali_to_gregorian():
+    assert jalali_to_gregorian(1403, 1, 1) == date(2024, 3, 20)
+    assert jalali_to_gregorian(1404, 1, 1) == date(2025, 3, 21)
+    assert jalali_to_gregorian(1403, 12, 30) == date(2025, 3, 20)
+    assert jalali_to_gregorian(1402, 7, 1) == date(2023, 9, 23)
+
+
+def test_parse_opening_time_formats():
+    assert parse_opening_time("۱۴۰۴/۰۱/۱۰ ساعت ۱۲:۰۰", NOW) == datetime(2025, 3, 30, 12, 0, tzinfo=TEHRAN)
+    assert parse_opening_time("شروع فروش ۱۰ فروردین ساعت 14:30", NOW) == datetime(2025, 3, 30, 14, 30, tzinfo=TEHRAN)
+    assert parse_opening_time("2025-04-02 08:05", NOW) == datetime(2025, 4, 2, 8, 5, tzinfo=TEHRAN)
+    assert parse_opening_time("فردا ساعت ۱۰:۰۰", NOW) == datetime(2025, 3, 26, 10, 0, tzinfo=TEHRAN)
+    assert parse_opening_time("امروز 23:15", NOW) == datetime(2025, 3, 25, 23, 15, tzinfo=TEHRAN)
+    assert parse_opening_time("به زودی", NOW) is None
+
+
+def test_countdown_is_not_an_opening_time():
+    assert parse_opening_time("۰۲:۱۵:۳۰ تا شروع فروش", NOW) is None
+    assert parse_opening_time("شروع فروش ساعت 14:30 - 02:15:30 مانده", NOW) == datetime(2025, 3, 25, 14, 30, tzinfo=TEHRAN)
+
+
+def _schedule(opens_in, lead=30, open_seconds=180):
+    now = time.time()
+    entries = [{'name': 'Galaxy S25 Ultra', 'target': 'Galaxy S25 Ultra', 'priority': 1,
+                'opens_at': now + opens_in, 'url': None}]
+    return TimetableSchedule(entries, lead=lead, open_seconds=open_seconds, idle_interval=60)
+
+
+def test_window_not_yet_open():
+    schedule = _schedule(opens_in=600)
+    assert schedule.covers()
+    assert schedule.lists('Galaxy S25 Ultra') and not schedule.lists('Asus Vivobook 15')
+    assert not schedule.is_active('Galaxy S25 Ultra')
+    # Sleeps until the lead before the window, capped by the idle interval
+    assert schedule.next_interval(0.5) == 60
+
+
+def test_window_opens_lead_seconds_early():
+    schedule = _schedule(opens_in=10, lead=30)
+    assert schedule.is_active('Galaxy S25 Ultra')
+    assert not schedule.is_active('Asus Vivobook 15')
+    assert schedule.next_interval(0.5) == 0.5
+
+
+def test_window_closes_after_open_seconds():
+    schedule = _schedule(opens_in=-200, open_seconds=180)
+    assert not schedule.is_active('Galaxy S25 Ultra')
+    # Every window has passed, so the timetable no longer applies
+    assert not schedule.covers()
+    assert schedule.next_interval(0.5) is None
+
+
+def test_from_products_keeps_targets_with_opening_times():
+    matcher = ProductMatcher([{'name': 'Galaxy S25 Ultra', 'source': 'priority_keywords', 'priority': 1}])
+    products = [
+        {'name': 'گوشی سامسونگ گلکسی S25 الترا', 'text': 'فردا ساعت ۱۰:۰۰', 'link': '/p/1'},
+        {'name': 'هدفون سونی', 'text': 'فردا ساعت ۱۱:۰۰', 'link': '/p/2'},
+        {'name': 'Galaxy S25 Ultra', 'text': 'به زودی', 'link': '/p/3'},
+    ]
+    schedule = TimetableSchedule.from_products(products, matcher, NOW)
+    assert [(entry['target'], entry['url']) for entry in schedule.entries] == [('Galaxy S25 Ultra', '/p/1')]
+    assert schedule.entries[0]['opens_at'] == datetime(2025, 3, 26, 10, 0, tzinfo=TEHRAN).timestamp()
@@ -0,0 +1,72 @@
+import pytest
+
+pytest.importorskip('selenium')
+
+from src.browser.wait_engine import Wait, WaitEngine, any_of, all_of
+
+
+class FakeDriver:
+    pass
+
+
+def _after(calls, value='ready'):
+    """A condition that holds from its calls-th check on"""
+    seen = []
+
+    def condition(driver):
+        seen.append(1)
+        return value if len(seen) >= calls else None
+    return condition
+
+
+def test_first_condition_to_hold_wins():
+    engine = WaitEngine(FakeDriver(), poll_interval=0.001)
+    name, value = engine.until(1.0, slow=_after(50), fast=_after(3, 'element'))
+    assert (name, value) == ('fast', 'element')
+    assert engine.stats['winners'] == {'fast': 1}
+
+
+def test_failing_condition_does_not_end_the_wait():
+    def broken(driver):
+        raise RuntimeError("stale element")
+
+    engine = WaitEngine(FakeDriver(), poll_interval=0.001)
+    assert engine.until(1.0, broken=broken, ok=_after(2)) == ('ok', 'ready')
+
+
+def test_deadline_passes():
+    engine = WaitEngine(FakeDriver(), poll_interval=0.001)
+    assert engine.until(0.02, never=lambda driver: None) == (None, None)
+    assert engine.stats['timeouts'] == 1
+
+
+def test_run_drives_waits_and_callables():
+    def steps():
+        element = yield Wait(_after(2, 'button'), timeout=1)
+        answer = yield lambda: 'analysis'
+        missing = yield Wait(lambda driver: None, timeout=0.01)
+        return element, answer, missing
+
+    assert WaitEngine(FakeDriver(), poll_interval=0.001).run(steps()) == ('button', 'analysis', None)
+
+
+def test_run_throws_callable_errors_into_the_steps():
+    def steps():
+        try:
+            yield lambda: 1 / 0
+        except ZeroDivisionError:
+            return 'handled'
+
+    assert WaitEngine(FakeDriver()).run(steps()) == 'handled'
+
+
+def test_combinators():
+    assert any_of(lambda d: None, lambda d: 'second')(FakeDriver()) == 'second'
+    assert all_of(lambda d: True, lambda d: 'last')(FakeDriver()) == 'last'
+    assert all_of(lambda d: True, lambda d: None)(FakeDriver()) is None
+
+
+def test_wait_step_times_out_with_none():
+    wait = Wait(lambda driver: None, timeout=0)
+    assert wait.poll(FakeDriver()) == (True, None)
+    assert Wait(lambda driver: 'x').poll(FakeDriver()) == (True, 'x')